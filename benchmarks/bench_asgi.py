@@ -0,0 +1,143 @@
+"""
+동시 요청 처리량 벤치마크: WSGI(스레드 N개) vs ASGI(sync 뷰, async 뷰), 느린 DB 가정
+
+    python -m benchmarks.bench_asgi [쿼리당 지연(ms)]
+
+서버 없이 같은 프로세스에서 WSGIHandler / ASGIHandler를 직접 호출합니다.
+모든 쿼리에 지연(time.sleep)을 넣어 DB 대기 시간이 응답 시간의 대부분인 상황을 흉내 냅니다.
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.utils import setup_django, test_database, report
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.handlers.asgi import ASGIHandler  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+
+from posts.models import Post, Comment  # noqa: E402
+
+WSGI_THREADS = 4  # gunicorn --threads 4 와 같은 고정 스레드 수
+CONCURRENCY = 64
+REQUESTS = 256
+
+query_latency = 0.05
+
+
+def slow_query(execute, sql, params, many, context):
+    time.sleep(query_latency)
+    return execute(sql, params, many, context)
+
+
+def add_latency(sender, connection, **kwargs):
+    if slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query)
+
+
+def run_wsgi(path, token):
+    handler = WSGIHandler()
+
+    def request(_):
+        environ = {
+            "PATH_INFO": path,
+            "QUERY_STRING": "",
+            "HTTP_AUTHORIZATION": f"Token {token}",
+            "wsgi.input": BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        environ["SERVER_NAME"] = environ["HTTP_HOST"] = "testserver"
+        statuses = []
+        body = b"".join(handler(environ, lambda status, headers: statuses.append(status)))
+        assert statuses[0].startswith("200"), (statuses, body)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WSGI_THREADS) as executor:
+        list(executor.map(request, range(REQUESTS)))
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def run_asgi(path, token):
+    handler = ASGIHandler()
+
+    async def request(semaphore):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"testserver"), (b"authorization", f"Token {token}".encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        async with semaphore:
+            await handler(scope, receive, send)
+        assert messages[0]["status"] == 200, messages
+
+    async def main():
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        start = time.perf_counter()
+        await asyncio.gather(*[request(semaphore) for _ in range(REQUESTS)])
+        return REQUESTS / (time.perf_counter() - start)
+
+    return asyncio.run(main())
+
+
+def main():
+    global query_latency
+    if len(sys.argv) > 1:
+        query_latency = float(sys.argv[1]) / 1000
+
+    with test_database():
+        user = User.objects.create_user(username="bench_user", password="benchpw!!")
+        token = Token.objects.create(user=user).key
+        for i in range(30):
+            post = Post.objects.create(author=user, profile=user.profile, title=f"title{i}", category="bench", body="body")
+            Comment.objects.create(author=user, profile=user.profile, post=post, text="comment")
+        post_id = Post.objects.order_by("id").values_list("id", flat=True).first()
+
+        connection_created.connect(add_latency)
+        add_latency(None, connection)
+        try:
+            rows = []
+            for name, sync_path, async_path in [
+                ("list", "/posts/", "/async/posts/"),
+                ("detail", f"/posts/{post_id}/", f"/async/posts/{post_id}/"),
+            ]:
+                # 토큰/count/검증값 캐시를 채운 뒤 측정
+                run_wsgi(sync_path, token)
+                rows.append((f"{name} WSGI {WSGI_THREADS} threads req/s", f"{run_wsgi(sync_path, token):.0f}"))
+                rows.append((f"{name} ASGI sync view req/s", f"{run_asgi(sync_path, token):.0f}"))
+                rows.append((f"{name} ASGI async view req/s", f"{run_asgi(async_path, token):.0f}"))
+        finally:
+            connection_created.disconnect(add_latency)
+            connection.execute_wrappers.remove(slow_query)
+        report(
+            f"{REQUESTS} requests, concurrency {CONCURRENCY}, {query_latency * 1000:.0f}ms per query",
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
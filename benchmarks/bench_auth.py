@@ -0,0 +1,51 @@
+"""
+토큰 인증 벤치마크: TokenAuthentication vs CachedTokenAuthentication
+
+    python -m benchmarks.bench_auth
+"""
+from benchmarks.utils import setup_django, test_database, measure, report
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.authentication import TokenAuthentication  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from users.authentication import CachedTokenAuthentication, token_cache  # noqa: E402
+from users.views import ProfileView  # noqa: E402
+
+REPEAT = 2000
+
+
+def run(authentication_class, client, url):
+    ProfileView.authentication_classes = [authentication_class]
+    token_cache.clear()
+    client.get(url)  # 캐시 워밍업
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    auth_queries = sum("authtoken_token" in q["sql"] for q in context.captured_queries)
+    rps = measure(lambda: client.get(url), REPEAT)
+    return auth_queries, rps
+
+
+def main():
+    with test_database():
+        user = User.objects.create_user(username="bench_user", password="benchpw!!")
+        token = Token.objects.create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        url = f"/user/profile/{user.id}/"
+
+        rows = []
+        for authentication_class in [TokenAuthentication, CachedTokenAuthentication]:
+            auth_queries, rps = run(authentication_class, client, url)
+            rows.append((f"{authentication_class.__name__} auth queries", auth_queries))
+            rows.append((f"{authentication_class.__name__} req/s", f"{rps:.0f}"))
+        report(f"GET {url} x {REPEAT}", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+응답 압축 벤치마크: 게시글 목록 응답(JSON)의 인코딩별 압축 후 크기와 압축 속도 (pypost.compression)
+
+    python -m benchmarks.bench_compression
+
+brotli, zstandard 패키지가 없으면 해당 인코딩은 건너뜁니다.
+"""
+from benchmarks.utils import setup_django, test_database, measure, report
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+
+from posts.models import Post, Comment  # noqa: E402
+from posts.serializers import PostSerializer  # noqa: E402
+from pypost import compression  # noqa: E402
+from pypost.renderers import ORJSONRenderer  # noqa: E402
+
+PAGE_SIZES = [20, 100]
+LIKES_PER_POST = 10
+COMMENTS_PER_POST = 5
+REPEAT = 200
+
+
+def compress(name, options, body):
+    compressor = compression.COMPRESSORS[name](options)
+    return compressor.compress(body) + compressor.finish()
+
+
+def main():
+    options = compression.get_options()
+    with test_database():
+        users = [User.objects.create_user(username=f"bench{i}", password="benchpw!!") for i in range(LIKES_PER_POST)]
+        for i in range(max(PAGE_SIZES)):
+            post = Post.objects.create(
+                author=users[0], profile=users[0].profile,
+                title=f"게시글 제목 {i}", category="bench", body="파이썬 장고 벤치마크 본문입니다. " * 20,
+            )
+            post.likes.add(*users)
+            Comment.objects.bulk_create([
+                Comment(author=user, profile=user.profile, post=post, text=f"댓글 {j}")
+                for j, user in enumerate(users[:COMMENTS_PER_POST])
+            ])
+
+        rows = []
+        for size in PAGE_SIZES:
+            posts = PostSerializer.setup_eager_loading(Post.objects.order_by("-id"))[:size]
+            body = ORJSONRenderer().render(PostSerializer(posts, many=True).data)
+            rows.append((f"{size} posts identity KB", f"{len(body) / 1024:.1f}"))
+            for name in compression.COMPRESSORS:
+                if compression.COMPRESSORS[name] is None:
+                    rows.append((f"{size} posts {name}", "not installed"))
+                    continue
+                compressed = compress(name, options, body)
+                ops = measure(lambda: compress(name, options, body), max(REPEAT * PAGE_SIZES[0] // size, 20))
+                rows.append((f"{size} posts {name} KB", f"{len(compressed) / 1024:.1f}"))
+                rows.append((f"{size} posts {name} MB/s", f"{ops * len(body) / 1024 / 1024:.0f}"))
+        report(f"PostSerializer list responses ({LIKES_PER_POST} likes, {COMMENTS_PER_POST} comments per post)", rows)
+
+
+if __name__ == "__main__":
+    main()
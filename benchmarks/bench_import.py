@@ -0,0 +1,87 @@
+"""
+대량 가져오기 벤치마크: import_pypost vs 한 행씩 ORM save()
+
+    python -m benchmarks.bench_import [게시글 수]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from io import StringIO
+
+from benchmarks.utils import setup_django, test_database, report
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+
+from posts.models import Post, Comment  # noqa: E402
+
+USERS = 1000
+COMMENTS_PER_POST = 3
+LIKES_PER_POST = 5
+NAIVE_POSTS = 500
+
+
+def generate(path, posts):
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as f:
+        def write(record):
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        for user_id in range(1, USERS + 1):
+            write({"type": "user", "id": user_id, "username": f"user{user_id}"})
+        comment_id = 0
+        for post_id in range(1, posts + 1):
+            write({
+                "type": "post", "id": post_id, "author_id": rng.randint(1, USERS),
+                "title": f"게시글 {post_id}", "category": "bench", "body": "파이썬 장고 벤치마크 본문 " * 5,
+            })
+            for _ in range(COMMENTS_PER_POST):
+                comment_id += 1
+                write({
+                    "type": "comment", "id": comment_id, "post_id": post_id,
+                    "author_id": rng.randint(1, USERS), "text": "댓글",
+                })
+            for user_id in rng.sample(range(1, USERS + 1), LIKES_PER_POST):
+                write({"type": "like", "post_id": post_id, "user_id": user_id})
+    return USERS + posts * (1 + COMMENTS_PER_POST + LIKES_PER_POST)
+
+
+def naive(posts):
+    # 한 행씩 save() (시그널 포함)
+    users = list(User.objects.all()[:10])
+    start = time.perf_counter()
+    for i in range(posts):
+        user = users[i % len(users)]
+        post = Post.objects.create(author=user, profile=user.profile, title="naive", category="bench", body="본문")
+        for _ in range(COMMENTS_PER_POST):
+            Comment.objects.create(author=user, profile=user.profile, post=post, text="댓글")
+        post.likes.add(*users[:LIKES_PER_POST])
+    elapsed = time.perf_counter() - start
+    return posts * (1 + COMMENTS_PER_POST + LIKES_PER_POST) / elapsed
+
+
+def main():
+    posts = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as directory, test_database():
+        path = os.path.join(directory, "bench.ndjson")
+        rows = generate(path, posts)
+
+        start = time.perf_counter()
+        call_command("import_pypost", path, stdout=StringIO())
+        elapsed = time.perf_counter() - start
+
+        naive_rps = naive(NAIVE_POSTS)
+        report(f"import {rows} rows", [
+            ("import_pypost elapsed (s)", f"{elapsed:.1f}"),
+            ("import_pypost rows/s", f"{rows / elapsed:.0f}"),
+            (f"ORM save() rows/s ({NAIVE_POSTS} posts)", f"{naive_rps:.0f}"),
+        ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+JSON 렌더링/파싱 벤치마크: DRF JSONRenderer/JSONParser(표준 json) vs ORJSONRenderer/ORJSONParser
+
+    python -m benchmarks.bench_json
+
+PostSerializer 응답(프로필, 좋아요, 앞쪽 댓글 포함)을 페이지 크기별로 렌더링하고,
+같은 크기의 일괄 생성 요청 본문(/posts/bulk/)을 파싱합니다. 직렬화(serializer.data)는 미리 만들어 두고 제외합니다.
+"""
+import io
+import json
+
+from benchmarks.utils import setup_django, test_database, measure, report
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from posts.models import Post, Comment  # noqa: E402
+from posts.serializers import PostSerializer  # noqa: E402
+from pypost.parsers import ORJSONParser  # noqa: E402
+from pypost.renderers import ORJSONRenderer, orjson  # noqa: E402
+
+PAGE_SIZES = [3, 20, 100]
+LIKES_PER_POST = 10
+COMMENTS_PER_POST = 5
+REPEAT = 2000
+
+
+def main():
+    if orjson is None:
+        print("orjson이 설치되어 있지 않아 ORJSON* 클래스도 표준 json으로 동작합니다.")
+    with test_database():
+        users = [User.objects.create_user(username=f"bench{i}", password="benchpw!!") for i in range(LIKES_PER_POST)]
+        for i in range(max(PAGE_SIZES)):
+            post = Post.objects.create(
+                author=users[0], profile=users[0].profile,
+                title=f"게시글 제목 {i}", category="bench", body="파이썬 장고 벤치마크 본문입니다. " * 20,
+            )
+            post.likes.add(*users)
+            Comment.objects.bulk_create([
+                Comment(author=user, profile=user.profile, post=post, text=f"댓글 {j}")
+                for j, user in enumerate(users[:COMMENTS_PER_POST])
+            ])
+
+        rows = []
+        for size in PAGE_SIZES:
+            posts = PostSerializer.setup_eager_loading(Post.objects.order_by("-id"))[:size]
+            data = PostSerializer(posts, many=True).data
+            body = JSONRenderer().render(data)
+            repeat = max(REPEAT * PAGE_SIZES[0] // size, 50)
+            for name, renderer in [("JSONRenderer", JSONRenderer()), ("ORJSONRenderer", ORJSONRenderer())]:
+                ops = measure(lambda: renderer.render(data), repeat)
+                rows.append((f"render {size} posts ({len(body) // 1024}KB) {name} ops/s", f"{ops:.0f}"))
+
+            request_body = json.dumps(
+                [{"title": post["title"], "category": "bench", "body": post["body"]} for post in data],
+                ensure_ascii=False,
+            ).encode()
+            for name, parser in [("JSONParser", JSONParser()), ("ORJSONParser", ORJSONParser())]:
+                ops = measure(lambda: parser.parse(io.BytesIO(request_body), "application/json", {}), repeat)
+                rows.append((f"parse {size} posts ({len(request_body) // 1024}KB) {name} ops/s", f"{ops:.0f}"))
+        report(f"PostSerializer payloads ({LIKES_PER_POST} likes, {COMMENTS_PER_POST} comments per post)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+직렬화 벤치마크: DRF serializer(모델 인스턴스 + 필드별 to_representation) vs pypost.rows.RowSerializer(values_list 행 튜플)
+
+    python -m benchmarks.bench_rows
+
+PostSerializer(프로필, 좋아요, 앞쪽 댓글 포함)와 CommentSerializer 목록을 페이지 크기별로 만듭니다.
+쿼리 실행과 prefetch를 포함하고, JSON 렌더링은 제외합니다. 두 경로의 결과가 같은지도 확인합니다.
+"""
+from benchmarks.utils import setup_django, test_database, measure, report
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+
+from posts.models import Post, Comment  # noqa: E402
+from posts.serializers import PostSerializer, CommentSerializer  # noqa: E402
+from pypost.rows import RowSerializer  # noqa: E402
+
+PAGE_SIZES = [20, 100]
+LIKES_PER_POST = 10
+COMMENTS_PER_POST = 5
+REPEAT = 200
+
+
+def drf_path(serializer_class, queryset):
+    return serializer_class(list(queryset), many=True).data
+
+
+def row_path(serializer_class, queryset):
+    rows = RowSerializer(serializer_class(), queryset)
+    return rows.serialize(rows.values(queryset))
+
+
+def main():
+    with test_database():
+        users = [User.objects.create_user(username=f"bench{i}", password="benchpw!!") for i in range(LIKES_PER_POST)]
+        for i in range(max(PAGE_SIZES)):
+            post = Post.objects.create(
+                author=users[0], profile=users[0].profile,
+                title=f"게시글 제목 {i}", category="bench", body="파이썬 장고 벤치마크 본문입니다. " * 20,
+            )
+            post.likes.add(*users)
+            Comment.objects.bulk_create([
+                Comment(author=user, profile=user.profile, post=post, text=f"댓글 {j}")
+                for j, user in enumerate(users[:COMMENTS_PER_POST])
+            ])
+
+        querysets = {
+            "PostSerializer": (PostSerializer, PostSerializer.setup_eager_loading(Post.objects.order_by("-id"))),
+            "CommentSerializer": (
+                CommentSerializer, CommentSerializer.setup_eager_loading(Comment.objects.order_by("id")),
+            ),
+        }
+        rows = []
+        for name, (serializer_class, queryset) in querysets.items():
+            for size in PAGE_SIZES:
+                page = queryset[:size]
+                assert drf_path(serializer_class, page) == row_path(serializer_class, page)
+                repeat = max(REPEAT * PAGE_SIZES[0] // size, 20)
+                for path, func in [("DRF", drf_path), ("rows", row_path)]:
+                    ops = measure(lambda: func(serializer_class, page), repeat)
+                    rows.append((f"{name} {size} rows {path} rows/s", f"{ops * size:.0f}"))
+        report(f"list serialization ({LIKES_PER_POST} likes, {COMMENTS_PER_POST} comments per post)", rows)
+
+
+if __name__ == "__main__":
+    main()
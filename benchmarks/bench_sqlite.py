@@ -0,0 +1,140 @@
+"""
+SQLite 설정 벤치마크: 기본 sqlite3 백엔드 vs pypost.db (WAL, PRAGMA, 지속 연결, 쓰기 직렬화)
+여러 스레드가 읽기(게시글 목록/상세)와 쓰기(좋아요, 댓글)를 섞어 동시에 요청 (WSGIHandler 직접 호출)
+
+    python -m benchmarks.bench_sqlite
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+CONFIGS = {
+    # 기존 설정: 기본 저널(DELETE), 요청마다 재연결, 쓰기 직렬화 없음
+    "baseline": {"ENGINE": "django.db.backends.sqlite3", "CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    # pypost/settings.py의 DATABASES 그대로
+    "tuned": {},
+}
+THREADS = 8
+DURATION = 5
+WRITE_RATIO = 0.2
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # 설정별로 별도 프로세스에서 실행 (WAL은 DB 파일에 남으므로 같은 파일을 이어 쓰지 않음)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pypost.settings")
+    from django.conf import settings
+
+    settings.DATABASES["default"].update(CONFIGS[sys.argv[1]])
+
+from benchmarks.utils import setup_django, test_database, report  # noqa: E402
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connection  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+
+from posts.models import Post  # noqa: E402
+
+
+def request(handler, method, path, token, body=None):
+    data = json.dumps(body).encode() if body is not None else b""
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "CONTENT_TYPE": "application/json",
+        "CONTENT_LENGTH": str(len(data)),
+        "HTTP_AUTHORIZATION": f"Token {token}",
+        "wsgi.input": BytesIO(data),
+    }
+    setup_testing_defaults(environ)
+    environ["SERVER_NAME"] = environ["HTTP_HOST"] = "testserver"
+    statuses = []
+    b"".join(handler(environ, lambda status, headers: statuses.append(status)))
+    return int(statuses[0].split()[0])
+
+
+def worker(handler, token, post_ids, deadline, seed, counts, lock):
+    rng = random.Random(seed)
+    local = {"reads": 0, "writes": 0, "errors": 0}
+    try:
+        while time.monotonic() < deadline:
+            post_id = rng.choice(post_ids)
+            if rng.random() < WRITE_RATIO:
+                if rng.random() < 0.7:
+                    status = request(handler, "POST", f"/like/{post_id}/", token)
+                else:
+                    status = request(handler, "POST", "/comments/", token, {"post": post_id, "text": "bench"})
+                kind = "writes"
+            else:
+                path = f"/posts/{post_id}/" if rng.random() < 0.7 else "/posts/"
+                status = request(handler, "GET", path, token)
+                kind = "reads"
+            local[kind if status < 400 else "errors"] += 1
+    finally:
+        connection.close()
+    with lock:
+        for name, value in local.items():
+            counts[name] += value
+
+
+def run():
+    with test_database():
+        users = [User.objects.create_user(username=f"bench{i}", password="benchpw!!") for i in range(THREADS)]
+        tokens = [Token.objects.create(user=user).key for user in users]
+        post_ids = [
+            Post.objects.create(author=users[0], profile=users[0].profile, title=f"t{i}", body="body").id
+            for i in range(20)
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            journal_mode = cursor.fetchone()[0]
+
+        handler = WSGIHandler()
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + DURATION
+        threads = [
+            threading.Thread(target=worker, args=(handler, token, post_ids, deadline, i, counts, lock))
+            for i, token in enumerate(tokens)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        print(json.dumps({
+            "journal_mode": journal_mode,
+            "req/s": (counts["reads"] + counts["writes"]) / elapsed,
+            "read req/s": counts["reads"] / elapsed,
+            "write req/s": counts["writes"] / elapsed,
+            "errors": counts["errors"],
+        }))
+
+
+def main():
+    if len(sys.argv) > 1:
+        run()
+        return
+    rows = []
+    for name in CONFIGS:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_sqlite", name], capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        journal_mode = result.pop("journal_mode")
+        for key, value in result.items():
+            rows.append((f"{name} ({journal_mode}) {key}", f"{value:.0f}"))
+    report(f"{THREADS} threads x {DURATION}s, {WRITE_RATIO:.0%} writes (like, comment)", rows)
+
+
+if __name__ == "__main__":
+    main()
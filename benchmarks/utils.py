@@ -0,0 +1,39 @@
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pypost.settings")
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    # 실제 DB를 건드리지 않도록 테스트 DB를 만들어 사용 후 삭제
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter() - start
+    return repeat / elapsed
+
+
+def report(title, rows):
+    print(title)
+    for name, value in rows:
+        print(f"  {name:<40} {value}")
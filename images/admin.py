@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from .models import ImageJob
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ["id", "content_type", "object_id", "source", "status", "attempts", "updated_at"]
+    list_filter = ["status"]
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from images.processing import requeue_stale_jobs, run_pending
+
+
+class Command(BaseCommand):
+    help = "대기 중인 이미지 리사이즈 작업을 처리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="대기 중인 작업만 처리하고 종료")
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--sleep", type=float, default=2.0, help="작업이 없을 때 대기 시간(초)")
+
+    def handle(self, *args, **options):
+        while True:
+            requeue_stale_jobs()
+            processed = run_pending(options["batch_size"])
+            if processed:
+                self.stdout.write(f"{processed}개 작업 처리")
+            elif options["once"]:
+                break
+            else:
+                time.sleep(options["sleep"])
@@ -0,0 +1,192 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import ImageJob
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE = "default.png"
+
+# 이름: (최대 크기, 크롭 여부)
+RENDITIONS = {
+    "thumbnail": ((150, 150), True),
+    "feed": ((640, 640), False),
+    "full": ((1600, 1600), False),
+}
+
+DEFAULT_OPTIONS = {
+    "BACKEND": "thread",  # "thread": 커밋 직후 스레드 풀에서 처리, "db": process_images 워커만 처리
+    "WORKERS": 2,
+    "FORMAT": "WEBP",  # WEBP 또는 JPEG
+    "QUALITY": 80,
+    "MAX_ATTEMPTS": 3,
+    "STALE_AFTER": 600,  # 처리 중 상태로 이 시간(초) 이상 남은 작업은 다시 대기열로
+}
+
+_executor = None
+
+
+def get_options():
+    return {**DEFAULT_OPTIONS, **getattr(settings, "IMAGE_PIPELINE", {})}
+
+
+def renditions_field(field_name):
+    return f"{field_name}_renditions"
+
+
+def needs_processing(instance, field_name="image"):
+    image = getattr(instance, field_name)
+    if not image or image.name == DEFAULT_IMAGE:
+        return False
+    return getattr(instance, renditions_field(field_name)).get("source") != image.name
+
+
+def enqueue(instance, field_name="image"):
+    job = ImageJob.objects.create(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+        field_name=field_name,
+        source=getattr(instance, field_name).name,
+    )
+    if get_options()["BACKEND"] == "thread":
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, job.pk))
+    return job
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=get_options()["WORKERS"], thread_name_prefix="images")
+    return _executor
+
+
+def _run_in_thread(job_id):
+    try:
+        run_with_retries(job_id)
+    finally:
+        connection.close()
+
+
+def run_with_retries(job_id):
+    # thread 모드에는 대기열을 다시 보는 워커가 없으므로 실패해 PENDING으로 돌아간 작업은 바로 다시 시도
+    # 시도마다 attempts가 늘어 MAX_ATTEMPTS번 실패하면 FAILED로 끝남
+    while run_job(job_id) and ImageJob.objects.filter(pk=job_id, status=ImageJob.PENDING).exists():
+        pass
+
+
+def render(data, size, crop, image_format, quality):
+    with Image.open(BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)  # 회전 정보를 픽셀에 반영한 뒤 EXIF는 버림
+        if crop:
+            image = ImageOps.fit(image, size, Image.LANCZOS)
+        else:
+            image = image.copy()
+            image.thumbnail(size, Image.LANCZOS)
+
+    if image_format == "JPEG":
+        image = image.convert("RGB")
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+    image.info = {}
+
+    buffer = BytesIO()
+    image.save(buffer, image_format, quality=quality)
+    return buffer.getvalue()
+
+
+def rendition_path(source, name, image_format):
+    directory, filename = os.path.split(source)
+    stem = os.path.splitext(filename)[0]
+    extension = "webp" if image_format == "WEBP" else "jpg"
+    return os.path.join(directory, "renditions", f"{stem}_{name}.{extension}")
+
+
+def claim(job_id):
+    # 여러 워커가 같은 작업을 가져가지 않도록 상태 조건부 UPDATE로 선점
+    return ImageJob.objects.filter(pk=job_id, status=ImageJob.PENDING).update(
+        status=ImageJob.PROCESSING, attempts=F("attempts") + 1, updated_at=timezone.now()
+    )
+
+
+def run_job(job_id):
+    if not claim(job_id):
+        return False
+    job = ImageJob.objects.select_related("content_type").get(pk=job_id)
+    try:
+        process(job)
+    except Exception as e:
+        logger.exception("image job %s failed", job.pk)
+        status = ImageJob.FAILED if job.attempts >= get_options()["MAX_ATTEMPTS"] else ImageJob.PENDING
+        ImageJob.objects.filter(pk=job.pk).update(status=status, error=str(e), updated_at=timezone.now())
+    else:
+        ImageJob.objects.filter(pk=job.pk).update(status=ImageJob.DONE, error="", updated_at=timezone.now())
+    return True
+
+
+def process(job):
+    options = get_options()
+    model = job.content_type.model_class()
+    if not model.objects.filter(pk=job.object_id, **{job.field_name: job.source}).exists():
+        # 대상이 삭제되었거나 그 사이 다른 이미지로 바뀐 경우 (새 이미지는 별도 작업으로 처리)
+        return
+
+    with default_storage.open(job.source, "rb") as f:
+        data = f.read()
+    renditions = {"source": job.source}
+    for name, (size, crop) in RENDITIONS.items():
+        content = render(data, size, crop, options["FORMAT"], options["QUALITY"])
+        path = rendition_path(job.source, name, options["FORMAT"])
+        renditions[name] = default_storage.save(path, ContentFile(content))
+
+    with transaction.atomic():
+        instance = model.objects.select_for_update().filter(pk=job.object_id).first()
+        if instance is None or getattr(instance, job.field_name).name != job.source:
+            # 방금 만든 파일은 쓰이지 않으므로 삭제
+            transaction.on_commit(lambda: delete_renditions(renditions))
+            return
+        # 이전 이미지(또는 같은 이미지의 이전 처리)로 만든 파일은 커밋 후 삭제
+        previous = getattr(instance, renditions_field(job.field_name))
+        stale = {name: path for name, path in previous.items() if path not in renditions.values()}
+        transaction.on_commit(lambda: delete_renditions(stale))
+        setattr(instance, renditions_field(job.field_name), renditions)
+        update_fields = [renditions_field(job.field_name)]
+        if any(field.name == "updated_at" for field in model._meta.fields):
+            update_fields.append("updated_at")
+        # save()로 저장해야 캐시 무효화 등 post_save 시그널이 동작
+        instance.save(update_fields=update_fields)
+
+
+def delete_renditions(renditions):
+    for name, path in renditions.items():
+        if name == "source" or not path:
+            continue
+        try:
+            default_storage.delete(path)
+        except OSError:
+            logger.warning("could not delete rendition %s", path, exc_info=True)
+
+
+def requeue_stale_jobs():
+    stale_before = timezone.now() - timedelta(seconds=get_options()["STALE_AFTER"])
+    return ImageJob.objects.filter(status=ImageJob.PROCESSING, updated_at__lt=stale_before).update(
+        status=ImageJob.PENDING, updated_at=timezone.now()
+    )
+
+
+def run_pending(limit=100):
+    job_ids = list(
+        ImageJob.objects.filter(status=ImageJob.PENDING).order_by("id").values_list("id", flat=True)[:limit]
+    )
+    return sum(run_job(job_id) for job_id in job_ids)
@@ -0,0 +1,32 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+
+from .processing import DEFAULT_IMAGE, RENDITIONS, renditions_field
+
+
+def rendition_urls(image_name, renditions, url):
+    # 리사이즈 결과가 현재 이미지의 것이 아니면(처리 전) default.png로 대체. url은 저장소 경로 → 응답 URL
+    renditions = renditions or {}
+    if renditions.get("source") != image_name:
+        renditions = {}
+    return {name: url(renditions.get(name, DEFAULT_IMAGE)) for name in RENDITIONS}
+
+
+class RenditionsField(serializers.Field):
+    # 리사이즈된 이미지 URL. 처리가 끝나기 전에는 default.png로 대체
+    def __init__(self, image_field="image", **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        self.image_field = image_field
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        image = getattr(instance, self.image_field)
+        renditions = getattr(instance, renditions_field(self.image_field))
+        request = self.context.get("request")
+
+        def url(name):
+            url = default_storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+
+        return rendition_urls(image.name, renditions, url)
@@ -0,0 +1,26 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from posts.models import Post
+from users.models import Profile
+from .models import ImageJob
+from .processing import enqueue, needs_processing
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Profile)
+def enqueue_image_job(sender, instance, update_fields=None, **kwargs):
+    # 이미지가 바뀐 저장에 대해서만 리사이즈 작업 등록 (요청 안에서는 원본만 저장)
+    if update_fields is not None and "image" not in update_fields:
+        return
+    if not needs_processing(instance):
+        return
+    already_queued = ImageJob.objects.filter(
+        content_type=ContentType.objects.get_for_model(instance),
+        object_id=instance.pk,
+        source=instance.image.name,
+        status__in=[ImageJob.PENDING, ImageJob.PROCESSING],
+    ).exists()
+    if not already_queued:
+        enqueue(instance)
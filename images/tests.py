@@ -0,0 +1,154 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from images import processing
+from images.models import ImageJob
+from posts.models import Post
+
+
+def make_jpeg(size=(2000, 1500)):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: 90도 회전
+    exif[0x010F] = "test camera"
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, "JPEG", exif=exif)
+    return buffer.getvalue()
+
+
+@override_settings(IMAGE_PIPELINE={"BACKEND": "db"})
+class ImagePipelineTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test_user",
+            email = "test@test.com",
+            password = "testpw!!",
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root)
+
+    def create_post(self):
+        new_post = {
+            "title": "test_title",
+            "body": "this is body",
+            "category": "backend",
+            "image": SimpleUploadedFile("photo.jpg", make_jpeg(), content_type="image/jpeg"),
+        }
+        response = self.client.post("/posts/", data=new_post, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Post.objects.latest("id")
+
+    def test_upload_enqueues_job(self):
+        post = self.create_post()
+        job = ImageJob.objects.get()
+        self.assertEqual(job.status, ImageJob.PENDING)
+        self.assertEqual(job.source, post.image.name)
+
+        response = self.client.get(f"/posts/{post.id}/")
+        for url in response.data["image_renditions"].values():
+            self.assertTrue(url.endswith("/media/default.png"))
+
+    def test_worker_creates_renditions(self):
+        post = self.create_post()
+        call_command("process_images", "--once", stdout=StringIO())
+
+        self.assertEqual(ImageJob.objects.get().status, ImageJob.DONE)
+        post.refresh_from_db()
+        self.assertEqual(post.image_renditions["source"], post.image.name)
+
+        expected = {"thumbnail": (150, 150), "feed": (480, 640), "full": (1200, 1600)}
+        for name, size in expected.items():
+            with default_storage.open(post.image_renditions[name]) as f:
+                with Image.open(f) as image:
+                    self.assertEqual(image.format, "WEBP")
+                    self.assertEqual(image.size, size)
+                    self.assertEqual(len(image.getexif()), 0)
+
+        response = self.client.get(f"/posts/{post.id}/")
+        self.assertTrue(response.data["image_renditions"]["feed"].endswith(".webp"))
+
+    def test_replaced_image_is_not_overwritten(self):
+        post = self.create_post()
+        Post.objects.filter(pk=post.pk).update(image="post/other.jpg")
+        call_command("process_images", "--once", stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.image_renditions, {})
+
+    def test_profile_image(self):
+        profile = self.user.profile
+        profile.image = SimpleUploadedFile("avatar.jpg", make_jpeg((300, 300)), content_type="image/jpeg")
+        profile.save()
+        call_command("process_images", "--once", stdout=StringIO())
+        response = self.client.get(f"/user/profile/{self.user.id}/")
+        self.assertTrue(response.data["image_renditions"]["thumbnail"].endswith("avatar_thumbnail.webp"))
+
+    @override_settings(IMAGE_PIPELINE={"BACKEND": "db", "MAX_ATTEMPTS": 2})
+    def test_failed_job(self):
+        post = self.create_post()
+        default_storage.delete(post.image.name)
+        with self.assertLogs("images.processing", "ERROR"):
+            call_command("process_images", "--once", stdout=StringIO())
+        job = ImageJob.objects.get()
+        self.assertEqual(job.status, ImageJob.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    @override_settings(IMAGE_PIPELINE={"BACKEND": "db", "MAX_ATTEMPTS": 2})
+    def test_thread_mode_retries(self):
+        post = self.create_post()
+        default_storage.delete(post.image.name)
+        with self.assertLogs("images.processing", "ERROR"):
+            processing.run_with_retries(ImageJob.objects.get().pk)
+        job = ImageJob.objects.get()
+        self.assertEqual((job.status, job.attempts), (ImageJob.FAILED, 2))
+
+    def test_old_renditions_are_deleted(self):
+        post = self.create_post()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("process_images", "--once", stdout=StringIO())
+        post.refresh_from_db()
+        old = post.image_renditions
+
+        post.image = SimpleUploadedFile("photo2.jpg", make_jpeg(), content_type="image/jpeg")
+        post.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("process_images", "--once", stdout=StringIO())
+        post.refresh_from_db()
+        for name in processing.RENDITIONS:
+            self.assertFalse(default_storage.exists(old[name]))
+            self.assertTrue(default_storage.exists(post.image_renditions[name]))
+
+    def test_unused_renditions_are_deleted(self):
+        post = self.create_post()
+        render = processing.render
+
+        def render_and_replace(*args):
+            # 리사이즈하는 사이에 이미지가 바뀐 경우
+            Post.objects.filter(pk=post.pk).update(image="post/other.jpg")
+            return render(*args)
+
+        with mock.patch.object(processing, "render", render_and_replace):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("process_images", "--once", stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.image_renditions, {})
+        _, files = default_storage.listdir("post/renditions")
+        self.assertEqual(files, [])
@@ -0,0 +1,204 @@
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from django_filters import utils as filter_utils
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import exceptions
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from pypost.db import replicas
+from users.authentication import CachedTokenAuthentication
+from . import events
+from .filters import PostFilter
+from .models import Post, Comment
+from .pagination import PostPagination, CommentPagination
+from .permissions import CustomReadOnly
+from .serializers import PostSerializer, CommentSerializer
+from .views import annotate_is_liked
+
+
+class AsyncReadView(View):
+    # ASGI에서 요청이 스레드를 점유하지 않는 읽기 전용 뷰 (/async/posts/, /async/comments/)
+    # DRF APIView의 인증/권한/예외 처리 중 GET에 필요한 부분만 async로 옮김. 응답 형식은 sync 뷰와 동일
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [CustomReadOnly]
+    queryset = None
+    serializer_class = None
+    filterset_class = None
+    filterset_fields = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request)
+        self.request = request
+        try:
+            request.user = await self.aauthenticate(request)
+            self.check_permissions(request)
+            # sync 뷰(ReplicaReadMixin)와 같이 인증 후의 읽기는 복제본으로
+            use_replicas = request.method in SAFE_METHODS and not await replicas.ais_pinned(request.user)
+            with replicas.replica_reads(use_replicas):
+                return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    async def aauthenticate(self, request):
+        for authentication_class in self.authentication_classes:
+            result = await authentication_class().aauthenticate(request)
+            if result is not None:
+                request.auth = result[1]
+                return result[0]
+        return AnonymousUser()
+
+    def check_permissions(self, request, obj=None):
+        # 권한 클래스는 DB를 조회하지 않으므로 sync 메서드를 그대로 사용
+        for permission in [permission_class() for permission_class in self.permission_classes]:
+            if obj is None:
+                allowed = permission.has_permission(request, self)
+            else:
+                allowed = permission.has_object_permission(request, self, obj)
+            if not allowed:
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, "message", None))
+
+    def handle_exception(self, exc):
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+        response = self.render(data, exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response["WWW-Authenticate"] = self.authentication_classes[0]().authenticate_header(self.request)
+        return response
+
+    def render(self, data, status=200):
+        # sync 뷰와 같은 JSON 렌더러 (REST_FRAMEWORK의 DEFAULT_RENDERER_CLASSES 첫 번째)
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        return HttpResponse(renderer.render(data), status=status, content_type="application/json")
+
+    def get_selected_fields(self):
+        return self.serializer_class.select_fields(self.request.query_params)
+
+    def get_queryset(self):
+        return self.serializer_class.setup_eager_loading(self.queryset.all(), self.get_selected_fields())
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_selected_fields()
+        if fields is not None:
+            kwargs["fields"] = fields
+        return self.serializer_class(*args, context={"request": self.request, "view": self}, **kwargs)
+
+    async def afilter_queryset(self, queryset):
+        filterset = DjangoFilterBackend().get_filterset(self.request, queryset, self)
+        if filterset is None or not any(name in self.request.query_params for name in filterset.filters):
+            return queryset
+        # ModelChoiceFilter 검증(존재 여부 조회)은 sync ORM이므로 필터 값이 있을 때만 스레드에서 실행
+        if not await sync_to_async(filterset.is_valid)():
+            raise filter_utils.translate_validation(filterset.errors)
+        return filterset.qs
+
+
+class AsyncListView(AsyncReadView):
+    pagination_class = None
+
+    async def get(self, request):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.render(paginator.get_paginated_response(serializer.data).data)
+
+
+class AsyncDetailView(AsyncReadView):
+    async def get(self, request, pk):
+        model = self.queryset.model
+        try:
+            obj = await self.get_queryset().aget(pk=pk)
+        except model.DoesNotExist:
+            raise exceptions.NotFound()
+        self.check_permissions(request, obj)
+        return self.render(self.get_serializer(obj).data)
+
+
+class PostQuerysetMixin:
+    queryset = Post.objects.all().order_by("-id")
+    serializer_class = PostSerializer
+    filterset_class = PostFilter
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_selected_fields()
+        if fields is None or "is_liked" in fields:
+            queryset = annotate_is_liked(queryset, self.request.user)
+        return queryset
+
+
+class AsyncPostListView(PostQuerysetMixin, AsyncListView):
+    pagination_class = PostPagination
+
+
+class AsyncPostDetailView(PostQuerysetMixin, AsyncDetailView):
+    pass
+
+
+class AsyncCommentListView(AsyncListView):
+    queryset = Comment.objects.all().order_by("id")
+    serializer_class = CommentSerializer
+    filterset_fields = ["post"]
+    pagination_class = CommentPagination
+
+
+class AsyncCommentDetailView(AsyncDetailView):
+    queryset = Comment.objects.all().order_by("id")
+    serializer_class = CommentSerializer
+
+
+class CommentStreamView(AsyncReadView):
+    # 게시글의 댓글 생성/수정/삭제를 SSE(text/event-stream)로 전달 (/posts/<id>/comments/stream/)
+    # 재접속 시 Last-Event-ID(또는 ?last_event_id=) 이후의 이벤트만 이어서 받음
+    async def get(self, request, pk):
+        if not await Post.objects.filter(pk=pk).aexists():
+            raise exceptions.NotFound()
+        last_event_id = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id")
+        if last_event_id is not None:
+            if not last_event_id.isdigit():
+                raise exceptions.ValidationError({"last_event_id": "정수여야 합니다."})
+            last_event_id = int(last_event_id)
+
+        channel = events.post_channel(pk)
+        bus = events.get_bus()
+        if isinstance(request._request, ASGIRequest):
+            stream = self.stream(bus.subscribe(channel, last_event_id), last_event_id is not None)
+        else:
+            # WSGI(runserver 등)에서는 연결을 유지하지 않고 놓친 이벤트만 보낸 뒤 종료 (클라이언트가 RETRY 후 재접속)
+            start_id, missed = bus.history(channel, last_event_id)
+            stream = [events.stream_preamble(start_id, last_event_id is not None, missed is None)]
+            stream += [events.format_event(event) for event in missed or []]
+        response = StreamingHttpResponse(stream, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # nginx 버퍼링 끔
+        return response
+
+    async def stream(self, subscription, resumed):
+        options = events.get_options()
+        deadline = time.monotonic() + options["MAX_DURATION"]
+        try:
+            yield events.stream_preamble(subscription.start_id, resumed, subscription.reset)
+            while True:
+                timeout = min(options["HEARTBEAT"], deadline - time.monotonic())
+                if timeout <= 0:
+                    return
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if event is None:
+                    # 버퍼가 넘쳐 끊김. 클라이언트는 마지막으로 받은 id로 재접속
+                    return
+                yield events.format_event(event)
+        finally:
+            subscription.close()
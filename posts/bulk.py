@@ -0,0 +1,188 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+class PrefetchedRelatedField(serializers.PrimaryKeyRelatedField):
+    # 배열 전체의 pk를 미리 한 번에 조회해 두고 그 안에서 찾음 (항목마다 조회하지 않음)
+    def __init__(self, objects, **kwargs):
+        self.objects = objects
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return self.objects[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+def prefetch_related_fields(serializer, items):
+    for name, field in list(serializer.fields.items()):
+        if field.read_only or type(field) is not serializers.PrimaryKeyRelatedField:
+            continue
+        pks = set()
+        for item in items:
+            try:
+                pks.add(int(item[name]))
+            except (KeyError, TypeError, ValueError):
+                pass
+        serializer.fields[name] = PrefetchedRelatedField(
+            field.get_queryset().in_bulk(pks),
+            queryset=field.queryset,
+            required=field.required,
+            allow_null=field.allow_null,
+        )
+
+
+class BulkUpdateListSerializer(serializers.ListSerializer):
+    # instance는 {id: 객체}. 항목마다 id로 찾은 객체 기준으로 검증하고, 허용 필드 외 수정은 오류로 보고
+    def __init__(self, *args, update_fields=(), **kwargs):
+        self.update_fields = update_fields
+        super().__init__(*args, **kwargs)
+
+    def run_child_validation(self, data):
+        self.child.instance = self.instance[int(data["id"])]
+        validated = super().run_child_validation(data)
+        readonly = set(validated) - set(self.update_fields)
+        if readonly:
+            raise ValidationError({name: ["일괄 수정할 수 없는 필드입니다."] for name in sorted(readonly)})
+        return validated
+
+
+class BulkModelMixin:
+    # /<prefix>/bulk/ 에 배열로 생성(POST), 수정(PATCH, 항목마다 id 포함), 삭제(DELETE, id 배열)
+    # 검증은 many=True serializer로 한 번에, 쓰기는 한 트랜잭션 안에서 bulk_create/bulk_update
+    # 한 항목이라도 실패하면 아무것도 쓰지 않고, 입력 순서대로 항목별 오류({}는 정상)를 응답
+    bulk_max_size = 100
+    bulk_update_fields = ()
+    # 응답을 만드는 액션. get_queryset에서 조회 액션과 같은 queryset(eager loading, annotate)을 주도록
+    bulk_read_actions = ("bulk", "bulk_update")
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"non_field_errors": ["항목 배열이 필요합니다."]})
+        if len(items) > self.bulk_max_size:
+            raise ValidationError({"non_field_errors": [f"한 번에 최대 {self.bulk_max_size}개까지 처리할 수 있습니다."]})
+        return items
+
+    def get_bulk_serializer(self, items):
+        serializer = self.get_serializer(data=items, many=True)
+        prefetch_related_fields(serializer.child, [item for item in items if isinstance(item, dict)])
+        return serializer
+
+    def get_bulk_objects(self, ids):
+        # 대상 전체를 한 번의 쿼리로 조회(수정/삭제할 행이므로 잠금)한 뒤 존재 여부와 작성자 권한을 항목별로 확인
+        objects = self.queryset.model.objects.select_for_update().in_bulk(ids)
+        permissions = self.get_permissions()
+        errors = []
+        status_code = None
+        for pk in ids:
+            obj = objects.get(pk)
+            if obj is None:
+                errors.append({"id": ["존재하지 않습니다."]})
+                status_code = status_code or status.HTTP_404_NOT_FOUND
+            elif not all(permission.has_object_permission(self.request, self, obj) for permission in permissions):
+                errors.append({"detail": "권한이 없습니다."})
+                status_code = status.HTTP_403_FORBIDDEN
+            else:
+                errors.append({})
+        return objects, errors, status_code
+
+    def get_bulk_ids(self, values, bare_ids=False):
+        # 수정은 {"id": ..., 필드...} 객체, 삭제는 id만 있는 배열도 허용
+        ids = []
+        errors = []
+        for value in values:
+            if not isinstance(value, dict) and not bare_ids:
+                ids.append(None)
+                errors.append({"non_field_errors": ["id를 포함한 객체가 필요합니다."]})
+                continue
+            pk = value.get("id") if isinstance(value, dict) else value
+            try:
+                ids.append(int(pk))
+                errors.append({})
+            except (TypeError, ValueError):
+                errors.append({"id": ["올바른 id가 필요합니다."]})
+        if any(errors):
+            raise ValidationError(errors)
+        if len(set(ids)) != len(ids):
+            raise ValidationError({"non_field_errors": ["id가 중복되었습니다."]})
+        return ids
+
+    def bulk_response(self, ids, status_code):
+        # 생성/수정된 객체를 조회용 serializer로 응답 (단건 조회와 같은 get_queryset)
+        read_serializer = self.get_bulk_read_serializer_class()
+        queryset = self.get_queryset().filter(pk__in=ids).order_by("id")
+        serializer = read_serializer(queryset, many=True, context=self.get_serializer_context())
+        return Response(serializer.data, status=status_code)
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        items = self.get_bulk_items(request)
+        serializer = self.get_bulk_serializer(items)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            objects = self.perform_bulk_create(serializer.validated_data)
+        return self.bulk_response([obj.pk for obj in objects], status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request):
+        items = self.get_bulk_items(request)
+        ids = self.get_bulk_ids(items)
+        with transaction.atomic():
+            objects, errors, status_code = self.get_bulk_objects(ids)
+            if status_code is not None:
+                return Response(errors, status=status_code)
+            child = self.get_serializer_class()(context=self.get_serializer_context())
+            prefetch_related_fields(child, items)
+            serializer = BulkUpdateListSerializer(
+                child=child,
+                instance=objects,
+                data=items,
+                partial=True,
+                update_fields=self.bulk_update_fields,
+                context=self.get_serializer_context(),
+            )
+            serializer.is_valid(raise_exception=True)
+            now = timezone.now()
+            changed = set()
+            for pk, attrs in zip(ids, serializer.validated_data):
+                obj = objects[pk]
+                for name, value in attrs.items():
+                    setattr(obj, name, value)
+                    changed.add(name)
+                obj.updated_at = now
+            updated = [objects[pk] for pk in ids]
+            self.queryset.model.objects.bulk_update(updated, sorted(changed) + ["updated_at"])
+            self.after_bulk_update(updated, changed)
+        return self.bulk_response(ids, status.HTTP_200_OK)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request):
+        ids = self.get_bulk_ids(self.get_bulk_items(request), bare_ids=True)
+        with transaction.atomic():
+            objects, errors, status_code = self.get_bulk_objects(ids)
+            if status_code is not None:
+                return Response(errors, status=status_code)
+            # queryset.delete()는 한 번의 DELETE로 지우고 post_delete 시그널(카운터, 캐시, 검색 색인)도 보냄
+            self.queryset.model.objects.filter(pk__in=ids).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def perform_bulk_create(self, validated_data):
+        # 기본값: 검증된 항목을 그대로 bulk_create (시그널이 필요한 모델은 재정의)
+        model = self.queryset.model
+        return model.objects.bulk_create([model(**attrs) for attrs in validated_data])
+
+    def after_bulk_update(self, objects, changed):
+        pass
+
+    def get_bulk_read_serializer_class(self):
+        return self.get_serializer_class()
@@ -0,0 +1,293 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from pypost.db import replicas
+from users.models import Profile
+from .models import Post, Comment
+
+
+def generation_key(model, pk=None):
+    if pk is None:
+        return f"pypost:gen:{model._meta.label_lower}"
+    return f"pypost:gen:{model._meta.label_lower}:{pk}"
+
+
+def count_generation_key(model):
+    # 목록 COUNT용 버전. 행 추가/삭제와 필터 값을 바꿀 수 있는 저장에만 올림
+    # (좋아요/댓글 카운터 갱신으로는 올리지 않으므로 쓰기가 많아도 COUNT(*)를 매번 다시 하지 않음)
+    return f"pypost:gen:count:{model._meta.label_lower}"
+
+
+def lookup_value(view, kwargs):
+    # URL의 lookup 값을 모델 필드 값으로 변환 (/posts/01/도 invalidate(Post, 1)이 올리는 버전을 쓰도록)
+    # 변환할 수 없는 값(/posts/abc/)이면 None
+    model = view.queryset.model
+    field = model._meta.pk if view.lookup_field == "pk" else model._meta.get_field(view.lookup_field)
+    try:
+        return field.to_python(kwargs[view.lookup_url_kwarg or view.lookup_field])
+    except ValidationError:
+        return None
+
+
+def get_generations(*keys):
+    # 버전 번호. 변경이 생기면 올라가므로 이전 버전으로 만든 캐시 키는 자연히 무효화
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # 캐시가 비워진 경우에도 이전 값과 겹치지 않도록 시간 기반으로 초기화
+            cache.add(key, time.time_ns(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+async def aget_generations(*keys):
+    # async 뷰용 get_generations
+    generations = await cache.aget_many(keys)
+    for key in keys:
+        if key not in generations:
+            await cache.aadd(key, time.time_ns(), None)
+            generations[key] = await cache.aget(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(model, pk=None):
+    bump_key(generation_key(model, pk))
+
+
+def bump_key(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def result_key(name, generations, query):
+    return "pypost:{}:{}:{}".format(
+        name,
+        ":".join(str(generation) for generation in generations),
+        hashlib.md5(query.encode("utf-8")).hexdigest(),
+    )
+
+
+def cached_result(name, generation_keys, query, compute, timeout=60):
+    # 버전 번호 + 쿼리 기준으로 결과를 캐시 (관련 데이터가 바뀌면 버전이 올라가 자동 무효화)
+    key = result_key(name, get_generations(*generation_keys), query)
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, replicas.cache_timeout(timeout))
+    return result
+
+
+async def acached_result(name, generation_keys, query, compute, timeout=60):
+    # cached_result의 async 버전 (compute는 코루틴 함수). 같은 키를 쓰므로 sync 뷰와 캐시를 공유
+    key = result_key(name, await aget_generations(*generation_keys), query)
+    result = await cache.aget(key)
+    if result is None:
+        result = await compute()
+        await cache.aset(key, result, replicas.cache_timeout(timeout))
+    return result
+
+
+def invalidate(model, pk=None):
+    # 커밋 전에 다른 요청이 옛 데이터를 새 버전으로 캐시하지 않도록 커밋 후에도 한 번 더 올림
+    bump_generation(model, pk)
+    transaction.on_commit(lambda: bump_generation(model, pk))
+
+
+def invalidate_count(model):
+    key = count_generation_key(model)
+    bump_key(key)
+    transaction.on_commit(lambda: bump_key(key))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    invalidate(Post, instance.pk)
+    invalidate(Post)
+    invalidate_count(Post)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    # 게시글 응답에 댓글이 포함되므로 해당 게시글도 무효화
+    invalidate(Comment, instance.pk)
+    invalidate(Comment)
+    invalidate_count(Comment)
+    invalidate(Post, instance.post_id)
+    previous_post_id = getattr(instance, "_previous_post_id", None)
+    if previous_post_id is not None and previous_post_id != instance.post_id:
+        invalidate(Post, previous_post_id)
+    invalidate(Post)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile(sender, **kwargs):
+    # 프로필은 여러 게시글/댓글 응답에 포함되므로 프로필 버전 전체를 올림
+    invalidate(Profile)
+
+
+@receiver(m2m_changed, sender=Post.likes.through)
+def invalidate_likes(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        post_ids = [instance.pk]
+    elif action == "post_clear":
+        post_ids = getattr(instance, "_cleared_like_post_ids", [])
+    else:
+        post_ids = pk_set
+    for post_id in post_ids:
+        invalidate(Post, post_id)
+    # 목록 응답(like_count)이 달라지므로 게시글 전체 버전도 올림
+    invalidate(Post)
+    # 게시글 COUNT는 그대로이고, ?likes= 필터의 COUNT만 달라짐 (PostPagination.count_filter_dependencies)
+    invalidate_count(Post.likes.through)
+
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def record(name, hit):
+    with _stats_lock:
+        _stats[(name, "hit" if hit else "miss")] += 1
+
+
+def get_cache_stats():
+    with _stats_lock:
+        stats = {}
+        for (name, result), count in _stats.items():
+            stats.setdefault(name, {"hit": 0, "miss": 0})[result] = count
+        return stats
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class CachedResponseMixin:
+    # 익명 GET 요청의 list/retrieve 응답 데이터를 캐시 (요청 유저마다 is_liked가 다르므로 인증 요청은 제외)
+    # 만료는 cache_timeout, 크기 제한은 CACHES의 MAX_ENTRIES로 관리
+    cache_timeout = 60
+    list_cache_dependencies = ()
+    detail_cache_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        keys = [generation_key(model) for model in self.list_cache_dependencies]
+        return self.cached_response("list", keys, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = lookup_value(self, kwargs)
+        if lookup is None:
+            # 잘못된 id는 캐시하지 않고 get_object의 404로
+            return super().retrieve(request, *args, **kwargs)
+        keys = [generation_key(self.queryset.model, lookup)]
+        keys += [generation_key(dependency) for dependency in self.detail_cache_dependencies]
+        return self.cached_response("detail", keys, super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, action, generation_keys, view, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        name = f"{self.basename}-{action}"
+        uri = request.build_absolute_uri()
+        key = "pypost:response:{}:{}:{}".format(
+            name,
+            ":".join(str(generation) for generation in get_generations(*generation_keys)),
+            hashlib.md5(uri.encode("utf-8")).hexdigest(),
+        )
+        data = cache.get(key)
+        if data is not None:
+            record(name, hit=True)
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+
+        record(name, hit=False)
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, replicas.cache_timeout(self.cache_timeout))
+        response["X-Cache"] = "MISS"
+        return response
+
+
+class ConditionalGetMixin:
+    # 본문을 만들지 않고 max(updated_at) + 개수만으로 ETag/Last-Modified 계산
+    # If-None-Match / If-Modified-Since가 일치하면 직렬화 없이 304 응답
+    # 계산 결과는 CachedResponseMixin과 같은 의존 모델의 버전 번호로 캐시
+    list_cache_dependencies = ()
+    detail_cache_dependencies = ()
+    validator_timeout = 60
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.queryset.all()).order_by()
+        keys = [generation_key(model) for model in self.list_cache_dependencies]
+        validators = cached_result(
+            "validators",
+            keys,
+            str(queryset.values("pk").query),
+            lambda: queryset.aggregate(last_modified=Max("updated_at"), count=Count("pk")),
+            self.validator_timeout,
+        )
+        return self.conditional_response(
+            validators["last_modified"], validators["count"], super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = lookup_value(self, kwargs)
+        if lookup is None:
+            return super().retrieve(request, *args, **kwargs)
+        model = self.queryset.model
+        keys = [generation_key(model, lookup)]
+        keys += [generation_key(dependency) for dependency in self.detail_cache_dependencies]
+        # get_object와 같은 쿼리셋 (get_queryset/filter_queryset의 조건 반영)
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: lookup}).order_by()
+        queryset = queryset.values_list("updated_at", flat=True)
+        last_modified = cached_result(
+            f"last-modified:{model._meta.label_lower}",
+            keys,
+            str(queryset.query),
+            queryset.first,
+            self.validator_timeout,
+        )
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(last_modified, 1, super().retrieve, request, *args, **kwargs)
+
+    def conditional_response(self, last_modified, count, view, request, *args, **kwargs):
+        # 유저마다 is_liked가 다르고 페이지/필터마다 내용이 다르므로 함께 반영
+        validator = "{}:{}:{}:{}".format(
+            request.get_full_path(),
+            last_modified.isoformat() if last_modified else "",
+            count,
+            request.user.pk or "",
+        )
+        etag = quote_etag(hashlib.md5(validator.encode("utf-8")).hexdigest())
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = view(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+            patch_vary_headers(response, ["Authorization"])
+        return response
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import Comment
+from .serializers import CommentSerializer
+
+DEFAULT_OPTIONS = {
+    "BACKEND": "memory",  # BACKENDS의 이름 또는 EventBus 하위 클래스의 경로
+    "BUFFER_SIZE": 100,  # 구독자별 대기 이벤트 수. 넘치면 연결을 끊고 Last-Event-ID로 이어받게 함
+    "HISTORY_SIZE": 1000,  # 재접속 시 이어받을 수 있도록 보관하는 최근 이벤트 수 (전체 채널 합)
+    "HEARTBEAT": 15,  # 이벤트가 없을 때 연결 유지용 주석을 보내는 간격 (초)
+    "MAX_DURATION": 300,  # 한 연결의 최대 유지 시간 (초). 끊긴 연결이 남지 않도록 주기적으로 재접속시킴
+    "RETRY": 3000,  # 클라이언트 재접속 대기 시간 (ms)
+}
+
+Event = namedtuple("Event", ["id", "type", "data"])
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_options():
+    return {**DEFAULT_OPTIONS, **getattr(settings, "COMMENT_STREAM", {})}
+
+
+def format_event(event):
+    return f"id: {event.id}\nevent: {event.type}\ndata: {event.data}\n\n"
+
+
+def stream_preamble(start_id, resumed, reset):
+    # 재접속 대기 시간, 그리고 처음 연결이면 ready, 이어받을 수 없으면 reset 이벤트 (id는 이어받을 기준점)
+    # reset을 받은 클라이언트는 /posts/<id>/comments/ 를 다시 조회
+    preamble = f"retry: {get_options()['RETRY']}\n\n"
+    if reset:
+        preamble += format_event(Event(start_id, "reset", "{}"))
+    elif not resumed:
+        preamble += format_event(Event(start_id, "ready", "{}"))
+    return preamble
+
+
+class Subscription:
+    # 구독자 한 명의 이벤트 큐. 이벤트 루프 스레드에서만 읽고, 발행은 call_soon_threadsafe로 넘겨받음
+    def __init__(self, bus, channel, buffer_size):
+        self.bus = bus
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=buffer_size)
+        self.start_id = None
+        self.reset = False  # 놓친 이벤트를 이어받을 수 없음 (기록 범위 밖)
+        self.closed = False
+
+    def put(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self.deliver, event)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힘
+            self.bus.unsubscribe(self)
+
+    def deliver(self, event):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 느린 구독자는 끊음. 보내지 못한 이벤트는 재접속 시 Last-Event-ID 이후로 다시 받음
+            self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.bus.unsubscribe(self)
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self):
+        # 닫히면 None
+        if self.closed and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+
+class EventBus(ABC):
+    # 채널별 발행/구독. 여러 프로세스에서 실행할 때는 같은 메서드를 공유 저장소(Redis 등)로 구현
+    # 메서드를 하나라도 빠뜨린 하위 클래스는 인스턴스를 만들 때 TypeError
+    @abstractmethod
+    def publish(self, channel, event_type, data):
+        pass
+
+    @abstractmethod
+    def subscribe(self, channel, last_event_id=None):
+        # 이벤트 루프 안에서 호출. last_event_id 이후 놓친 이벤트를 먼저 큐에 넣은 Subscription 반환
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, subscription):
+        pass
+
+    @abstractmethod
+    def history(self, channel, last_event_id=None):
+        # (현재 마지막 id, last_event_id 이후의 이벤트 목록). 이어받을 수 없으면 목록 대신 None
+        pass
+
+
+class InMemoryBus(EventBus):
+    # 프로세스 내 버스. 같은 프로세스의 구독자에게만 전달됨 (ASGI 워커 1개 기준)
+    def __init__(self, history_size=1000):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._history = deque(maxlen=history_size)
+        # 재시작해도 이전 프로세스의 id보다 커지도록 시각 기반으로 시작
+        self._last_id = time.time_ns() // 1000
+        self._evicted_id = self._last_id  # 이 id까지는 기록에 없음
+
+    def publish(self, channel, event_type, data):
+        payload = json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, event_type, payload)
+            if len(self._history) == self._history.maxlen:
+                self._evicted_id = self._history[0][1].id
+            self._history.append((channel, event))
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+        return event
+
+    def subscribe(self, channel, last_event_id=None):
+        subscription = Subscription(self, channel, get_options()["BUFFER_SIZE"])
+        with self._lock:
+            # 등록과 기록 조회를 같은 잠금 안에서 해서 그 사이의 이벤트가 빠지거나 중복되지 않게 함
+            self._subscribers[channel].add(subscription)
+            subscription.start_id, missed = self._missed(channel, last_event_id)
+            maxsize = subscription.queue.maxsize
+            if missed is None or (maxsize and len(missed) > maxsize):
+                subscription.reset = True
+            else:
+                for event in missed:
+                    subscription.queue.put_nowait(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def history(self, channel, last_event_id=None):
+        with self._lock:
+            return self._missed(channel, last_event_id)
+
+    def _missed(self, channel, last_event_id):
+        if last_event_id is None:
+            return self._last_id, []
+        # 기록에서 밀려났거나 다른(재시작 전) 프로세스의 id
+        if not self._evicted_id <= last_event_id <= self._last_id:
+            return self._last_id, None
+        return self._last_id, [event for name, event in self._history if name == channel and event.id > last_event_id]
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+
+BACKENDS = {
+    "memory": InMemoryBus,
+}
+
+
+def get_bus():
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            options = get_options()
+            backend = BACKENDS.get(options["BACKEND"]) or import_string(options["BACKEND"])
+            _bus = backend(history_size=options["HISTORY_SIZE"])
+        return _bus
+
+
+def post_channel(post_id):
+    return f"post:{post_id}:comments"
+
+
+def comment_data(comment):
+    return CommentSerializer(comment).data
+
+
+def publish_on_commit(post_id, event_type, data):
+    # 롤백된 변경은 보내지 않도록 커밋 후 발행
+    transaction.on_commit(lambda: get_bus().publish(post_channel(post_id), event_type, data))
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_post_id = getattr(instance, "_previous_post_id", None)
+    data = comment_data(instance)
+    if created:
+        publish_on_commit(instance.post_id, "comment.created", data)
+    elif previous_post_id is not None and previous_post_id != instance.post_id:
+        # 다른 게시글로 옮겨진 댓글
+        publish_on_commit(previous_post_id, "comment.deleted", {"id": instance.pk, "post": previous_post_id})
+        publish_on_commit(instance.post_id, "comment.created", data)
+    else:
+        publish_on_commit(instance.post_id, "comment.updated", data)
+
+
+@receiver(post_delete, sender=Comment)
+def publish_comment_deleted(sender, instance, **kwargs):
+    # post_delete 시점에는 pk가 아직 남아 있음
+    publish_on_commit(instance.post_id, "comment.deleted", {"id": instance.pk, "post": instance.post_id})
@@ -0,0 +1,99 @@
+import csv
+import datetime
+import json
+from itertools import groupby, islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Post, Comment
+
+POST_FIELDS = ["id", "author_id", "profile_id", "title", "category", "body", "image", "published_date", "updated_at"]
+COMMENT_FIELDS = ["id", "post_id", "author_id", "profile_id", "text", "updated_at"]
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class ExportEncoder(DjangoJSONEncoder):
+    # 증분 내보내기(since)에 그대로 다시 쓸 수 있도록 시각은 마이크로초까지 유지
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def export_fields(comments=False, likes=False):
+    fields = list(POST_FIELDS)
+    if likes:
+        fields.append("like_count")
+    if comments:
+        fields += ["comment_count", "comments"]
+    return fields
+
+
+def export_records(since_id=None, since=None, comments=False, likes=False, chunk_size=1000):
+    # 게시글을 chunk_size 단위로 읽고, 댓글은 청크마다 한 번에 조회해 붙임 (전체를 메모리에 올리지 않음)
+    # since_id: 그 id 이후 새 글, since: 그 시각 이후 생성/수정된 글 (댓글, 좋아요 변경 포함)
+    queryset = Post.objects.all()
+    if since_id is not None:
+        queryset = queryset.filter(id__gt=since_id)
+    if since is not None:
+        # updated_at 인덱스 순서 그대로 읽음
+        queryset = queryset.filter(updated_at__gte=since).order_by("updated_at", "id")
+    else:
+        queryset = queryset.order_by("id")
+    fields = [name for name in export_fields(comments, likes) if name != "comments"]
+    rows = queryset.values(*fields).iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        if comments:
+            post_comments = {
+                post_id: list(group)
+                for post_id, group in groupby(
+                    Comment.objects.filter(post_id__in=[row["id"] for row in chunk])
+                    .order_by("post_id", "id")
+                    .values(*COMMENT_FIELDS)
+                    .iterator(chunk_size=chunk_size),
+                    key=lambda comment: comment["post_id"],
+                )
+            }
+            for row in chunk:
+                row["comments"] = post_comments.get(row["id"], [])
+        yield from chunk
+
+
+def render_ndjson(records):
+    for record in records:
+        yield json.dumps(record, cls=ExportEncoder, ensure_ascii=False) + "\n"
+
+
+class _Echo:
+    # csv.writer가 쓴 한 줄을 그대로 돌려주는 버퍼 (스트리밍용)
+    def write(self, value):
+        return value
+
+
+def render_csv(records, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for record in records:
+        row = []
+        for name in fields:
+            value = record[name]
+            if name == "comments":
+                value = json.dumps(value, cls=ExportEncoder, ensure_ascii=False)
+            elif hasattr(value, "isoformat"):
+                value = value.isoformat()
+            row.append(value)
+        yield writer.writerow(row)
+
+
+def render(output, since_id=None, since=None, comments=False, likes=False, chunk_size=1000):
+    records = export_records(since_id, since, comments, likes, chunk_size)
+    if output == "csv":
+        return render_csv(records, export_fields(comments, likes))
+    return render_ndjson(records)
@@ -0,0 +1,17 @@
+from django.contrib.auth.models import User
+from django_filters import rest_framework as filters
+
+from .models import Post
+
+
+class PostFilter(filters.FilterSet):
+    likes = filters.ModelChoiceFilter(queryset=User.objects.all(), method="filter_likes")
+
+    class Meta:
+        model = Post
+        fields = ['author', 'likes', 'category']
+
+    def filter_likes(self, queryset, name, value):
+        # JOIN + DISTINCT 대신 IN 서브쿼리: (user_id, post_id) 인덱스로 찾고 id 순서 그대로 정렬 (임시 B-tree 없음)
+        liked = Post.likes.through.objects.filter(user_id=value.pk).values("post_id")
+        return queryset.filter(id__in=liked)
@@ -0,0 +1,182 @@
+import time
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from users.models import Profile
+from .cache import invalidate, invalidate_count
+from .models import Post, Comment, hot_score
+from .search import get_search_backend
+
+# 부모가 먼저 저장되도록 이 순서로 flush
+RECORD_TYPES = ["user", "profile", "post", "comment", "like"]
+PROFILE_FIELDS = ["nickname", "position", "subjects", "image"]
+
+
+def parse_time(value):
+    if not value:
+        return timezone.now()
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"잘못된 시각: {value}")
+    return parsed
+
+
+class Importer:
+    # NDJSON 레코드를 종류별로 모아 batch_size마다 bulk_create (한 줄씩 save하지 않음)
+    # 레코드: {"type": "user" | "profile" | "post" | "comment" | "like", ...}
+    # type이 없으면 export_posts 출력(게시글, 댓글은 comments에 포함)으로 보고 게시글로 처리
+    # id를 그대로 유지하고 이미 있는 행은 건너뛰므로 같은 파일을 다시 넣어도 됨
+    def __init__(self, batch_size=5000, stdout=None):
+        self.batch_size = batch_size
+        self.stdout = stdout
+        self.buffers = {record_type: [] for record_type in RECORD_TYPES}
+        self.counts = Counter()
+        self.started = time.perf_counter()
+
+    def add(self, record):
+        if not isinstance(record, dict):
+            raise ValueError(f"레코드는 JSON 객체여야 합니다: {record!r}")
+        record_type = record.get("type") or ("post" if "title" in record else None)
+        if record_type not in self.buffers:
+            raise ValueError(f"알 수 없는 레코드 종류: {record_type}")
+        comments = record.pop("comments", None) if record_type == "post" else None
+        self.buffers[record_type].append(getattr(self, f"build_{record_type}")(record))
+        if len(self.buffers[record_type]) >= self.batch_size:
+            self.flush(record_type)
+        for comment in comments or []:
+            if not isinstance(comment, dict):
+                raise ValueError(f"댓글은 JSON 객체여야 합니다: {comment!r}")
+            self.add({"type": "comment", **comment})
+
+    def build_user(self, record):
+        return User(
+            id=record["id"],
+            username=record["username"],
+            email=record.get("email", ""),
+            # 비밀번호 해시가 없으면 로그인 불가 상태로 생성
+            password=record.get("password") or make_password(None),
+            first_name=record.get("first_name", ""),
+            last_name=record.get("last_name", ""),
+            is_staff=record.get("is_staff", False),
+            is_active=record.get("is_active", True),
+            date_joined=parse_time(record.get("date_joined")),
+        )
+
+    def build_profile(self, record):
+        user_id = record.get("user_id", record.get("user"))
+        profile = Profile(user_id=user_id, **{name: record[name] for name in PROFILE_FIELDS if name in record})
+        # 이미 있는 프로필은 레코드에 있는 필드만 덮어씀
+        profile.import_fields = tuple(name for name in PROFILE_FIELDS if name in record)
+        return profile
+
+    def build_post(self, record):
+        author_id = record.get("author_id", record.get("author"))
+        post = Post(
+            id=record["id"],
+            author_id=author_id,
+            profile_id=record.get("profile_id", record.get("profile", author_id)),
+            title=record["title"],
+            category=record.get("category", ""),
+            body=record.get("body", ""),
+            image=record.get("image") or "default.png",
+            published_date=parse_time(record.get("published_date")),
+        )
+        post.hot_score = hot_score(0, 0, post.published_date)
+        return post
+
+    def build_comment(self, record):
+        author_id = record.get("author_id", record.get("author"))
+        return Comment(
+            id=record.get("id"),
+            post_id=record.get("post_id", record.get("post")),
+            author_id=author_id,
+            profile_id=record.get("profile_id", record.get("profile", author_id)),
+            text=record["text"],
+        )
+
+    def build_like(self, record):
+        return Post.likes.through(
+            post_id=record.get("post_id", record.get("post")),
+            user_id=record.get("user_id", record.get("user")),
+        )
+
+    def flush(self, upto=None):
+        # upto까지(부모 종류 포함) 쌓인 레코드를 저장. 종류마다 한 트랜잭션
+        for record_type in RECORD_TYPES:
+            objects = self.buffers[record_type]
+            if objects:
+                try:
+                    with transaction.atomic():
+                        getattr(self, f"save_{record_type}s")(objects)
+                except IntegrityError as e:
+                    raise IntegrityError(f"{record_type} {len(objects)}건 배치 저장 실패: {e}") from e
+                self.counts[record_type] += len(objects)
+                self.buffers[record_type] = []
+            if record_type == upto:
+                break
+        self.report_progress()
+
+    def save_users(self, users):
+        User.objects.bulk_create(users, ignore_conflicts=True)
+        # create_user_profile 시그널(유저마다 INSERT) 대신 기본 프로필을 한 번에 생성
+        Profile.objects.bulk_create([Profile(user_id=user.id) for user in users], ignore_conflicts=True)
+
+    def save_profiles(self, profiles):
+        # 레코드마다 있는 필드가 다를 수 있으므로 필드 조합별로 나눠 저장
+        groups = {}
+        for profile in profiles:
+            groups.setdefault(profile.import_fields, []).append(profile)
+        for fields, group in groups.items():
+            if fields:
+                Profile.objects.bulk_create(group, update_conflicts=True, unique_fields=["user"], update_fields=fields)
+            else:
+                Profile.objects.bulk_create(group, ignore_conflicts=True)
+
+    def save_posts(self, posts):
+        # ignore_conflicts로 건너뛴 기존 게시글은 색인을 덮어쓰지 않도록, 실제로 들어간 행만 색인
+        existing = set(
+            Post.objects.select_for_update().filter(pk__in=[post.id for post in posts]).values_list("id", flat=True)
+        )
+        Post.objects.bulk_create(posts, ignore_conflicts=True)
+        inserted = []
+        for post in posts:
+            if post.id not in existing:
+                existing.add(post.id)
+                inserted.append(post)
+        get_search_backend().index_rows([(post.id, post.title, post.body) for post in inserted])
+
+    def save_comments(self, comments):
+        Comment.objects.bulk_create(comments, ignore_conflicts=True)
+
+    def save_likes(self, likes):
+        Post.likes.through.objects.bulk_create(likes, ignore_conflicts=True)
+
+    def finish(self):
+        self.flush()
+        # id를 직접 넣었으므로 이후 생성되는 행의 id가 겹치지 않도록 시퀀스 재설정 (SQLite는 자동)
+        statements = connection.ops.sequence_reset_sql(no_style(), [User, Post, Comment])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+        # bulk_create는 시그널이 없으므로 카운터/인기 점수는 실제 행 기준으로 한 번에 재계산
+        call_command("reconcile_post_counts", stdout=self.stdout)
+        for model in [Profile, Post, Comment]:
+            invalidate(model)
+        for model in [Post, Comment, Post.likes.through]:
+            invalidate_count(model)
+
+    def rows_per_second(self):
+        return sum(self.counts.values()) / max(time.perf_counter() - self.started, 1e-9)
+
+    def report_progress(self):
+        if self.stdout is not None:
+            counts = ", ".join(f"{record_type} {self.counts[record_type]}" for record_type in RECORD_TYPES)
+            self.stdout.write(f"{counts} ({self.rows_per_second():.0f} rows/s)")
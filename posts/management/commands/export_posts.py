@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from posts import export
+
+
+class Command(BaseCommand):
+    help = "게시글(선택적으로 댓글, 좋아요 수 포함)을 NDJSON 또는 CSV로 내보냅니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=list(export.FORMATS), default="ndjson")
+        parser.add_argument("--comments", action="store_true", help="댓글 포함")
+        parser.add_argument("--likes", action="store_true", help="좋아요 수 포함")
+        parser.add_argument("--since-id", type=int, help="이 id 이후에 생성된 게시글만")
+        parser.add_argument("--since", help="이 시각(ISO 8601) 이후 생성/수정된 게시글만")
+        parser.add_argument("--output", "-o", help="저장할 파일 (기본: 표준 출력)")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        since = options["since"]
+        if since is not None:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                raise CommandError("--since는 ISO 8601 형식의 시각이어야 합니다.")
+
+        lines = export.render(
+            options["format"],
+            since_id=options["since_id"],
+            since=since,
+            comments=options["comments"],
+            likes=options["likes"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as f:
+                f.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
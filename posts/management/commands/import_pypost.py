@@ -0,0 +1,45 @@
+import json
+import sys
+from io import StringIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from posts.importer import Importer
+
+
+class Command(BaseCommand):
+    help = "NDJSON 파일(유저, 프로필, 게시글, 댓글, 좋아요)을 bulk_create로 빠르게 가져옵니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON 파일 경로 ('-'이면 표준 입력)")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        progress = self.stdout if options["verbosity"] > 1 else StringIO()
+        importer = Importer(batch_size=options["batch_size"], stdout=progress)
+        stream = sys.stdin if options["path"] == "-" else open(options["path"], encoding="utf-8")
+        try:
+            # 한 줄씩 읽어 처리 (파일 전체를 메모리에 올리지 않음)
+            for line_number, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                try:
+                    importer.add(json.loads(line))
+                except (ValueError, KeyError) as e:
+                    raise CommandError(f"{line_number}번째 줄: {e!r}")
+                except IntegrityError as e:
+                    # 배치가 가득 차 저장하다 실패 (해당 배치만 롤백, 이전 배치는 저장된 상태)
+                    raise CommandError(f"{line_number}번째 줄까지 읽은 뒤 {e}")
+            try:
+                importer.finish()
+            except IntegrityError as e:
+                raise CommandError(f"마지막 배치: {e}")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        counts = ", ".join(f"{name} {count}" for name, count in importer.counts.items())
+        self.stdout.write(self.style.SUCCESS(
+            f"가져오기 완료: {counts} ({importer.rows_per_second():.0f} rows/s)"
+        ))
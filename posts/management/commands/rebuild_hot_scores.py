@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.cache import invalidate
+from posts.models import Post, hot_score
+
+
+class Command(BaseCommand):
+    help = "게시글 인기 점수(hot_score)를 카운터와 게시 시각 기준으로 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        # 점수는 좋아요/댓글 변경 시 증분으로 갱신되므로, 주기적으로 돌려 누적 오차나 계산식 변경만 반영
+        batch_size = options["batch_size"]
+        last_id = 0
+        fixed = 0
+        while True:
+            # id 범위 단위로 나눠서 처리 (전체 테이블을 메모리에 올리지 않음)
+            # 읽기와 쓰기를 한 트랜잭션에서 잠금을 잡고 실행: 그 사이 들어온 좋아요/댓글의 점수 증분을
+            # 옛 카운터로 계산한 값으로 덮어쓰면 오차가 영구히 남음
+            with transaction.atomic():
+                rows = list(
+                    Post.objects.select_for_update()
+                    .filter(pk__gt=last_id)
+                    .order_by("pk")
+                    .values_list("pk", "like_count", "comment_count", "published_date", "hot_score")[:batch_size]
+                )
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                drifted = []
+                for pk, like_count, comment_count, published_date, score in rows:
+                    expected = hot_score(like_count, comment_count, published_date)
+                    if abs(expected - score) > 1e-9:
+                        drifted.append(Post(pk=pk, hot_score=expected))
+                Post.objects.bulk_update(drifted, ["hot_score"])
+            fixed += len(drifted)
+        if fixed:
+            # bulk_update는 시그널이 없으므로 캐시된 trending 응답 직접 무효화
+            invalidate(Post)
+        self.stdout.write(self.style.SUCCESS(f"{fixed}개 게시글의 인기 점수를 수정했습니다."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "게시글 검색 색인을 처음부터 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            indexed = get_search_backend().rebuild(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{indexed}개 게시글을 색인했습니다."))
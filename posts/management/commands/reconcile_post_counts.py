@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from posts.cache import invalidate
+from posts.models import Post, like_count_subquery, comment_count_subquery, updated_hot_score
+
+
+class Command(BaseCommand):
+    help = "게시글의 like_count/comment_count를 실제 데이터 기준으로 다시 맞춥니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        fixed = 0
+        while True:
+            # id 범위 단위로 나눠서 처리 (전체 테이블을 메모리에 올리지 않음)
+            ids = list(
+                Post.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            with transaction.atomic():
+                drifted = list(
+                    Post.objects.select_for_update()
+                    .filter(pk__in=ids)
+                    .annotate(actual_likes=like_count_subquery(), actual_comments=comment_count_subquery())
+                    .exclude(like_count=F("actual_likes"), comment_count=F("actual_comments"))
+                    .values_list("pk", flat=True)
+                )
+                fixed += Post.objects.filter(pk__in=drifted).update(
+                    like_count=like_count_subquery(),
+                    comment_count=comment_count_subquery(),
+                    hot_score=updated_hot_score(
+                        like_count=like_count_subquery(), comment_count=comment_count_subquery()
+                    ),
+                    updated_at=timezone.now(),
+                )
+                # update()는 시그널이 없으므로 캐시된 게시글/목록 응답 직접 무효화
+                for pk in drifted:
+                    invalidate(Post, pk)
+                if drifted:
+                    invalidate(Post)
+        self.stdout.write(self.style.SUCCESS(f"{fixed}개 게시글의 카운터를 수정했습니다."))
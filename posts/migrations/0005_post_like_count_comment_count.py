@@ -0,0 +1,37 @@
+# Generated by Django 4.2.17 on 2026-10-18 19:25
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    likes = Post.likes.through.objects.filter(post_id=OuterRef('pk')).values('post_id')
+    comments = Comment.objects.filter(post_id=OuterRef('pk')).values('post_id')
+    Post.objects.update(
+        like_count=Coalesce(Subquery(likes.annotate(c=Count('*')).values('c')), 0),
+        comment_count=Coalesce(Subquery(comments.annotate(c=Count('*')).values('c')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_rename_test_comment_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
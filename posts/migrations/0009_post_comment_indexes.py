@@ -0,0 +1,39 @@
+# Generated by Django 4.2.17 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_comment_post_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['updated_at'], name='comment_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author', 'id'], name='post_author_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['category', 'id'], name='post_category_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['published_date'], name='post_published_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['updated_at'], name='post_updated_at_idx'),
+        ),
+        # 자동 생성된 likes through 테이블은 Meta로 인덱스를 지정할 수 없으므로 직접 생성
+        # (?likes=<user> 필터: user_id로 찾고 post_id 순으로 정렬)
+        migrations.RunSQL(
+            'CREATE INDEX post_likes_user_post_idx ON posts_post_likes (user_id, post_id)',
+            'DROP INDEX post_likes_user_post_idx',
+        ),
+    ]
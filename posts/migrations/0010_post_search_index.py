@@ -0,0 +1,99 @@
+# Generated by Django 4.2.17 on 2026-10-18 19:49
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# 마이그레이션 시점의 색인 방식 그대로 (이후 posts.search가 바뀌어도 이 마이그레이션의 동작은 같음)
+HANGUL = "\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3"
+TOKEN_RE = re.compile(f"[{HANGUL}]+|[^\\W{HANGUL}]+")
+HANGUL_RE = re.compile(f"[{HANGUL}]+")
+
+
+def tokenize(text):
+    # 한글 연속 구간은 2글자(bigram)씩, 그 외는 단어 단위 소문자
+    tokens = []
+    for run in TOKEN_RE.findall(text or ""):
+        if HANGUL_RE.fullmatch(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run.lower())
+    return tokens
+
+
+# DB 종류별 색인 테이블 DDL과 한 행 색인 SQL. 다른 DB는 icontains 검색이라 테이블 없음
+CREATE_SQL = {
+    'sqlite': ['CREATE VIRTUAL TABLE posts_post_fts USING fts5(title, body)'],
+    'postgresql': [
+        'CREATE TABLE posts_post_search ('
+        'post_id bigint PRIMARY KEY REFERENCES posts_post (id) ON DELETE CASCADE, '
+        'document tsvector NOT NULL)',
+        'CREATE INDEX posts_post_search_document_idx ON posts_post_search USING GIN (document)',
+    ],
+}
+INSERT_SQL = {
+    'sqlite': 'INSERT INTO posts_post_fts (rowid, title, body) VALUES (%s, %s, %s)',
+    'postgresql': (
+        'INSERT INTO posts_post_search (post_id, document) VALUES (%s, '
+        "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B'))"
+    ),
+}
+DROP_SQL = {
+    'sqlite': 'DROP TABLE IF EXISTS posts_post_fts',
+    'postgresql': 'DROP TABLE IF EXISTS posts_post_search',
+}
+BATCH_SIZE = 1000
+
+
+def create_search_index(apps, schema_editor):
+    # 색인 테이블 생성 후 기존 게시글 색인 (--database로 지정한 DB의 연결 사용)
+    connection = schema_editor.connection
+    if connection.vendor not in CREATE_SQL:
+        return
+    for sql in CREATE_SQL[connection.vendor]:
+        schema_editor.execute(sql)
+    Post = apps.get_model('posts', 'Post')
+    posts = Post.objects.using(connection.alias).order_by('id').values_list('id', 'title', 'body')
+    rows = []
+    with connection.cursor() as cursor:
+        for pk, title, body in posts.iterator(chunk_size=BATCH_SIZE):
+            rows.append((pk, ' '.join(tokenize(title)), ' '.join(tokenize(body))))
+            if len(rows) == BATCH_SIZE:
+                cursor.executemany(INSERT_SQL[connection.vendor], rows)
+                rows = []
+        if rows:
+            cursor.executemany(INSERT_SQL[connection.vendor], rows)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in DROP_SQL:
+        schema_editor.execute(DROP_SQL[schema_editor.connection.vendor])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_post_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSearchIndex',
+            fields=[
+                ('post', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='posts.post')),
+                ('title', models.TextField()),
+                ('body', models.TextField()),
+                ('document', models.TextField(db_column='posts_post_fts')),
+            ],
+            options={
+                'db_table': 'posts_post_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
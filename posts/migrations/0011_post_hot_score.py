@@ -0,0 +1,49 @@
+# Generated by Django 4.2.17 on 2026-10-18 19:52
+
+import math
+from datetime import datetime, timezone
+
+from django.db import migrations, models
+
+# 마이그레이션 시점의 점수 식 그대로 (posts.models.hot_score가 바뀌어도 이 마이그레이션의 동작은 같음)
+HOT_EPOCH = datetime(2024, 11, 16, tzinfo=timezone.utc)
+HOT_TIME_SCALE = 45000
+HOT_COMMENT_WEIGHT = 2
+
+
+def hot_score(like_count, comment_count, published_date):
+    points = like_count + HOT_COMMENT_WEIGHT * comment_count
+    return math.log10(max(points, 1)) + (published_date - HOT_EPOCH).total_seconds() / HOT_TIME_SCALE
+
+
+def populate_hot_scores(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    posts = []
+    queryset = Post.objects.using(schema_editor.connection.alias)
+    for post in queryset.only('id', 'like_count', 'comment_count', 'published_date').iterator():
+        post.hot_score = hot_score(post.like_count, post.comment_count, post.published_date)
+        posts.append(post)
+        if len(posts) >= 1000:
+            queryset.bulk_update(posts, ['hot_score'])
+            posts = []
+    queryset.bulk_update(posts, ['hot_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['hot_score', 'id'], name='post_hot_score_idx'),
+        ),
+        migrations.RunPython(populate_hot_scores, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,11 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest, Log
+from django.db.models.signals import post_save, post_delete, pre_save, pre_delete, m2m_changed
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.utils import timezone
 from users.models import Profile
@@ -10,11 +17,221 @@ class Post(models.Model):
     category = models.CharField(max_length=128)
     body = models.TextField()
     image = models.ImageField(upload_to="post/", default="default.png")
+    # 리사이즈된 이미지 경로 (images.processing에서 채움)
+    image_renditions = models.JSONField(default=dict, blank=True)
     likes = models.ManyToManyField(User, related_name="like_posts", blank=True)
     published_date = models.DateTimeField(default=timezone.now)
+    # 비정규화 카운터 (likes/comments 전체를 읽지 않고 인기도 표시)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    # 인기 점수 (hot_score 참고). 좋아요/댓글 카운터와 같은 UPDATE에서 함께 갱신
+    hot_score = models.FloatField(default=0)
+    # 응답 내용(좋아요, 댓글 포함)이 바뀔 때마다 갱신 (ETag/Last-Modified 계산용)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # 필터 + 최신순(-id) 정렬
+            models.Index(fields=["author", "id"], name="post_author_id_idx"),
+            models.Index(fields=["category", "id"], name="post_category_id_idx"),
+            models.Index(fields=["published_date"], name="post_published_date_idx"),
+            # ETag 계산용 max(updated_at)
+            models.Index(fields=["updated_at"], name="post_updated_at_idx"),
+            # /posts/trending/ 상위 N개
+            models.Index(fields=["hot_score", "id"], name="post_hot_score_idx"),
+        ]
+
+    # F() UPDATE로만 갱신하는 필드. 이미 있는 행을 save()할 때(수정 API, admin 등) 메모리의 옛 값으로
+    # 동시에 반영된 증감을 덮어쓰지 않도록 제외
+    counter_fields = ("like_count", "comment_count", "hot_score")
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get("force_insert") and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
 
 class Comment(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
-    text = models.TextField()
\ No newline at end of file
+    text = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # 게시글별 댓글을 id 순으로 키셋 페이지네이션
+            models.Index(fields=["post", "id"], name="comment_post_id_idx"),
+            models.Index(fields=["updated_at"], name="comment_updated_at_idx"),
+        ]
+
+
+class TimelineEntry(models.Model):
+    # 홈 타임라인: 팔로우한 작성자의 새 글을 팔로워별로 미리 넣어 둠 (posts.timeline)
+    # (user, post) 유니크 인덱스로 유저별 최신 글 범위 조회
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="timeline_entries", db_index=False)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="timeline_entries")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "post"], name="timeline_user_post_unique"),
+        ]
+
+
+class PostSearchIndex(models.Model):
+    # SQLite FTS5 가상 테이블 (posts.search.SqliteSearchBackend). 테이블은 마이그레이션에서 직접 생성
+    # rowid = 게시글 id, title/body는 한글 bigram으로 토큰화한 텍스트
+    post = models.OneToOneField(
+        Post, on_delete=models.DO_NOTHING, primary_key=True, db_column="rowid",
+        db_constraint=False, related_name="search_index",
+    )
+    title = models.TextField()
+    body = models.TextField()
+    # FTS5 테이블 이름과 같은 숨은 컬럼 (MATCH 대상)
+    document = models.TextField(db_column="posts_post_fts")
+
+    class Meta:
+        managed = False
+        db_table = "posts_post_fts"
+
+
+def like_count_subquery():
+    likes = Post.likes.through.objects.filter(post_id=OuterRef("pk"))
+    return Coalesce(Subquery(likes.values("post_id").annotate(c=Count("*")).values("c")), 0)
+
+
+def comment_count_subquery():
+    comments = Comment.objects.filter(post_id=OuterRef("pk"))
+    return Coalesce(Subquery(comments.values("post_id").annotate(c=Count("*")).values("c")), 0)
+
+
+# 인기 점수 = log10(좋아요 + 2 * 댓글) + (게시 시각 - HOT_EPOCH) / HOT_TIME_SCALE
+# 시간 항이 게시 시각에 고정되어 새 글일수록 기본 점수가 높으므로, 전체 글의 점수를 주기적으로 깎지 않아도
+# 시간이 지날수록 새 글에 밀려나는 감쇠 효과가 남 (12.5시간 늦은 글은 10배의 반응이 있어야 같은 점수)
+HOT_EPOCH = datetime(2024, 11, 16, tzinfo=dt_timezone.utc)
+HOT_TIME_SCALE = 45000
+HOT_COMMENT_WEIGHT = 2
+
+
+def hot_score(like_count, comment_count, published_date):
+    points = like_count + HOT_COMMENT_WEIGHT * comment_count
+    return math.log10(max(points, 1)) + (published_date - HOT_EPOCH).total_seconds() / HOT_TIME_SCALE
+
+
+def _reaction_score(like_count, comment_count):
+    return Log(10, Greatest(like_count + HOT_COMMENT_WEIGHT * comment_count, 1))
+
+
+def updated_hot_score(like_count=None, comment_count=None):
+    # 카운터를 바꾸는 UPDATE에 함께 넣을 점수 식. UPDATE의 우변은 변경 전 값을 참조하므로
+    # 기존 반응 항을 빼고 새 반응 항을 더함 (게시 시각을 읽어 오는 추가 쿼리 없음)
+    new_likes = F("like_count") if like_count is None else like_count
+    new_comments = F("comment_count") if comment_count is None else comment_count
+    return (
+        F("hot_score")
+        - _reaction_score(F("like_count"), F("comment_count"))
+        + _reaction_score(new_likes, new_comments)
+    )
+
+
+def refresh_like_count(post_ids):
+    # 실제 through 테이블 기준으로 단일 UPDATE 재계산 (동시 요청에도 값이 어긋나지 않음)
+    if post_ids:
+        Post.objects.filter(pk__in=post_ids).update(
+            like_count=like_count_subquery(),
+            hot_score=updated_hot_score(like_count=like_count_subquery()),
+            updated_at=timezone.now(),
+        )
+
+
+@receiver(pre_save, sender=Post)
+def set_hot_score(sender, instance, **kwargs):
+    # 처음 저장할 때만 계산. 이후에는 카운터와 같은 UPDATE에서 F()로 갱신 (메모리의 옛 카운터로 덮어쓰지 않음)
+    if instance._state.adding:
+        instance.hot_score = hot_score(instance.like_count, instance.comment_count, instance.published_date)
+
+
+@receiver(m2m_changed, sender=Post.likes.through)
+def update_like_count(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # user.like_posts.clear(): 지워지기 전에 대상 게시글 기억
+        instance._cleared_like_post_ids = list(
+            sender.objects.filter(user_id=instance.pk).values_list("post_id", flat=True)
+        )
+    elif action in ("post_add", "post_remove", "post_clear"):
+        if not reverse:
+            post_ids = [instance.pk]
+        elif action == "post_clear":
+            post_ids = getattr(instance, "_cleared_like_post_ids", [])
+        else:
+            post_ids = pk_set
+        refresh_like_count(post_ids)
+
+
+@receiver(pre_delete, sender=User)
+def remember_liked_posts(sender, instance, **kwargs):
+    # 유저 삭제 시 through 행은 시그널 없이 cascade 삭제되므로 미리 기억
+    # 삭제 트랜잭션의 첫 문장이므로 select_for_update로 쓰기 잠금부터 잡음
+    instance._liked_post_ids = list(
+        Post.likes.through.objects.select_for_update().filter(user_id=instance.pk).values_list("post_id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=User)
+def update_liked_posts(sender, instance, **kwargs):
+    refresh_like_count(getattr(instance, "_liked_post_ids", []))
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    instance._previous_post_id = None
+    if instance.pk is not None:
+        instance._previous_post_id = (
+            Comment.objects.filter(pk=instance.pk).values_list("post_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Comment)
+def increase_comment_count(sender, instance, created, **kwargs):
+    # 댓글이 바뀌면 게시글 응답도 바뀌므로 updated_at도 함께 갱신
+    now = timezone.now()
+    previous_post_id = getattr(instance, "_previous_post_id", None)
+    increase = {
+        "comment_count": F("comment_count") + 1,
+        "hot_score": updated_hot_score(comment_count=F("comment_count") + 1),
+        "updated_at": now,
+    }
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(**increase)
+    elif previous_post_id is not None and previous_post_id != instance.post_id:
+        # 다른 게시글로 옮겨진 댓글
+        Post.objects.filter(pk=previous_post_id).update(
+            comment_count=F("comment_count") - 1,
+            hot_score=updated_hot_score(comment_count=F("comment_count") - 1),
+            updated_at=now,
+        )
+        Post.objects.filter(pk=instance.post_id).update(**increase)
+    else:
+        Post.objects.filter(pk=instance.post_id).update(updated_at=now)
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F("comment_count") - 1,
+        hot_score=updated_hot_score(comment_count=F("comment_count") - 1),
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=Profile)
+def touch_profile_contents(sender, instance, created, **kwargs):
+    # 프로필은 게시글/댓글 응답에 포함되므로 관련 게시글과 댓글의 updated_at 갱신
+    if created:
+        return
+    now = timezone.now()
+    Post.objects.filter(profile=instance).update(updated_at=now)
+    Post.objects.filter(comments__profile=instance).update(updated_at=now)
+    Comment.objects.filter(profile=instance).update(updated_at=now)
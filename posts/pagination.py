@@ -0,0 +1,121 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination, _reverse_ordering
+from rest_framework.response import Response
+
+from .cache import acached_result, cached_result, count_generation_key
+from .models import Post
+
+
+class CachedCountCursorPagination(CursorPagination):
+    # 키셋(커서) 방식: OFFSET 없이 인덱스 범위 조회이므로 페이지 깊이와 무관하게 비용 일정
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    count_timeout = 60
+    # 쿼리 파라미터(필터)가 있을 때 COUNT가 함께 의존하는 모델 {파라미터: 모델}
+    count_filter_dependencies = {}
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # RowSerializationMixin은 values_list로 바꾸기 전의 쿼리셋을 count_queryset으로 둠 (중첩 필드 join 없이 셈)
+        count_queryset = getattr(view, "count_queryset", None)
+        self.request = request
+        self.count = self.get_count(queryset if count_queryset is None else count_queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count_generation_keys(self, queryset):
+        models = [queryset.model]
+        models += [model for param, model in self.count_filter_dependencies.items() if param in self.request.query_params]
+        return [count_generation_key(model) for model in models]
+
+    def get_count(self, queryset):
+        # COUNT(*)는 매 요청마다 실행하지 않고 행 수 버전 + 조건(필터) 기준으로 캐시
+        return cached_result(
+            "count",
+            self.get_count_generation_keys(queryset),
+            str(queryset.order_by().values("pk").query),
+            queryset.count,
+            self.count_timeout,
+        )
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # paginate_queryset의 async 버전 (posts.async_views). 커서 형식과 결과는 동일하고 조회만 async ORM으로
+        self.request = request
+        self.count = await self.aget_count(queryset)
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor or (0, False, None)
+
+        queryset = queryset.order_by(*(_reverse_ordering(self.ordering) if reverse else self.ordering))
+        if current_position is not None:
+            order = self.ordering[0]
+            lookup = "lt" if self.cursor.reverse != order.startswith("-") else "gt"
+            queryset = queryset.filter(**{f"{order.lstrip('-')}__{lookup}": current_position})
+
+        # 다음 페이지 여부를 알기 위해 한 개 더 조회
+        results = [obj async for obj in queryset[offset:offset + self.page_size + 1]]
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > len(self.page)
+        following_position = None
+        if has_following_position:
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = has_following_position
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+        return self.page
+
+    async def aget_count(self, queryset):
+        return await acached_result(
+            "count",
+            self.get_count_generation_keys(queryset),
+            str(queryset.order_by().values("pk").query),
+            queryset.acount,
+            self.count_timeout,
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            "count": self.count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"] = {
+            "count": {"type": "integer", "example": 123},
+            **response_schema["properties"],
+        }
+        return response_schema
+
+
+class PostPagination(CachedCountCursorPagination):
+    ordering = "-id"
+    count_filter_dependencies = {"likes": Post.likes.through}
+
+
+class CommentPagination(CachedCountCursorPagination):
+    ordering = "id"
+
+
+class SearchPagination(PageNumberPagination):
+    # 검색 결과는 관련도 순이라 커서(고정 정렬 키)를 쓸 수 없으므로 페이지 번호 방식
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class TimelinePagination(CursorPagination):
+    # 타임라인은 팔로우 변경/배포로 유저마다 따로 바뀌므로 count를 제공하지 않음
+    ordering = "-id"
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -11,4 +11,5 @@ class CustomReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return obj.author == request.user
\ No newline at end of file
+        # author_id로 비교 (일괄 처리 시 객체마다 작성자를 조회하지 않도록)
+        return obj.author_id == request.user.id
\ No newline at end of file
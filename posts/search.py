@@ -0,0 +1,221 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Lookup, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import Post, PostSearchIndex
+
+HANGUL = "\u1100-\u11ff\u3130-\u318f\uac00-\ud7a3"  # 자모, 호환 자모, 완성형 음절
+TOKEN_RE = re.compile(f"[{HANGUL}]+|[^\\W{HANGUL}]+")
+HANGUL_RE = re.compile(f"[{HANGUL}]+")
+
+
+def tokenize(text):
+    # 한글은 조사/어미가 붙어 띄어쓰기 단위로는 검색이 안 되므로 연속 구간을 2글자(bigram)씩 겹쳐 자름
+    # ("파이썬으로" -> 파이 이썬 썬으 으로), 그 외는 단어 단위 소문자
+    tokens = []
+    for run in TOKEN_RE.findall(text or ""):
+        if HANGUL_RE.fullmatch(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run.lower())
+    return tokens
+
+
+def parse_query(query):
+    # 검색어 -> 조건 목록 (모두 AND). 각 조건은 ("phrase", [토큰...]) 또는 ("prefix", 토큰)
+    # 한 글자 한글은 그 글자로 시작하는 bigram과 맞도록 prefix로 검색
+    terms = []
+    for run in TOKEN_RE.findall(query or ""):
+        tokens = tokenize(run)
+        if HANGUL_RE.fullmatch(run) and len(run) == 1:
+            terms.append(("prefix", run))
+        else:
+            terms.append(("phrase", tokens))
+    return terms
+
+
+class SearchBackend:
+    # 인덱스 없이 icontains로 찾는 기본 구현 (정렬은 최신순)
+    def index(self, post):
+        self.index_rows([(post.pk, post.title, post.body)])
+
+    def index_rows(self, rows):
+        pass
+
+    def remove(self, post_id):
+        pass
+
+    def clear(self):
+        pass
+
+    def rebuild(self, batch_size=1000):
+        # id 범위 단위로 나눠 다시 색인 (전체 게시글을 메모리에 올리지 않음)
+        self.clear()
+        last_id = 0
+        indexed = 0
+        while True:
+            rows = list(
+                Post.objects.filter(pk__gt=last_id).order_by("pk").values_list("id", "title", "body")[:batch_size]
+            )
+            if not rows:
+                return indexed
+            self.index_rows(rows)
+            last_id = rows[-1][0]
+            indexed += len(rows)
+
+    def search(self, queryset, query):
+        condition = Q()
+        for word in query.split():
+            condition &= Q(title__icontains=word) | Q(body__icontains=word)
+        return queryset.filter(condition).order_by("-id")
+
+
+class Match(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
+
+
+PostSearchIndex._meta.get_field("document").register_lookup(Match)
+
+
+class SqliteSearchBackend(SearchBackend):
+    # FTS5 역색인 + BM25 순위 (제목 일치에 가중치)
+    table = PostSearchIndex._meta.db_table
+    weights = (2.0, 1.0)
+
+    def index_rows(self, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {self.table} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, body) VALUES (%s, %s, %s)",
+                [(pk, " ".join(tokenize(title)), " ".join(tokenize(body))) for pk, title, body in rows],
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [post_id])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def match_expression(self, query):
+        parts = []
+        for kind, value in parse_query(query):
+            if kind == "prefix":
+                parts.append(f'"{value}"*')
+            elif value:
+                parts.append('"{}"'.format(" ".join(value)))
+        return " ".join(parts)
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+        # FTS 테이블을 join해 MATCH 한 번으로 후보와 순위를 함께 계산 (bm25는 낮을수록 관련도 높음)
+        rank = RawSQL("bm25({}, {})".format(self.table, ", ".join(str(w) for w in self.weights)), [])
+        return (
+            queryset.filter(search_index__document__match=match)
+            .annotate(rank=rank)
+            .order_by("rank", "-id")
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    # tsvector 컬럼 + GIN 인덱스. 토큰화는 SQLite와 같은 bigram 방식을 쓰고 'simple' 설정으로 저장
+    table = "posts_post_search"
+
+    def index_rows(self, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (post_id, document) VALUES (%s, "
+                "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')) "
+                "ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document",
+                [(pk, " ".join(tokenize(title)), " ".join(tokenize(body))) for pk, title, body in rows],
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE post_id = %s", [post_id])
+
+    def clear(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def tsquery(self, query):
+        parts = []
+        for kind, value in parse_query(query):
+            if kind == "prefix":
+                parts.append(f"'{value}':*")
+            elif value:
+                parts.append("(" + " <-> ".join(f"'{token}'" for token in value) + ")")
+        return " & ".join(parts)
+
+    def search(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return queryset.none()
+        matched = RawSQL(
+            f"SELECT post_id FROM {self.table} WHERE document @@ to_tsquery('simple', %s)", [tsquery]
+        )
+        rank = RawSQL(
+            f"SELECT ts_rank(document, to_tsquery('simple', %s)) FROM {self.table} "
+            f"WHERE post_id = {Post._meta.db_table}.id",
+            [tsquery],
+        )
+        return queryset.filter(id__in=matched).annotate(rank=rank).order_by("-rank", "-id")
+
+
+BACKENDS = {
+    "sqlite": SqliteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+_backend = None
+
+
+def get_search_backend():
+    # SEARCH_BACKEND 설정(클래스 경로)이 없으면 DB 종류에 맞는 백엔드 사용
+    global _backend
+    if _backend is None:
+        path = getattr(settings, "SEARCH_BACKEND", None)
+        if path:
+            backend_class = import_string(path)
+        else:
+            backend_class = BACKENDS.get(connection.vendor, SearchBackend)
+        _backend = backend_class()
+    return _backend
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, raw=False, **kwargs):
+    # 제목/본문이 바뀐 저장에 대해서만 색인 갱신 (같은 트랜잭션 안에서 반영)
+    if raw:
+        return
+    if update_fields is not None and not {"title", "body"} & set(update_fields):
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
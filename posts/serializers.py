@@ -1,28 +1,95 @@
+from django.contrib.auth.models import User
+from django.db.models import Prefetch
 from rest_framework import serializers
+from images.serializers import RenditionsField
 from users.serializers import ProfileSerializer
 from .models import Post, Comment
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    # fields 인자로 넘긴 필드만 응답에 포함 (?fields=, ?omit= 지원)
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def select_fields(cls, query_params):
+        # ?fields=id,title 로 고르거나 ?omit=comments,likes 로 제외. 둘 다 없으면 None (전체)
+        fields = query_params.get("fields")
+        omit = query_params.get("omit")
+        if not fields and not omit:
+            return None
+        selected = list(cls.Meta.fields)
+        if fields:
+            requested = set(fields.split(","))
+            selected = [name for name in selected if name in requested]
+        if omit:
+            omitted = set(omit.split(","))
+            selected = [name for name in selected if name not in omitted]
+        return selected
+
+
+class CommentSerializer(DynamicFieldsModelSerializer):
     profile = ProfileSerializer(read_only=True)
 
     class Meta:
         model = Comment
         fields = ["id", "profile", "post", "text"]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        # 댓글마다 profile 조회가 발생하지 않도록 join
+        if fields is None or "profile" in fields:
+            queryset = queryset.select_related("profile")
+        return queryset
+
 class CommentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ["post","text"]
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(DynamicFieldsModelSerializer):
+    # 게시글에는 앞쪽 댓글 일부만 포함, 전체는 comment_count와 /posts/<id>/comments/ 로 제공
+    comment_preview_size = 3
+
     profile = ProfileSerializer(read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    # setup_eager_loading의 Prefetch(to_attr)로 채워지는 앞쪽 댓글 목록
+    comments = CommentSerializer(many=True, read_only=True, source="preview_comments")
+    image_renditions = RenditionsField()
+    # 요청 유저의 좋아요 여부 (뷰에서 Exists 서브쿼리로 annotate)
+    is_liked = serializers.BooleanField(read_only=True, default=False)
 
     class Meta:
         model = Post
-        fields = ["id","profile","title","body","image","published_date","likes","comments"]
+        fields = ["id","profile","title","body","image","image_renditions","published_date","like_count","comment_count","is_liked","likes","comments"]
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        # profile은 join, likes/comments는 게시글 묶음 단위로 한 번에 조회 (N+1 방지)
+        # 응답에서 빠지는 필드는 join/prefetch도 하지 않음
+        if fields is None:
+            fields = cls.Meta.fields
+        if "profile" in fields:
+            queryset = queryset.select_related("profile")
+        if "likes" in fields:
+            queryset = queryset.prefetch_related(Prefetch("likes", queryset=User.objects.only("id")))
+        if "comments" in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "comments",
+                    queryset=CommentSerializer.setup_eager_loading(
+                        Comment.objects.order_by("id")[:cls.comment_preview_size]
+                    ),
+                    to_attr="preview_comments",
+                )
+            )
+        if "body" not in fields:
+            queryset = queryset.defer("body")
+        return queryset
 
 
 class PostCreateSerializer(serializers.ModelSerializer):
@@ -1,11 +1,35 @@
-from django.test import TestCase
-from rest_framework import status
-from rest_framework.test import APIClient
+import asyncio
+import csv
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import serializers, status, viewsets
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
-from posts.models import Post, Comment
+from posts import events, export
+from posts.bulk import BulkModelMixin
+from posts.cache import get_cache_stats, reset_cache_stats
+from posts.models import Post, Comment, TimelineEntry, hot_score
+from posts.timeline import fan_out
+from users.models import Follow, Profile
+from posts.serializers import PostSerializer
 
 class PostTest(TestCase):
     def setUp(self):
@@ -103,6 +127,7 @@ class LikeTest(TestCase):
 
         response = self.client.post(f"/like/{self.post.id}/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"liked": True, "like_count": 1})
 
         self.post.refresh_from_db()
         self.assertIn(user2, self.post.likes.all())
@@ -121,6 +146,7 @@ class LikeTest(TestCase):
 
         response = self.client.post(f"/like/{self.post.id}/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"liked": False, "like_count": 0})
 
         self.post.refresh_from_db()
         self.assertNotIn(user2, self.post.likes.all())
@@ -130,6 +156,71 @@ class LikeTest(TestCase):
         response = self.client.post(f"/like/{self.post.id}/")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+    def test_like_invalid_post(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        response = self.client.post("/like/99999/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_like_query_count_is_bounded(self):
+        users = [
+            User.objects.create_user(username=f"liker{i}", password="testpassword!")
+            for i in range(20)
+        ]
+        self.post.likes.add(*users)
+        self.client.force_authenticate(self.user)
+        # 좋아요 수와 무관하게 일정한 쿼리 수
+        with self.assertNumQueries(8):
+            response = self.client.post(f"/like/{self.post.id}/")
+        self.assertEqual(response.data, {"liked": True, "like_count": 21})
+        with self.assertNumQueries(7):
+            response = self.client.post(f"/like/{self.post.id}/")
+        self.assertEqual(response.data, {"liked": False, "like_count": 20})
+
+
+class LikeConcurrencyTest(TransactionTestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f"test_user{i}", password="testpassword!")
+            for i in range(8)
+        ]
+        self.post = Post.objects.create(
+            author = self.users[0],
+            profile = self.users[0].profile,
+            title = "test_title",
+            body = "this is body",
+            category = "backend",
+        )
+
+    def toggle(self, user, times, errors):
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            for _ in range(times):
+                response = client.post(f"/like/{self.post.id}/")
+                if response.status_code != status.HTTP_200_OK:
+                    errors.append(response.status_code)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    def test_concurrent_toggles(self):
+        errors = []
+        threads = []
+        # 유저마다 두 스레드가 동시에 클릭
+        for i, user in enumerate(self.users):
+            for _ in range(2):
+                threads.append(threading.Thread(target=self.toggle, args=(user, i + 1, errors)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.post.refresh_from_db()
+        likes = self.post.likes.count()
+        self.assertEqual(self.post.like_count, likes)
+
 
 class CommentsTest(TestCase):
     def setUp(self):
@@ -186,3 +277,1530 @@ class CommentsTest(TestCase):
                                    fromat = "json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["text"],"updated_comment")
+
+
+class QueryCountTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(
+                username = f"test_user{i}",
+                email = f"test{i}@test.com",
+                password = "testpassword!"
+            )
+            for i in range(5)
+        ]
+
+    def create_posts(self, count):
+        for i in range(count):
+            author = self.users[i % len(self.users)]
+            post = Post.objects.create(
+                author = author,
+                profile = author.profile,
+                title = f"test_title{i}",
+                body = "this is body",
+                category = "backend",
+            )
+            post.likes.add(*self.users)
+            for user in self.users:
+                Comment.objects.create(
+                    author = user,
+                    profile = user.profile,
+                    post = post,
+                    text = "test_comment",
+                )
+        return post
+
+    def test_post_list_query_count(self):
+        self.create_posts(1)
+        # ETag 검증값 + count + posts(profile join) + likes + comments(profile join)
+        with self.assertNumQueries(5):
+            self.client.get("/posts/")
+
+        self.create_posts(10)
+        with self.assertNumQueries(5):
+            response = self.client.get("/posts/")
+        self.assertEqual(len(response.data["results"][0]["comments"]), PostSerializer.comment_preview_size)
+        self.assertEqual(response.data["results"][0]["comment_count"], len(self.users))
+
+    def test_post_detail_query_count(self):
+        post = self.create_posts(1)
+        # updated_at + post(profile join) + likes + comments(profile join)
+        with self.assertNumQueries(4):
+            self.client.get(f"/posts/{post.id}/")
+
+        post = self.create_posts(10)
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/posts/{post.id}/")
+        self.assertEqual(len(response.data["likes"]), len(self.users))
+
+    def test_comment_list_query_count(self):
+        self.create_posts(1)
+        with self.assertNumQueries(3):
+            self.client.get("/comments/")
+
+        self.create_posts(10)
+        with self.assertNumQueries(3):
+            self.client.get("/comments/")
+
+
+class PaginationTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test_user1",
+            email = "test@test.com",
+            password = "testpassword!"
+        )
+        self.posts = [
+            Post.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                title = f"test_title{i}",
+                body = "this is body",
+                category = "backend",
+            )
+            for i in range(10)
+        ]
+        for post in self.posts:
+            Comment.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                post = post,
+                text = "test_comment",
+            )
+
+    def collect_ids(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item["id"] for item in response.data["results"]]
+            url = response.data["next"]
+        return ids
+
+    def test_post_cursor_pagination(self):
+        ids = self.collect_ids("/posts/")
+        self.assertEqual(ids, sorted([post.id for post in self.posts], reverse=True))
+
+    def test_comment_cursor_pagination(self):
+        ids = self.collect_ids("/comments/")
+        self.assertEqual(ids, sorted(Comment.objects.values_list("id", flat=True)))
+
+    def test_page_size(self):
+        response = self.client.get("/posts/?page_size=5")
+        self.assertEqual(len(response.data["results"]), 5)
+        response = self.client.get("/posts/?page_size=1000")
+        self.assertEqual(len(response.data["results"]), len(self.posts))
+
+    def test_count_is_cached_until_write(self):
+        response = self.client.get("/posts/")
+        self.assertEqual(response.data["count"], len(self.posts))
+        # 캐시된 count 사용: posts + likes + comments (응답 캐시는 인증 요청에서 제외)
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(3):
+            self.client.get("/posts/")
+
+        # 좋아요/댓글 카운터 갱신은 게시글 수를 바꾸지 않으므로 COUNT를 다시 하지 않음
+        # (목록 응답의 Last-Modified 검증값은 like_count가 바뀌었으므로 다시 계산)
+        self.client.post(f"/like/{self.posts[0].id}/")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/posts/")
+        self.assertFalse([q for q in queries.captured_queries if '"__count"' in q["sql"]])
+        response = self.client.get(f"/posts/?likes={self.user.id}")
+        self.assertEqual(response.data["count"], 1)
+        self.client.post(f"/like/{self.posts[0].id}/")
+        response = self.client.get(f"/posts/?likes={self.user.id}")
+        self.assertEqual(response.data["count"], 0)
+
+        Post.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            title = "new_title",
+            body = "this is body",
+            category = "backend",
+        )
+        response = self.client.get("/posts/")
+        self.assertEqual(response.data["count"], len(self.posts) + 1)
+
+    def test_deep_page_query_count(self):
+        response = self.client.get("/posts/?page_size=2")
+        url = response.data["next"]
+        while url:
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            url = response.data["next"]
+
+
+class CounterTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test_user1",
+            email = "test@test.com",
+            password = "testpassword!"
+        )
+        self.user2 = User.objects.create_user(
+            username = "test_user2",
+            email = "test2@test.com",
+            password = "testpassword!"
+        )
+        self.post = Post.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            title = "test_title",
+            body = "this is body",
+            category = "backend",
+        )
+
+    def assertCounts(self, like_count, comment_count):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, like_count)
+        self.assertEqual(self.post.comment_count, comment_count)
+
+    def test_like_count(self):
+        self.post.likes.add(self.user, self.user2)
+        self.post.likes.add(self.user)
+        self.assertCounts(2, 0)
+        self.post.likes.remove(self.user, self.user)
+        self.assertCounts(1, 0)
+        self.user2.like_posts.clear()
+        self.assertCounts(0, 0)
+        self.user.like_posts.add(self.post)
+        self.assertCounts(1, 0)
+        self.post.likes.clear()
+        self.assertCounts(0, 0)
+
+    def test_like_count_after_user_delete(self):
+        self.post.likes.add(self.user, self.user2)
+        self.user2.delete()
+        self.assertCounts(1, 0)
+
+    def test_comment_count(self):
+        comment = Comment.objects.create(
+            author = self.user2,
+            profile = self.user2.profile,
+            post = self.post,
+            text = "test_comment",
+        )
+        self.assertCounts(0, 1)
+
+        other_post = Post.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            title = "other_title",
+            body = "this is body",
+            category = "backend",
+        )
+        comment.post = other_post
+        comment.save()
+        self.assertCounts(0, 0)
+        other_post.refresh_from_db()
+        self.assertEqual(other_post.comment_count, 1)
+
+        comment.post = self.post
+        comment.save()
+        self.user2.delete()
+        self.assertCounts(0, 0)
+
+    def test_save_keeps_counts(self):
+        # 카운터를 읽은 뒤 다른 요청이 좋아요/댓글을 추가해도 수정 저장이 옛 값으로 덮어쓰지 않음
+        stale = Post.objects.get(pk=self.post.pk)
+        self.post.likes.add(self.user, self.user2)
+        Comment.objects.create(author = self.user, profile = self.user.profile, post = self.post, text = "c")
+        stale.title = "edited"
+        stale.save()
+        self.assertCounts(2, 1)
+        self.assertEqual(self.post.title, "edited")
+
+        self.client.force_authenticate(user = self.user)
+        response = self.client.patch(f"/posts/{self.post.id}/", {"body": "patched"})
+        self.assertEqual(response.status_code, 200)
+        self.assertCounts(2, 1)
+
+    def test_counts_in_response(self):
+        self.post.likes.add(self.user2)
+        response = self.client.get(f"/posts/{self.post.id}/")
+        self.assertEqual(response.data["like_count"], 1)
+        self.assertEqual(response.data["comment_count"], 0)
+
+    def test_reconcile_command(self):
+        self.post.likes.add(self.user, self.user2)
+        Comment.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            post = self.post,
+            text = "test_comment",
+        )
+        Post.objects.filter(pk=self.post.pk).update(like_count=10, comment_count=10)
+        cache.clear()
+        # 틀린 카운터가 캐시된 상태
+        self.assertEqual(self.client.get(f"/posts/{self.post.id}/").data["like_count"], 10)
+        self.assertEqual(self.client.get("/posts/").data["results"][0]["like_count"], 10)
+        out = StringIO()
+        call_command("reconcile_post_counts", stdout=out)
+        self.assertIn("1", out.getvalue())
+        self.assertCounts(2, 1)
+        self.assertEqual(self.client.get(f"/posts/{self.post.id}/").data["like_count"], 2)
+        self.assertEqual(self.client.get("/posts/").data["results"][0]["like_count"], 2)
+
+
+class IsLikedTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test_user1",
+            email = "test@test.com",
+            password = "testpassword!"
+        )
+        self.user2 = User.objects.create_user(
+            username = "test_user2",
+            email = "test2@test.com",
+            password = "testpassword!"
+        )
+        self.posts = [
+            Post.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                title = f"test_title{i}",
+                body = "this is body",
+                category = "backend",
+            )
+            for i in range(3)
+        ]
+        self.posts[0].likes.add(self.user)
+        self.posts[1].likes.add(self.user2)
+
+    def test_is_liked_in_list(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get("/posts/")
+        is_liked = {item["id"]: item["is_liked"] for item in response.data["results"]}
+        self.assertEqual(is_liked, {
+            self.posts[0].id: True,
+            self.posts[1].id: False,
+            self.posts[2].id: False,
+        })
+
+    def test_is_liked_in_detail(self):
+        self.client.force_authenticate(self.user2)
+        response = self.client.get(f"/posts/{self.posts[1].id}/")
+        self.assertTrue(response.data["is_liked"])
+
+    def test_is_liked_without_authorization(self):
+        response = self.client.get("/posts/")
+        self.assertFalse(any(item["is_liked"] for item in response.data["results"]))
+
+    def test_is_liked_query_count(self):
+        self.client.force_authenticate(self.user)
+        # ETag 검증값 + count + posts(is_liked 포함) + likes + comments
+        with self.assertNumQueries(5):
+            self.client.get("/posts/")
+
+
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test_user1",
+            email = "test@test.com",
+            password = "testpassword!"
+        )
+        self.post = Post.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            title = "test_title",
+            body = "this is body",
+            category = "backend",
+        )
+        reset_cache_stats()
+
+    def test_anonymous_detail_is_cached(self):
+        response = self.client.get(f"/posts/{self.post.id}/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = self.client.get(f"/posts/{self.post.id}/")
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.data["title"], self.post.title)
+        self.assertEqual(get_cache_stats()["post-detail"], {"hit": 1, "miss": 1})
+
+    def test_anonymous_list_is_cached(self):
+        self.client.get("/posts/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/posts/")
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.client.get("/comments/")
+        with self.assertNumQueries(0):
+            self.client.get("/comments/")
+
+    def test_detail_lookup_is_normalized(self):
+        # /posts/01/도 /posts/1/과 같은 버전 번호를 써서 수정 시 무효화됨
+        url = f"/posts/0{self.post.id}/"
+        self.assertEqual(self.client.get(url)["X-Cache"], "MISS")
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+        self.post.title = "updated_title"
+        self.post.save()
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["title"], "updated_title")
+
+    def test_authenticated_request_is_not_cached(self):
+        self.client.force_authenticate(self.user)
+        self.client.get(f"/posts/{self.post.id}/")
+        response = self.client.get(f"/posts/{self.post.id}/")
+        self.assertFalse(response.has_header("X-Cache"))
+
+    def test_invalidated_by_comment(self):
+        self.client.get(f"/posts/{self.post.id}/")
+        self.client.get("/posts/")
+        comment = Comment.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            post = self.post,
+            text = "test_comment",
+        )
+        response = self.client.get(f"/posts/{self.post.id}/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["comments"]), 1)
+        response = self.client.get("/posts/")
+        self.assertEqual(response.data["results"][0]["comment_count"], 1)
+
+        self.client.get(f"/comments/{comment.id}/")
+        comment.text = "updated_comment"
+        comment.save()
+        response = self.client.get(f"/comments/{comment.id}/")
+        self.assertEqual(response.data["text"], "updated_comment")
+
+    def test_invalidated_by_like(self):
+        self.client.get(f"/posts/{self.post.id}/")
+        self.client.force_authenticate(self.user)
+        self.client.post(f"/like/{self.post.id}/")
+        self.client.force_authenticate(None)
+        response = self.client.get(f"/posts/{self.post.id}/")
+        self.assertEqual(response.data["likes"], [self.user.id])
+
+        self.post.likes.clear()
+        response = self.client.get(f"/posts/{self.post.id}/")
+        self.assertEqual(response.data["likes"], [])
+
+    def test_invalidated_by_profile(self):
+        self.client.get("/posts/")
+        profile = self.user.profile
+        profile.nickname = "new_nickname"
+        profile.save()
+        response = self.client.get("/posts/")
+        self.assertEqual(response.data["results"][0]["profile"]["nickname"], "new_nickname")
+
+    def test_other_post_stays_cached(self):
+        other_post = Post.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            title = "other_title",
+            body = "this is body",
+            category = "backend",
+        )
+        self.client.get(f"/posts/{self.post.id}/")
+        other_post.likes.add(self.user)
+        response = self.client.get(f"/posts/{self.post.id}/")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test_user1",
+            email = "test@test.com",
+            password = "testpassword!"
+        )
+        self.post = Post.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            title = "test_title",
+            body = "this is body",
+            category = "backend",
+        )
+
+    def test_detail_etag(self):
+        response = self.client.get(f"/posts/{self.post.id}/")
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(f"/posts/{self.post.id}/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_detail_etag_changes_with_comment(self):
+        etag = self.client.get(f"/posts/{self.post.id}/")["ETag"]
+        Comment.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            post = self.post,
+            text = "test_comment",
+        )
+        response = self.client.get(f"/posts/{self.post.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_detail_etag_changes_with_like(self):
+        etag = self.client.get(f"/posts/{self.post.id}/")["ETag"]
+        self.post.likes.add(self.user)
+        response = self.client.get(f"/posts/{self.post.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_lookup(self):
+        for url in ["/posts/abc/", "/comments/abc/", "/posts/99999/"]:
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get("/posts/abc/").status_code, status.HTTP_404_NOT_FOUND)
+        # 숫자 앞의 0은 같은 게시글
+        response = self.client.get(f"/posts/0{self.post.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+
+    def test_if_modified_since(self):
+        response = self.client.get(f"/posts/{self.post.id}/")
+        response = self.client.get(
+            f"/posts/{self.post.id}/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_etag(self):
+        for url in ["/posts/", "/comments/"]:
+            etag = self.client.get(url)["ETag"]
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        etag = self.client.get("/posts/")["ETag"]
+        Post.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            title = "new_title",
+            body = "this is body",
+            category = "backend",
+        )
+        response = self.client.get("/posts/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_etag_differs_per_user(self):
+        etag = self.client.get(f"/posts/{self.post.id}/")["ETag"]
+        self.client.force_authenticate(self.user)
+        response = self.client.get(f"/posts/{self.post.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_post(self):
+        response = self.client.get("/posts/99999/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", response)
+
+
+class SparseFieldsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test_user1",
+            email = "test@test.com",
+            password = "testpassword!"
+        )
+        self.post = Post.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            title = "test_title",
+            body = "this is body",
+            category = "backend",
+        )
+        self.post.likes.add(self.user)
+        Comment.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            post = self.post,
+            text = "test_comment",
+        )
+
+    def test_fields(self):
+        response = self.client.get("/posts/?fields=id,title")
+        self.assertEqual(list(response.data["results"][0]), ["id", "title"])
+        response = self.client.get(f"/posts/{self.post.id}/?fields=id,title,unknown")
+        self.assertEqual(list(response.data), ["id", "title"])
+
+    def test_omit(self):
+        response = self.client.get("/posts/?omit=comments,likes")
+        item = response.data["results"][0]
+        self.assertNotIn("comments", item)
+        self.assertNotIn("likes", item)
+        self.assertEqual(item["title"], self.post.title)
+
+    def test_lightweight_list_query_count(self):
+        # ETag 검증값 + count + posts (profile/likes/comments 조회 없음)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get("/posts/?fields=id,title")
+        self.assertEqual(len(context.captured_queries), 3)
+        post_query = context.captured_queries[-1]["sql"]
+        self.assertNotIn("users_profile", post_query)
+        self.assertNotIn('"body"', post_query)
+
+        # 검증값/count는 캐시됨: posts + likes
+        with self.assertNumQueries(2):
+            self.client.get("/posts/?omit=comments")
+
+    def test_comment_fields(self):
+        response = self.client.get("/comments/?omit=profile")
+        self.assertNotIn("profile", response.data["results"][0])
+        response = self.client.get("/comments/?fields=id,text")
+        self.assertEqual(list(response.data["results"][0]), ["id", "text"])
+
+
+class PostCommentsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test_user1",
+            email = "test@test.com",
+            password = "testpassword!"
+        )
+        self.post, self.other_post = [
+            Post.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                title = f"test_title{i}",
+                body = "this is body",
+                category = "backend",
+            )
+            for i in range(2)
+        ]
+        self.comments = [
+            Comment.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                post = post,
+                text = f"test_comment{i}",
+            )
+            for i in range(7)
+            for post in [self.post, self.other_post]
+        ]
+
+    def test_post_embeds_preview(self):
+        response = self.client.get(f"/posts/{self.post.id}/")
+        ids = [comment["id"] for comment in response.data["comments"]]
+        expected = [comment.id for comment in self.comments if comment.post_id == self.post.id]
+        self.assertEqual(ids, expected[:PostSerializer.comment_preview_size])
+        self.assertEqual(response.data["comment_count"], len(expected))
+
+    def test_post_comments_pagination(self):
+        ids = []
+        url = f"/posts/{self.post.id}/comments/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["count"], 7)
+            ids += [comment["id"] for comment in response.data["results"]]
+            url = response.data["next"]
+        expected = [comment.id for comment in self.comments if comment.post_id == self.post.id]
+        self.assertEqual(ids, expected)
+
+    def test_post_comments_invalid_post(self):
+        response = self.client.get("/posts/99999/comments/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get("/posts/abc/comments/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comment_post_filter(self):
+        response = self.client.get(f"/comments/?post={self.other_post.id}&page_size=100")
+        self.assertEqual(response.data["count"], 7)
+        self.assertTrue(all(comment["post"] == self.other_post.id for comment in response.data["results"]))
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN 출력 형식은 SQLite 기준")
+class QueryPlanTest(TestCase):
+    # 주요 목록/상세 API가 만드는 쿼리의 실행 계획에 전체 테이블 스캔이나 임시 정렬이 없는지 확인
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test",
+            password = "test1234",
+        )
+        self.posts = [
+            Post.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                title = f"test_title{i}",
+                category = "test_category",
+                body = "test_body",
+            )
+            for i in range(3)
+        ]
+        for post in self.posts:
+            post.likes.add(self.user)
+            for i in range(5):
+                Comment.objects.create(
+                    author = self.user,
+                    profile = self.user.profile,
+                    post = post,
+                    text = f"test_comment{i}",
+                )
+
+    def explain(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if not query["sql"].startswith("SELECT"):
+                    continue
+                cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                plans.append((query["sql"], [row[-1] for row in cursor.fetchall()]))
+        return plans
+
+    def assertIndexedPlan(self, url):
+        for sql, plan in self.explain(url):
+            for i, detail in enumerate(plan):
+                # 댓글 미리보기의 윈도 함수 결과(qualify)는 게시글 한 페이지 분량만 정렬하므로 허용
+                if detail.startswith("USE TEMP B-TREE") and not (i and plan[i - 1] == "SCAN qualify"):
+                    self.fail(f"{url}: 임시 정렬 발생\n{sql}\n{plan}")
+                if (
+                    detail.startswith("SCAN ")
+                    and not detail.startswith(("SCAN (", "SCAN qualify"))
+                    and "INDEX" not in detail
+                    and not self.is_rowid_ordered_page(detail.split()[1], sql)
+                ):
+                    self.fail(f"{url}: 전체 테이블 스캔 발생\n{sql}\n{plan}")
+
+    def is_rowid_ordered_page(self, table, sql):
+        # 조건 없는 첫 페이지(ORDER BY id LIMIT n)는 rowid 순서로 n개만 읽고 멈춤. 그 밖의 인덱스 없는 스캔은 실패
+        return " WHERE " not in sql and re.search(rf'ORDER BY "{table}"\."id" (ASC|DESC) LIMIT \d+$', sql)
+
+    def test_post_list_plans(self):
+        post = self.posts[0]
+        for url in [
+            "/posts/",
+            f"/posts/?author={self.user.id}",
+            f"/posts/?likes={self.user.id}",
+            "/posts/?category=test_category",
+            f"/posts/{post.id}/",
+            f"/posts/{post.id}/comments/",
+            "/posts/trending/",
+            self.client.get("/posts/?page_size=1").data["next"],
+            self.client.get("/posts/?category=test_category&page_size=1").data["next"],
+        ]:
+            with self.subTest(url=url):
+                self.assertIndexedPlan(url)
+
+    def test_comment_list_plans(self):
+        for url in [
+            "/comments/",
+            f"/comments/?post={self.posts[0].id}",
+            self.client.get("/comments/?page_size=1").data["next"],
+        ]:
+            with self.subTest(url=url):
+                self.assertIndexedPlan(url)
+
+    def test_likes_filter_without_duplicates(self):
+        other = User.objects.create_user(username = "other", password = "test1234")
+        self.posts[0].likes.add(other)
+        response = self.client.get(f"/posts/?likes={self.user.id}&page_size=100")
+        ids = [post["id"] for post in response.data["results"]]
+        self.assertEqual(ids, sorted([post.id for post in self.posts], reverse=True))
+
+
+class SearchTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test",
+            password = "test1234",
+        )
+        self.title_match, self.body_match, self.other = [
+            Post.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                title = title,
+                category = category,
+                body = body,
+            )
+            for title, category, body in [
+                ("파이썬으로 만드는 게시판", "backend", "장고 REST 프레임워크"),
+                ("장고 입문", "backend", "파이썬 웹 프레임워크를 배워봅시다"),
+                ("Django tips", "frontend", "책 추천"),
+            ]
+        ]
+
+    def search(self, **params):
+        response = self.client.get("/posts/search/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post["id"] for post in response.data["results"]]
+
+    def test_korean_word_with_particle(self):
+        # "파이썬으로", "파이썬" 모두 "파이썬"으로 검색
+        self.assertEqual(set(self.search(q="파이썬")), {self.title_match.id, self.body_match.id})
+        self.assertEqual(self.search(q="책"), [self.other.id])
+        self.assertEqual(self.search(q="django"), [self.other.id])
+
+    def test_title_ranked_first(self):
+        self.assertEqual(self.search(q="파이썬"), [self.title_match.id, self.body_match.id])
+
+    def test_all_terms_required(self):
+        self.assertEqual(self.search(q="파이썬 게시판"), [self.title_match.id])
+        self.assertEqual(self.search(q="파이썬 없는말"), [])
+
+    def test_search_with_filter_and_pagination(self):
+        self.assertEqual(self.search(q="프레임워크", category="frontend"), [])
+        response = self.client.get("/posts/search/", {"q": "프레임워크", "page_size": 1})
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_index_follows_changes(self):
+        self.other.title = "파이썬 책"
+        self.other.save()
+        self.assertIn(self.other.id, self.search(q="파이썬"))
+        self.assertEqual(self.search(q="tips"), [])
+
+        self.title_match.delete()
+        self.assertEqual(self.search(q="게시판"), [])
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("3개", out.getvalue())
+        self.assertEqual(self.search(q="책"), [self.other.id])
+
+    def test_empty_query(self):
+        response = self.client.get("/posts/search/", {"q": " "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TrendingTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test",
+            password = "test1234",
+        )
+        self.token = Token.objects.create(user = self.user)
+        now = timezone.now()
+        # 최신 글일수록 기본 점수가 높음
+        self.posts = [
+            Post.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                title = f"test_title{i}",
+                category = "test_category",
+                body = "test_body",
+                published_date = now - timedelta(hours=i * 12),
+            )
+            for i in range(4)
+        ]
+
+    def trending(self, **params):
+        response = self.client.get("/posts/trending/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post["id"] for post in response.data]
+
+    def assertScoresConsistent(self):
+        for post in Post.objects.all():
+            self.assertAlmostEqual(
+                post.hot_score, hot_score(post.like_count, post.comment_count, post.published_date)
+            )
+
+    def test_edit_keeps_score(self):
+        post = Post.objects.get(pk = self.posts[1].pk)
+        Comment.objects.create(author = self.user, profile = self.user.profile, post = post, text = "c")
+        post.title = "edited"
+        post.save()
+        self.assertScoresConsistent()
+        post.refresh_from_db()
+        self.assertAlmostEqual(post.hot_score, hot_score(0, 1, post.published_date))
+
+    def test_newer_first_without_reactions(self):
+        self.assertEqual(self.trending(), [post.id for post in self.posts])
+        self.assertEqual(self.trending(limit=2), [post.id for post in self.posts[:2]])
+
+    def test_reactions_raise_score(self):
+        old = self.posts[1]
+        self.client.credentials(HTTP_AUTHORIZATION = "Token " + self.token.key)
+        self.client.post(f"/like/{old.id}/")
+        for i in range(10):
+            Comment.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                post = old,
+                text = f"test_comment{i}",
+            )
+        self.assertScoresConsistent()
+        self.client.credentials()
+        self.assertEqual(self.trending()[0], old.id)
+
+    def test_scores_follow_unlike_and_delete(self):
+        post = self.posts[1]
+        self.client.credentials(HTTP_AUTHORIZATION = "Token " + self.token.key)
+        self.client.post(f"/like/{post.id}/")
+        self.client.post(f"/like/{post.id}/")
+        comment = Comment.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            post = post,
+            text = "test_comment",
+        )
+        comment.delete()
+        other = User.objects.create_user(username = "other", password = "test1234")
+        post.likes.add(other)
+        other.delete()
+        self.assertScoresConsistent()
+
+    def test_rebuild_command(self):
+        Post.objects.update(hot_score=0)
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command("rebuild_hot_scores", stdout=out)
+        self.assertIn("4개", out.getvalue())
+        # 카운터는 갱신과 같은 트랜잭션에서 잠금을 잡고 읽음
+        reads = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertTrue(reads)
+        self.assertTrue(all("FOR UPDATE" in sql for sql in reads))
+        self.assertScoresConsistent()
+        self.assertEqual(self.trending(), [post.id for post in self.posts])
+
+
+@override_settings(TIMELINE={"BACKEND": "sync", "MAX_LENGTH": 3, "CELEBRITY_FOLLOWERS": 3})
+class TimelineTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user, self.author, self.celebrity, self.stranger = [
+            User.objects.create_user(
+                username = f"test_user{i}",
+                password = "test1234",
+            )
+            for i in range(4)
+        ]
+        self.token = Token.objects.create(user = self.user)
+        self.author_token = Token.objects.create(user = self.author)
+        Follow.objects.create(follower = self.user, followee = self.author)
+        Follow.objects.create(follower = self.user, followee = self.celebrity)
+        for i in range(2):
+            fan = User.objects.create_user(username = f"fan{i}", password = "test1234")
+            Follow.objects.create(follower = fan, followee = self.celebrity)
+
+    def create_post(self, author, title="test_title"):
+        return Post.objects.create(
+            author = author,
+            profile = author.profile,
+            title = title,
+            category = "test_category",
+            body = "test_body",
+        )
+
+    def timeline(self):
+        self.client.credentials(HTTP_AUTHORIZATION = "Token " + self.token.key)
+        response = self.client.get("/timeline/?page_size=100")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post["id"] for post in response.data["results"]]
+
+    def test_new_post_fan_out(self):
+        self.client.credentials(HTTP_AUTHORIZATION = "Token " + self.author_token.key)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/posts/", {"title": "test_title", "body": "test_body", "category": "backend"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(TimelineEntry.objects.filter(user = self.user).exists())
+        self.assertEqual(len(self.timeline()), 1)
+
+    def test_celebrity_fan_out_on_read(self):
+        post = self.create_post(self.celebrity)
+        self.assertEqual(fan_out(post.id, self.celebrity.id), 0)
+        self.assertFalse(TimelineEntry.objects.filter(post = post).exists())
+        self.assertEqual(self.timeline(), [post.id])
+
+    def test_timeline_order_and_trim(self):
+        posts = [self.create_post(self.author, f"test_title{i}") for i in range(5)]
+        for post in posts:
+            fan_out(post.id, self.author.id)
+        self.create_post(self.stranger)
+        celebrity_post = self.create_post(self.celebrity)
+        self.assertEqual(TimelineEntry.objects.filter(user = self.user).count(), 3)
+        self.assertEqual(self.timeline(), [celebrity_post.id] + [post.id for post in reversed(posts[-3:])])
+
+    def test_follow_backfill_and_unfollow(self):
+        post = self.create_post(self.stranger)
+        Follow.objects.create(follower = self.user, followee = self.stranger)
+        self.assertEqual(self.timeline(), [post.id])
+        Follow.objects.filter(follower = self.user, followee = self.stranger).delete()
+        self.assertEqual(self.timeline(), [])
+
+    def test_timeline_query_count(self):
+        for i in range(3):
+            fan_out(self.create_post(self.author, f"test_title{i}").id, self.author.id)
+        self.client.credentials(HTTP_AUTHORIZATION = "Token " + self.token.key)
+        self.client.get("/timeline/")
+        # 저장된 타임라인 범위 + 셀럽 목록 + 셀럽 글 범위 + 게시글 + likes + comments
+        with self.assertNumQueries(6):
+            self.client.get("/timeline/")
+
+    def test_pages_merge_celebrities(self):
+        posts = []
+        for i in range(3):
+            post = self.create_post(self.author, f"test_title{i}")
+            fan_out(post.id, self.author.id)
+            posts += [post, self.create_post(self.celebrity, f"celebrity{i}")]
+        # 셀럽이 되기 전에 배포된 글처럼 양쪽에 모두 있는 글도 한 번만
+        TimelineEntry.objects.create(user = self.user, post = posts[-1])
+        self.create_post(self.stranger)
+        expected = [post.id for post in reversed(posts)]
+        self.assertEqual(self.timeline(), expected)
+
+        ids, url = [], "/timeline/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [post["id"] for post in response.data["results"]]
+            last = response
+            url = response.data["next"]
+        self.assertEqual(ids, expected)
+        response = self.client.get(last.data["previous"])
+        self.assertEqual([post["id"] for post in response.data["results"]], expected[2:4])
+
+    def test_timeline_plans(self):
+        for i in range(3):
+            fan_out(self.create_post(self.author, f"test_title{i}").id, self.author.id)
+            self.create_post(self.celebrity)
+        self.client.credentials(HTTP_AUTHORIZATION = "Token " + self.token.key)
+        next_url = self.client.get("/timeline/?page_size=2").data["next"]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(next_url)
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if "ROW_NUMBER" in query["sql"] or not query["sql"].startswith("SELECT"):
+                    continue
+                cursor.execute("EXPLAIN QUERY PLAN " + query["sql"])
+                plan = " / ".join(row[-1] for row in cursor.fetchall())
+                # 타임라인 범위는 인덱스 순서대로 읽고 멈춤 (전체 정렬 없음)
+                self.assertNotIn("TEMP B-TREE", plan, query["sql"])
+                self.assertNotIn("MULTI-INDEX OR", plan, query["sql"])
+
+    def test_timeline_without_authorization(self):
+        response = self.client.get("/timeline/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BulkTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user, self.other = [
+            User.objects.create_user(
+                username = f"test_user{i}",
+                password = "test1234",
+            )
+            for i in range(2)
+        ]
+        self.token = Token.objects.create(user = self.user)
+        self.post, self.other_post = [
+            Post.objects.create(
+                author = user,
+                profile = user.profile,
+                title = "test_title",
+                category = "test_category",
+                body = "test_body",
+            )
+            for user in [self.user, self.other]
+        ]
+        self.client.credentials(HTTP_AUTHORIZATION = "Token " + self.token.key)
+
+    def comment_items(self, count):
+        return [{"post": self.post.id, "text": f"test_comment{i}"} for i in range(count)]
+
+    def test_bulk_create_posts(self):
+        items = [{"title": f"파이썬 {i}", "category": "backend", "body": "test_body"} for i in range(3)]
+        response = self.client.post("/posts/bulk/", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([post["title"] for post in response.data], [item["title"] for item in items])
+        self.assertEqual(Post.objects.filter(author = self.user).count(), 4)
+        response = self.client.get("/posts/search/", {"q": "파이썬"})
+        self.assertEqual(response.data["count"], 3)
+
+    def test_bulk_create_comments(self):
+        response = self.client.post("/comments/bulk/", self.comment_items(5), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 5)
+        self.assertAlmostEqual(self.post.hot_score, hot_score(0, 5, self.post.published_date))
+
+    def test_bulk_create_query_count_independent_of_size(self):
+        counts = []
+        for size in [1, 2, 20]:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post("/comments/bulk/", self.comment_items(size), format="json")
+            counts.append(len(queries))
+        # 첫 요청은 토큰 조회 포함
+        self.assertEqual(counts[1], counts[2])
+
+    def test_bulk_create_reports_item_errors(self):
+        items = self.comment_items(2) + [{"post": 99999, "text": "test_comment"}, {"post": self.post.id}]
+        response = self.client.post("/comments/bulk/", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[:2], [{}, {}])
+        self.assertIn("post", response.data[2])
+        self.assertIn("text", response.data[3])
+        self.assertFalse(Comment.objects.exists())
+
+    def test_bulk_update_posts(self):
+        extra = Post.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            title = "test_title",
+            category = "test_category",
+            body = "test_body",
+        )
+        self.post.likes.add(self.user)
+        items = [{"id": self.post.id, "title": "new_title"}, {"id": extra.id, "body": "new_body"}]
+        response = self.client.patch("/posts/bulk/", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # 단건 조회와 같은 queryset으로 응답 (좋아요 여부 포함)
+        self.assertEqual([post["is_liked"] for post in response.data], [True, False])
+        self.post.refresh_from_db()
+        extra.refresh_from_db()
+        self.assertEqual((self.post.title, self.post.body), ("new_title", "test_body"))
+        self.assertEqual((extra.title, extra.body), ("test_title", "new_body"))
+
+    def test_bulk_update_checks_author_in_one_query(self):
+        items = [{"id": self.post.id, "title": "new_title"}, {"id": self.other_post.id, "title": "new_title"}]
+        self.client.get("/timeline/")  # 토큰 인증 캐시 채움
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch("/posts/bulk/", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("detail", response.data[1])
+        self.assertEqual(len([q for q in queries.captured_queries if q["sql"].startswith("SELECT")]), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, "test_title")
+
+    def test_bulk_update_requires_objects(self):
+        response = self.client.patch("/posts/bulk/", [self.post.id], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", response.data[0])
+
+    def test_bulk_update_rejects_other_fields(self):
+        comment = Comment.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            post = self.post,
+            text = "test_comment",
+        )
+        response = self.client.patch(
+            "/comments/bulk/", [{"id": comment.id, "post": self.other_post.id}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("post", response.data[0])
+
+    def test_bulk_delete(self):
+        self.client.post("/comments/bulk/", self.comment_items(3), format="json")
+        ids = list(Comment.objects.values_list("id", flat=True))
+        response = self.client.delete("/comments/bulk/", ids[:2], format="json")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+        response = self.client.delete("/posts/bulk/", [self.post.id, self.other_post.id], format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Post.objects.count(), 2)
+        response = self.client.delete("/posts/bulk/", [self.post.id, 99999], format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_without_authorization(self):
+        self.client.credentials()
+        response = self.client.post("/comments/bulk/", self.comment_items(1), format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_defaults(self):
+        # perform_bulk_create/get_bulk_read_serializer_class를 재정의하지 않은 뷰셋도 동작
+        class FollowSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = Follow
+                fields = ["id", "follower", "followee"]
+
+        class FollowViewSet(BulkModelMixin, viewsets.ModelViewSet):
+            queryset = Follow.objects.all()
+            serializer_class = FollowSerializer
+
+        request = APIRequestFactory().post(
+            "/follows/bulk/", [{"follower": self.user.id, "followee": self.other.id}], format="json"
+        )
+        force_authenticate(request, user = self.user)
+        response = FollowViewSet.as_view({"post": "bulk"})(request)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data[0]["followee"], self.other.id)
+        self.assertTrue(Follow.objects.filter(follower = self.user, followee = self.other).exists())
+
+
+class ExportTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username = "test",
+            password = "test1234",
+            is_staff = True,
+        )
+        self.posts = [
+            Post.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                title = f"test_title{i}",
+                category = "test_category",
+                body = "line1,\n\"line2\"",
+            )
+            for i in range(3)
+        ]
+        for post in self.posts[:2]:
+            Comment.objects.create(
+                author = self.user,
+                profile = self.user.profile,
+                post = post,
+                text = "test_comment",
+            )
+        self.client.force_authenticate(user = self.user)
+
+    def export(self, **params):
+        response = self.client.get("/posts/export/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_with_comments(self):
+        records = [json.loads(line) for line in self.export(comments=1, likes=1).splitlines()]
+        self.assertEqual([record["id"] for record in records], [post.id for post in self.posts])
+        self.assertEqual([len(record["comments"]) for record in records], [1, 1, 0])
+        self.assertEqual(records[0]["body"], self.posts[0].body)
+        self.assertEqual(records[0]["like_count"], 0)
+
+    def test_csv(self):
+        rows = list(csv.DictReader(StringIO(self.export(output="csv"))))
+        self.assertEqual([int(row["id"]) for row in rows], [post.id for post in self.posts])
+        self.assertEqual(rows[0]["body"], self.posts[0].body)
+        self.assertNotIn("comments", rows[0])
+
+    def test_incremental(self):
+        records = self.export(since_id=self.posts[0].id).splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in records], [post.id for post in self.posts[1:]])
+
+        latest = Post.objects.order_by("-updated_at").first()
+        Comment.objects.create(
+            author = self.user,
+            profile = self.user.profile,
+            post = self.posts[0],
+            text = "new_comment",
+        )
+        records = self.export(since=latest.updated_at.isoformat()).splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in records], [latest.id, self.posts[0].id])
+
+    def test_chunked_queries(self):
+        # 게시글 조회 한 번(커서에서 청크 단위로 읽음) + 청크마다 댓글 조회
+        records = list(export.export_records(comments=True, chunk_size=2))
+        self.assertEqual(len(records), 3)
+        with self.assertNumQueries(3):
+            list(export.export_records(comments=True, chunk_size=2))
+
+    def test_invalid_params(self):
+        for params in [{"output": "xml"}, {"since_id": "abc"}, {"since": "yesterday"}, {"since": "2024-13-01T00:00"}]:
+            response = self.client.get("/posts/export/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(user = User.objects.create_user(username = "other"))
+        response = self.client.get("/posts/export/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command(self):
+        out = StringIO()
+        call_command("export_posts", "--format", "csv", "--comments", stdout=out)
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(len(json.loads(rows[0]["comments"])), 1)
+
+        for since in ["yesterday", "2024-13-01T00:00"]:
+            with self.assertRaises(CommandError):
+                call_command("export_posts", "--since", since, stdout=StringIO())
+
+
+class ImportTest(TestCase):
+    def setUp(self):
+        self.records = [
+            {"type": "user", "id": 100, "username": "imported1", "email": "a@test.com"},
+            {"type": "user", "id": 101, "username": "imported2"},
+            {"type": "profile", "user_id": 100, "nickname": "nick", "position": "backend"},
+            {
+                "type": "post", "id": 200, "author_id": 100, "title": "파이썬 게시글",
+                "category": "backend", "body": "test_body", "published_date": "2024-11-16T00:00:00+00:00",
+            },
+            {"type": "post", "id": 201, "author_id": 101, "title": "test_title", "body": "test_body"},
+            {"type": "comment", "id": 300, "post_id": 200, "author_id": 101, "text": "test_comment"},
+            {"type": "comment", "post_id": 200, "author_id": 100, "text": "test_comment"},
+            {"type": "like", "post_id": 200, "user_id": 100},
+            {"type": "like", "post_id": 200, "user_id": 101},
+            {"type": "like", "post_id": 201, "user_id": 100},
+        ]
+
+    def run_import(self, records, *args):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False, encoding="utf-8") as f:
+            f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        self.addCleanup(os.remove, f.name)
+        out = StringIO()
+        call_command("import_pypost", f.name, *args, stdout=out)
+        return out.getvalue()
+
+    def test_import(self):
+        out = self.run_import(self.records, "--batch-size", "2")
+        self.assertIn("rows/s", out)
+        self.assertEqual(User.objects.get(pk=100).profile.nickname, "nick")
+        self.assertFalse(User.objects.get(pk=101).has_usable_password())
+        self.assertTrue(Profile.objects.filter(pk=101).exists())
+
+        post = Post.objects.get(pk=200)
+        self.assertEqual((post.like_count, post.comment_count), (2, 2))
+        self.assertAlmostEqual(post.hot_score, hot_score(2, 2, post.published_date))
+        self.assertEqual(Post.objects.get(pk=201).like_count, 1)
+        response = APIClient().get("/posts/search/", {"q": "파이썬"})
+        self.assertEqual([result["id"] for result in response.data["results"]], [200])
+
+    def test_import_is_idempotent(self):
+        self.run_import(self.records)
+        self.run_import(self.records[:-1])
+        self.assertEqual(User.objects.filter(pk__in=[100, 101]).count(), 2)
+        self.assertEqual(Post.objects.get(pk=200).like_count, 2)
+        self.assertEqual(Comment.objects.filter(pk=300).count(), 1)
+
+    def test_import_export_output(self):
+        self.run_import(self.records)
+        exported = StringIO()
+        call_command("export_posts", "--comments", stdout=exported)
+        Post.objects.all().delete()
+        self.run_import([json.loads(line) for line in exported.getvalue().splitlines()])
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(Post.objects.get(pk=200).comment_count, 2)
+
+    def test_invalid_record(self):
+        with self.assertRaisesMessage(CommandError, "2번째 줄"):
+            self.run_import([self.records[0], {"type": "unknown"}])
+        for record in [[1, 2], "x", {**self.records[3], "comments": ["x"]}]:
+            with self.assertRaisesMessage(CommandError, "2번째 줄"):
+                self.run_import([self.records[0], record])
+
+    def test_reimport_keeps_existing_rows(self):
+        self.run_import(self.records)
+        post = Post.objects.get(pk=200)
+        post.title = "test_title"
+        post.save()
+        self.run_import([self.records[0], {"type": "profile", "user_id": 100, "position": "frontend"}, self.records[3]])
+        profile = Profile.objects.get(pk=100)
+        self.assertEqual((profile.nickname, profile.position), ("nick", "frontend"))
+        response = APIClient().get("/posts/search/", {"q": "파이썬"})
+        self.assertEqual(response.data["results"], [])
+
+    def test_integrity_error(self):
+        records = self.records[:2] + [{"type": "profile", "user_id": 100, "nickname": None}]
+        with self.assertRaisesMessage(CommandError, "profile 1건 배치 저장 실패"):
+            self.run_import(records)
+
+class AsyncViewTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username = "async_user", password = "testpw!!")
+        self.other = User.objects.create_user(username = "async_other", password = "testpw!!")
+        self.token = Token.objects.create(user = self.user)
+        self.posts = [
+            Post.objects.create(
+                author = self.other, profile = self.other.profile,
+                title = f"title{i}", category = "backend" if i % 2 else "frontend", body = "body",
+            )
+            for i in range(5)
+        ]
+        self.posts[1].likes.add(self.user)
+        for i in range(4):
+            Comment.objects.create(author = self.user, profile = self.user.profile, post = self.posts[0], text = f"c{i}")
+
+    def assertSameResponse(self, url):
+        sync_response = self.client.get(url)
+        async_response = self.client.get(url.replace("/", "/async/", 1))
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        # 페이지 링크는 각자의 엔드포인트를 가리킴
+        self.assertEqual(json.loads(async_response.content.replace(b"/async/", b"/")), sync_response.json())
+        return async_response
+
+    def test_same_as_sync_views(self):
+        for url in [
+            "/posts/",
+            "/posts/?category=backend",
+            "/posts/?fields=id,title,is_liked",
+            f"/posts/{self.posts[0].id}/",
+            "/comments/",
+            f"/comments/?post={self.posts[0].id}",
+            f"/comments/{Comment.objects.first().id}/",
+        ]:
+            with self.subTest(url = url):
+                self.assertSameResponse(url)
+
+    def test_authenticated(self):
+        self.client.credentials(HTTP_AUTHORIZATION = f"Token {self.token.key}")
+        response = self.assertSameResponse(f"/posts/{self.posts[1].id}/")
+        self.assertTrue(response.json()["is_liked"])
+        self.assertSameResponse(f"/posts/?likes={self.user.id}")
+
+    def test_cursor_pagination(self):
+        url = "/async/posts/"
+        ids = []
+        while url:
+            data = self.client.get(url).json()
+            ids += [post["id"] for post in data["results"]]
+            self.assertEqual(data["count"], 5)
+            url = data["next"]
+        self.assertEqual(ids, sorted([post.id for post in self.posts], reverse = True))
+
+        previous = self.client.get(self.client.get(data["previous"]).json()["next"]).json()
+        self.assertEqual(previous["results"], data["results"])
+
+    def test_errors(self):
+        self.assertEqual(self.client.get("/async/posts/99999/").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get("/async/posts/?likes=99999").status_code, status.HTTP_400_BAD_REQUEST)
+        # DRF와 같이 권한 검사가 먼저
+        self.assertEqual(self.client.post("/async/posts/").status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION = f"Token {self.token.key}")
+        self.assertEqual(self.client.post("/async/posts/").status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        self.client.credentials(HTTP_AUTHORIZATION = "Token invalid")
+        response = self.client.get("/async/posts/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+        self.assertEqual(response.json(), self.client.get("/posts/").json())
+
+    def test_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+        self.client.credentials(HTTP_AUTHORIZATION = f"Token {self.token.key}")
+        self.assertEqual(self.client.get("/async/posts/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_concurrent_requests(self):
+        client = AsyncClient()
+        responses = await asyncio.gather(*[client.get(f"/async/posts/{post.id}/") for post in self.posts])
+        self.assertEqual([response.json()["id"] for response in responses], [post.id for post in self.posts])
+
+
+class CommentStreamTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username = "stream_user", password = "testpw!!")
+        self.token = Token.objects.create(user = self.user)
+        self.post = Post.objects.create(author = self.user, profile = self.user.profile, title = "t", body = "b")
+        self.url = f"/posts/{self.post.id}/comments/stream/"
+        self.channel = events.post_channel(self.post.id)
+        events._bus = events.InMemoryBus()
+
+    def tearDown(self):
+        events._bus = None
+
+    def parse(self, text):
+        # [(id, event, data)]
+        if isinstance(text, bytes):
+            text = text.decode()
+        parsed = []
+        for block in text.split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if line and not line.startswith(":"))
+            if "event" in fields:
+                parsed.append((int(fields["id"]), fields["event"], json.loads(fields["data"])))
+        return parsed
+
+    def create_comment(self, text):
+        with self.captureOnCommitCallbacks(execute = True):
+            return Comment.objects.create(author = self.user, profile = self.user.profile, post = self.post, text = text)
+
+    def delete_comment(self, comment):
+        with self.captureOnCommitCallbacks(execute = True):
+            comment.delete()
+
+    async def test_stream(self):
+        response = await AsyncClient().get(self.url)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = response.streaming_content
+        [(ready_id, event, _)] = self.parse(await anext(content))
+        self.assertEqual(event, "ready")
+        self.assertEqual(events.get_bus().subscriber_count(self.channel), 1)
+
+        comment = await sync_to_async(self.create_comment)("hello")
+        [(created_id, event, data)] = self.parse(await anext(content))
+        self.assertEqual((event, data["id"], data["text"]), ("comment.created", comment.id, "hello"))
+        self.assertGreater(created_id, ready_id)
+
+        comment_id = comment.id
+        await sync_to_async(self.delete_comment)(comment)
+        [(_, event, data)] = self.parse(await anext(content))
+        self.assertEqual((event, data), ("comment.deleted", {"id": comment_id, "post": self.post.id}))
+
+    async def test_heartbeat_and_max_duration(self):
+        with self.settings(COMMENT_STREAM = {"HEARTBEAT": 0.05, "MAX_DURATION": 0.2}):
+            response = await AsyncClient().get(self.url)
+            chunks = [chunk async for chunk in response.streaming_content]
+        self.assertIn(b": heartbeat\n\n", chunks)
+        self.assertEqual(events.get_bus().subscriber_count(self.channel), 0)
+
+    async def test_resume(self):
+        bus = events.get_bus()
+        seen = bus.publish(self.channel, "comment.created", {"id": 1})
+        bus.publish(events.post_channel(self.post.id + 1), "comment.created", {"id": 2})
+        missed = bus.publish(self.channel, "comment.deleted", {"id": 1})
+
+        response = await AsyncClient().get(self.url, headers = {"Last-Event-ID": str(seen.id)})
+        # 다른 게시글의 이벤트와 이미 받은 이벤트는 제외하고 놓친 이벤트만
+        self.assertEqual(self.parse(await anext(response.streaming_content)), [])
+        self.assertEqual(self.parse(await anext(response.streaming_content)), [(missed.id, "comment.deleted", {"id": 1})])
+
+        # 기록 범위 밖의 id는 reset
+        response = await AsyncClient().get(f"{self.url}?last_event_id=1")
+        [(reset_id, event, _)] = self.parse(await anext(response.streaming_content))
+        self.assertEqual((reset_id, event), (missed.id, "reset"))
+
+    async def test_slow_subscriber_is_disconnected(self):
+        with self.settings(COMMENT_STREAM = {"BUFFER_SIZE": 2}):
+            response = await AsyncClient().get(self.url)
+            content = response.streaming_content
+            await anext(content)
+            for i in range(3):
+                events.get_bus().publish(self.channel, "comment.created", {"id": i})
+            self.assertEqual([chunk async for chunk in content], [])
+        self.assertEqual(events.get_bus().subscriber_count(self.channel), 0)
+
+    def test_history_size(self):
+        bus = events.InMemoryBus(history_size = 2)
+        first = bus.publish(self.channel, "comment.created", {"id": 1})
+        second = bus.publish(self.channel, "comment.created", {"id": 2})
+        bus.publish(self.channel, "comment.created", {"id": 3})
+        # 첫 이벤트가 밀려났으므로 그 이전부터는 이어받을 수 없음
+        self.assertEqual(bus.history(self.channel, first.id - 1)[1], None)
+        self.assertEqual(len(bus.history(self.channel, first.id)[1]), 2)
+        self.assertEqual(len(bus.history(self.channel, second.id)[1]), 1)
+
+    def test_incomplete_bus(self):
+        class PublishOnlyBus(events.EventBus):
+            def publish(self, channel, event_type, data):
+                pass
+
+        with self.assertRaises(TypeError):
+            PublishOnlyBus()
+
+    def test_wsgi_fallback(self):
+        # WSGI에서는 놓친 이벤트만 보내고 연결을 닫음
+        response = self.client.get(self.url)
+        [(ready_id, event, _)] = self.parse(b"".join(response.streaming_content))
+        self.assertEqual(event, "ready")
+
+        self.client.credentials(HTTP_AUTHORIZATION = f"Token {self.token.key}")
+        with self.captureOnCommitCallbacks(execute = True):
+            response = self.client.post(
+                "/comments/bulk/", [{"post": self.post.id, "text": "a"}, {"post": self.post.id, "text": "b"}], format = "json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get(self.url, HTTP_LAST_EVENT_ID = str(ready_id))
+        received = self.parse(b"".join(response.streaming_content))
+        self.assertEqual([(event, data["text"]) for _, event, data in received], [("comment.created", "a"), ("comment.created", "b")])
+
+    def test_errors(self):
+        self.assertEqual(self.client.get("/posts/99999/comments/stream/").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(f"{self.url}?last_event_id=abc").status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,148 @@
+import heapq
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from users.models import Follow, Profile
+from .models import Post, TimelineEntry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPTIONS = {
+    "BACKEND": "thread",  # "thread": 커밋 직후 스레드 풀에서 배포, "sync": 커밋 직후 요청 스레드에서 배포
+    "WORKERS": 2,
+    "MAX_LENGTH": 500,  # 유저별 타임라인 최대 길이 (오래된 글부터 삭제)
+    "CELEBRITY_FOLLOWERS": 10000,  # 팔로워가 이 수 이상이면 배포하지 않고 읽을 때 합침 (fan-out-on-read)
+    "BATCH_SIZE": 1000,
+}
+
+_executor = None
+
+
+def get_options():
+    return {**DEFAULT_OPTIONS, **getattr(settings, "TIMELINE", {})}
+
+
+def is_celebrity(user_id):
+    threshold = get_options()["CELEBRITY_FOLLOWERS"]
+    return Profile.objects.filter(pk=user_id, follower_count__gte=threshold).exists()
+
+
+def enqueue_fan_out(post):
+    # 요청 안에서는 배포하지 않고 커밋 이후 워커에 넘김
+    post_id, author_id = post.pk, post.author_id
+    if get_options()["BACKEND"] == "thread":
+        transaction.on_commit(lambda: _get_executor().submit(_run_in_thread, post_id, author_id))
+    else:
+        transaction.on_commit(lambda: fan_out(post_id, author_id))
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=get_options()["WORKERS"], thread_name_prefix="timeline")
+    return _executor
+
+
+def _run_in_thread(post_id, author_id):
+    try:
+        fan_out(post_id, author_id)
+    except Exception:
+        logger.exception("timeline fan-out for post %s failed", post_id)
+    finally:
+        connection.close()
+
+
+def fan_out(post_id, author_id):
+    # 팔로워 id 범위 단위로 나눠 타임라인에 추가 (팔로워 전체를 메모리에 올리지 않음)
+    if is_celebrity(author_id):
+        return 0
+    batch_size = get_options()["BATCH_SIZE"]
+    last_id = 0
+    delivered = 0
+    while True:
+        follower_ids = list(
+            Follow.objects.filter(followee_id=author_id, follower_id__gt=last_id)
+            .order_by("follower_id")
+            .values_list("follower_id", flat=True)[:batch_size]
+        )
+        if not follower_ids:
+            return delivered
+        last_id = follower_ids[-1]
+        with transaction.atomic():
+            if not Post.objects.select_for_update().filter(pk=post_id).exists():
+                # 배포 전에 삭제된 글
+                return delivered
+            TimelineEntry.objects.bulk_create(
+                [TimelineEntry(user_id=user_id, post_id=post_id) for user_id in follower_ids],
+                ignore_conflicts=True,
+            )
+            trim(follower_ids)
+        delivered += len(follower_ids)
+
+
+def trim(user_ids):
+    # 유저별로 최신 MAX_LENGTH개만 남기고 삭제
+    overflow = (
+        TimelineEntry.objects.filter(user_id__in=user_ids)
+        .annotate(position=Window(RowNumber(), partition_by=F("user_id"), order_by=F("post_id").desc()))
+        .filter(position__gt=get_options()["MAX_LENGTH"])
+        .values_list("pk", flat=True)
+    )
+    return TimelineEntry.objects.filter(pk__in=list(overflow)).delete()[0]
+
+
+def backfill(user_id, author_id):
+    # 새로 팔로우한 작성자의 최근 글을 타임라인에 채움 (셀럽은 읽을 때 합치므로 제외)
+    if is_celebrity(author_id):
+        return
+    post_ids = Post.objects.filter(author_id=author_id).order_by("-id").values_list("id", flat=True)
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(user_id=user_id, post_id=post_id) for post_id in post_ids[:get_options()["MAX_LENGTH"]]],
+        ignore_conflicts=True,
+    )
+    trim([user_id])
+
+
+def timeline_page_ids(user, limit, position=None, reverse=False):
+    # 커서 위치(position)부터 limit개의 게시글 id (reverse면 이전 페이지 방향, id 오름차순)
+    # 저장된 타임라인은 (user, post) 인덱스 범위, 팔로우한 셀럽의 글은 셀럽마다 (author, id) 인덱스 범위에서
+    # 각각 limit개까지만 읽어 합침. 셀럽 수 * limit을 넘는 행은 읽지 않음
+    lookup = "gt" if reverse else "lt"
+    entries = TimelineEntry.objects.filter(user=user).order_by("post_id" if reverse else "-post_id")
+    posts = Post.objects.order_by("id" if reverse else "-id")
+    if position is not None:
+        entries = entries.filter(**{f"post_id__{lookup}": position})
+        posts = posts.filter(**{f"id__{lookup}": position})
+    celebrity_ids = Follow.objects.filter(
+        follower=user, followee__profile__follower_count__gte=get_options()["CELEBRITY_FOLLOWERS"]
+    ).values_list("followee_id", flat=True)
+    ranges = [list(entries.values_list("post_id", flat=True)[:limit])]
+    for author_id in celebrity_ids:
+        ranges.append(list(posts.filter(author_id=author_id).values_list("id", flat=True)[:limit]))
+
+    # 셀럽이 되기 전에 배포된 글은 양쪽에 모두 있으므로 중복 제거
+    ids = []
+    for post_id in heapq.merge(*ranges, reverse=not reverse):
+        if not ids or ids[-1] != post_id:
+            ids.append(post_id)
+            if len(ids) == limit:
+                break
+    return ids
+
+
+@receiver(post_save, sender=Follow)
+def follow_backfill(sender, instance, created, **kwargs):
+    if created:
+        backfill(instance.follower_id, instance.followee_id)
+
+
+@receiver(post_delete, sender=Follow)
+def unfollow_cleanup(sender, instance, **kwargs):
+    TimelineEntry.objects.filter(user_id=instance.follower_id, post__author_id=instance.followee_id).delete()
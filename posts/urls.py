@@ -1,13 +1,23 @@
 from django.urls import path
 from rest_framework import routers
-from .views import PostViewSet, like_post, CommentViewSet
+from .views import PostViewSet, like_post, CommentViewSet, TimelineViewSet
+from .async_views import (
+    AsyncPostListView, AsyncPostDetailView, AsyncCommentListView, AsyncCommentDetailView, CommentStreamView,
+)
 
 router = routers.SimpleRouter()
 router.register('posts',PostViewSet)
 router.register('comments', CommentViewSet)
+router.register('timeline', TimelineViewSet, basename='timeline')
 
 urlpatterns = router.urls
 
 urlpatterns += [
-    path('like/<int:id>/', like_post, name='like_post')
+    path('like/<int:id>/', like_post, name='like_post'),
+    path('posts/<int:pk>/comments/stream/', CommentStreamView.as_view(), name='comment_stream'),
+    # ASGI로 실행할 때 스레드를 점유하지 않는 읽기 전용 엔드포인트 (응답은 /posts/, /comments/ 와 동일)
+    path('async/posts/', AsyncPostListView.as_view(), name='async_post_list'),
+    path('async/posts/<int:pk>/', AsyncPostDetailView.as_view(), name='async_post_detail'),
+    path('async/comments/', AsyncCommentListView.as_view(), name='async_comment_list'),
+    path('async/comments/<int:pk>/', AsyncCommentDetailView.as_view(), name='async_comment_detail'),
 ]
\ No newline at end of file
@@ -1,50 +1,297 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Value
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.generics import get_object_or_404
-from rest_framework.permissions import IsAuthenticated
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from pypost.db.replicas import ReplicaReadMixin
+from pypost.rows import RowSerializationMixin
 from users.models import Profile
-from .models import Post, Comment
+from .bulk import BulkModelMixin
+from .cache import CachedResponseMixin, ConditionalGetMixin, generation_key, invalidate, invalidate_count
+from .events import comment_data, publish_on_commit
+from . import export
+from .filters import PostFilter
+from .models import Post, Comment, hot_score, updated_hot_score
+from .pagination import PostPagination, CommentPagination, SearchPagination, TimelinePagination
 from .permissions import CustomReadOnly
+from .search import get_search_backend
+from .timeline import enqueue_fan_out, timeline_page_ids
 from .serializers import PostSerializer, PostCreateSerializer, CommentSerializer, CommentCreateSerializer
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class SparseFieldsMixin:
+    # list/retrieve에서 ?fields= / ?omit= 에 맞춰 serializer 필드와 조회 쿼리를 함께 줄임
+    read_actions = ["list", "retrieve"]
+
+    def get_selected_fields(self):
+        if self.action not in self.read_actions:
+            return None
+        return self.get_serializer_class().select_fields(self.request.query_params)
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_selected_fields()
+        if fields is not None:
+            kwargs["fields"] = fields
+        return super().get_serializer(*args, **kwargs)
+
+
+def annotate_is_liked(queryset, user):
+    # 페이지의 게시글 조회 쿼리 안에서 좋아요 여부를 함께 계산 (추가 쿼리 없음)
+    if not user.is_authenticated:
+        return queryset.annotate(is_liked=Value(False))
+    likes = Post.likes.through.objects.filter(post_id=OuterRef("pk"), user_id=user.id)
+    return queryset.annotate(is_liked=Exists(likes))
+
+
+class PostViewSet(ReplicaReadMixin, BulkModelMixin, SparseFieldsMixin, ConditionalGetMixin, CachedResponseMixin, RowSerializationMixin, viewsets.ModelViewSet):
     queryset = Post.objects.all().order_by('-id') # 내림차순
     permission_classes = [CustomReadOnly]
+    pagination_class = PostPagination
+    list_cache_dependencies = (Post, Profile)
+    detail_cache_dependencies = (Profile,)
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['author','likes']
+    filterset_class = PostFilter
+    read_actions = ["list", "retrieve", "search", "trending"]
+    trending_size = 20
+    max_trending_size = 100
+    bulk_update_fields = ("title", "category", "body")
 
     def get_serializer_class(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in self.read_actions:
             return PostSerializer
         return PostCreateSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.read_actions or self.action in self.bulk_read_actions:
+            fields = self.get_selected_fields()
+            queryset = PostSerializer.setup_eager_loading(queryset, fields)
+            if fields is None or "is_liked" in fields:
+                queryset = annotate_is_liked(queryset, self.request.user)
+        return queryset
+
     def perform_create(self, serializer):
         profile = Profile.objects.get(user = self.request.user)
         serializer.save(author = self.request.user, profile = profile)
+        # 팔로워 타임라인 배포는 커밋 후 백그라운드에서
+        enqueue_fan_out(serializer.instance)
+
+    def get_bulk_read_serializer_class(self):
+        return PostSerializer
+
+    def perform_bulk_create(self, validated_data):
+        # bulk_create는 save 시그널이 없으므로 인기 점수, 검색 색인, 캐시, 타임라인 배포를 직접 처리
+        # 트랜잭션 안에서 읽은 뒤 쓰므로 select_for_update로 쓰기 잠금부터 잡음
+        profile = Profile.objects.select_for_update().get(user=self.request.user)
+        posts = [Post(author=self.request.user, profile=profile, **attrs) for attrs in validated_data]
+        for post in posts:
+            post.hot_score = hot_score(post.like_count, post.comment_count, post.published_date)
+        Post.objects.bulk_create(posts)
+        get_search_backend().index_rows([(post.pk, post.title, post.body) for post in posts])
+        invalidate(Post)
+        invalidate_count(Post)
+        for post in posts:
+            enqueue_fan_out(post)
+        return posts
+
+    def after_bulk_update(self, posts, changed):
+        if {"title", "body"} & changed:
+            get_search_backend().index_rows([(post.pk, post.title, post.body) for post in posts])
+        for post in posts:
+            invalidate(Post, post.pk)
+        invalidate(Post)
+        if "category" in changed:
+            # ?category= 필터의 COUNT가 달라짐
+            invalidate_count(Post)
+
+    @action(detail=True, methods=["get"], url_path="comments")
+    def comments(self, request, pk=None):
+        # 게시글의 전체 댓글을 (post_id, id) 인덱스 기반 키셋 페이지네이션으로 제공
+        # get_object로 게시글 확인 (잘못된 id는 404, 권한/쿼리셋 조건 적용)
+        post = self.get_object()
+        queryset = Comment.objects.filter(post_id=post.pk)
+        fields = CommentSerializer.select_fields(request.query_params)
+        queryset = CommentSerializer.setup_eager_loading(queryset, fields)
+
+        paginator = CommentPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        kwargs = {"fields": fields} if fields is not None else {}
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context(), **kwargs)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        # 제목/본문 전문 검색, 관련도 순. 목록과 같은 필터(?category= 등)를 함께 쓸 수 있음
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "검색어를 입력해주세요."})
+        queryset = get_search_backend().search(self.filter_queryset(self.get_queryset()), query)
+
+        paginator = SearchPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="trending")
+    def trending(self, request):
+        # hot_score 인덱스에서 상위 N개만 읽음 (?limit=, 최대 max_trending_size)
+        keys = [generation_key(model) for model in self.list_cache_dependencies]
+        return self.cached_response("trending", keys, self.trending_response, request)
+
+    @action(detail=False, methods=["get"], url_path="export", permission_classes=[IsAdminUser])
+    def export(self, request):
+        # 전체 게시글을 NDJSON/CSV로 스트리밍 (?output=ndjson|csv, ?comments=1, ?likes=1, ?since_id=, ?since=)
+        # DRF가 ?format=을 응답 형식 지정에 쓰므로 ?output= 사용
+        params = request.query_params
+        output = params.get("output", "ndjson")
+        if output not in export.FORMATS:
+            raise ValidationError({"output": f"{', '.join(export.FORMATS)} 중 하나여야 합니다."})
+        since_id = params.get("since_id")
+        if since_id is not None:
+            if not since_id.isdigit():
+                raise ValidationError({"since_id": "정수여야 합니다."})
+            since_id = int(since_id)
+        since = params.get("since")
+        if since is not None:
+            # 형식이 아니면 None, 형식은 맞지만 범위를 벗어난 값(13월 등)은 ValueError
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                raise ValidationError({"since": "ISO 8601 형식의 시각이어야 합니다."})
+
+        stream = export.render(
+            output,
+            since_id=since_id,
+            since=since,
+            comments=params.get("comments") in ("1", "true"),
+            likes=params.get("likes") in ("1", "true"),
+        )
+        response = StreamingHttpResponse(stream, content_type=export.FORMATS[output])
+        response["Content-Disposition"] = f'attachment; filename="posts.{output}"'
+        return response
+
+    def trending_response(self, request):
+        try:
+            limit = min(int(request.query_params.get("limit", self.trending_size)), self.max_trending_size)
+        except ValueError:
+            limit = self.trending_size
+        queryset = self.filter_queryset(self.get_queryset()).order_by("-hot_score", "-id")[:max(limit, 1)]
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+class TimelineViewSet(SparseFieldsMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    # 팔로우한 작성자의 글 (posts.timeline에 미리 배포된 목록 + 셀럽 작성자의 글)
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = TimelinePagination
+
+    def get_queryset(self):
+        # 타임라인 범위는 paginate_queryset이 페이지 단위로 정함 (전체 타임라인을 한 쿼리로 정렬하지 않음)
+        fields = self.get_selected_fields()
+        queryset = PostSerializer.setup_eager_loading(Post.objects.all(), fields)
+        if fields is None or "is_liked" in fields:
+            queryset = annotate_is_liked(queryset, self.request.user)
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        # 커서 위치부터 한 페이지(+ 다음 페이지 확인용 1개) 분량의 id만 인덱스 범위에서 읽고 그 안에서 페이지 구성
+        cursor = self.paginator.decode_cursor(self.request)
+        offset, reverse, position = (0, False, None) if cursor is None else cursor
+        if position is not None:
+            try:
+                position = int(position)
+            except ValueError:
+                raise NotFound(self.paginator.invalid_cursor_message)
+        limit = offset + self.paginator.get_page_size(self.request) + 1
+        post_ids = timeline_page_ids(self.request.user, limit, position, reverse)
+        return super().paginate_queryset(queryset.filter(pk__in=post_ids))
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def like_post(request, id):
-    post = get_object_or_404(Post, id=id)
-    if request.user in post.likes.all():
-        post.likes.remove(request.user)
-    else:
-        post.likes.add(request.user)
-    return Response(status=status.HTTP_200_OK)
-
-class CommentViewSet(viewsets.ModelViewSet):
+    # likes 전체를 읽지 않고 through 테이블의 (post, user) 유니크 인덱스로 확인 후 추가/삭제
+    # 카운터, 인기 점수, 캐시 무효화는 add/remove가 보내는 m2m_changed 수신기에서 처리
+    with transaction.atomic():
+        # 게시글 행에 먼저 쓰기 잠금을 걸어 같은 게시글의 토글을 직렬화 (존재 여부 확인 겸용)
+        # 어차피 카운터 갱신으로 이 행을 쓰게 되므로 추가 경합은 없음
+        if not Post.objects.filter(pk=id).update(updated_at=timezone.now()):
+            raise NotFound
+        # 조회 없이 pk만으로 관계 매니저 사용 (DB가 정해지지 않은 인스턴스이므로 유저도 pk로 전달)
+        post = Post(pk=id)
+        liked = not Post.likes.through.objects.filter(post_id=id, user_id=request.user.id).exists()
+        if liked:
+            post.likes.add(request.user.id)
+        else:
+            post.likes.remove(request.user.id)
+        like_count = Post.objects.filter(pk=id).values_list("like_count", flat=True).get()
+    return Response({"liked": liked, "like_count": like_count}, status=status.HTTP_200_OK)
+
+class CommentViewSet(ReplicaReadMixin, BulkModelMixin, SparseFieldsMixin, ConditionalGetMixin, CachedResponseMixin, RowSerializationMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all().order_by('id') # 오름차순
     permission_classes = [CustomReadOnly]
+    pagination_class = CommentPagination
+    filterset_fields = ['post']
+    bulk_update_fields = ("text",)
+    list_cache_dependencies = (Comment, Profile)
+    detail_cache_dependencies = (Profile,)
 
     def get_serializer_class(self):
         if self.action in ["list","retrieve"]:
             return CommentSerializer
         return CommentCreateSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ["list", "retrieve"] or self.action in self.bulk_read_actions:
+            queryset = CommentSerializer.setup_eager_loading(queryset, self.get_selected_fields())
+        return queryset
+
     def perform_create(self, serializer):
         profile = Profile.objects.get(user=self.request.user)
-        serializer.save(author=self.request.user, profile=profile)
\ No newline at end of file
+        serializer.save(author=self.request.user, profile=profile)
+
+    def get_bulk_read_serializer_class(self):
+        return CommentSerializer
+
+    def perform_bulk_create(self, validated_data):
+        # bulk_create는 save 시그널이 없으므로 게시글별 카운터/점수와 캐시를 직접 갱신 (게시글마다 UPDATE 한 번)
+        profile = Profile.objects.select_for_update().get(user=self.request.user)
+        comments = [Comment(author=self.request.user, profile=profile, **attrs) for attrs in validated_data]
+        Comment.objects.bulk_create(comments)
+        now = timezone.now()
+        for post_id, count in Counter(comment.post_id for comment in comments).items():
+            Post.objects.filter(pk=post_id).update(
+                comment_count=F("comment_count") + count,
+                hot_score=updated_hot_score(comment_count=F("comment_count") + count),
+                updated_at=now,
+            )
+            invalidate(Post, post_id)
+        invalidate(Comment)
+        invalidate_count(Comment)
+        invalidate(Post)
+        for comment in comments:
+            publish_on_commit(comment.post_id, "comment.created", comment_data(comment))
+        return comments
+
+    def after_bulk_update(self, comments, changed):
+        # 게시글 응답에 댓글 미리보기가 포함되므로 게시글 updated_at도 갱신
+        post_ids = {comment.post_id for comment in comments}
+        Post.objects.filter(pk__in=post_ids).update(updated_at=timezone.now())
+        for comment in comments:
+            invalidate(Comment, comment.pk)
+            publish_on_commit(comment.post_id, "comment.updated", comment_data(comment))
+        for post_id in post_ids:
+            invalidate(Post, post_id)
+        invalidate(Comment)
+        invalidate(Post)
\ No newline at end of file
@@ -5,6 +5,9 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
+
+Run with: uvicorn pypost.asgi:application
+(/async/posts/, /async/comments/ are async views; the rest run in a thread per request)
 """
 
 import os
@@ -0,0 +1,231 @@
+import logging
+import threading
+import zlib
+from collections import defaultdict
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPTIONS = {
+    "ENCODINGS": ["br", "zstd", "gzip"],  # 사용할 인코딩 (같은 q 값이면 앞쪽 우선). 라이브러리가 없는 인코딩은 제외
+    "MIN_SIZE": 1024,  # 이보다 작은 응답은 압축하지 않음 (헤더/CPU 비용이 더 큼)
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,  # 11(최대)은 응답마다 압축하기에는 너무 느림
+    "ZSTD_LEVEL": 3,
+    # 압축하지 않는 Content-Type (앞부분 일치). SSE는 압축 버퍼 때문에 이벤트가 바로 전달되지 않으므로 제외
+    "SKIP_CONTENT_TYPES": [
+        "text/event-stream",
+        "image/", "video/", "audio/", "font/woff",
+        "application/zip", "application/gzip", "application/x-gzip", "application/zstd",
+        "application/x-7z-compressed", "application/x-rar-compressed", "application/pdf",
+        "application/octet-stream",
+    ],
+    "PAYLOAD_BUDGET": None,  # 압축 전 크기(바이트)가 이보다 큰 응답은 경고 로그 (None이면 끔)
+}
+
+_accept_encoding_re = _lazy_re_compile(r"\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?")
+
+
+def get_options():
+    return {**DEFAULT_OPTIONS, **getattr(settings, "COMPRESSION", {})}
+
+
+class Compressor:
+    # 인코딩별 압축 객체를 compress(청크) / finish() 인터페이스로 맞춤
+    def __init__(self, compress, finish):
+        self.compress = compress
+        self.finish = finish
+
+
+def gzip_compressor(options):
+    compressobj = zlib.compressobj(options["GZIP_LEVEL"], zlib.DEFLATED, 31)  # wbits 31: gzip 헤더
+    return Compressor(compressobj.compress, compressobj.flush)
+
+
+def brotli_compressor(options):
+    compressor = brotli.Compressor(quality=options["BROTLI_QUALITY"])
+    return Compressor(compressor.process, compressor.finish)
+
+
+def zstd_compressor(options):
+    compressobj = zstandard.ZstdCompressor(level=options["ZSTD_LEVEL"]).compressobj()
+    return Compressor(compressobj.compress, compressobj.flush)
+
+
+COMPRESSORS = {
+    "gzip": gzip_compressor,
+    "br": brotli_compressor if brotli else None,
+    "zstd": zstd_compressor if zstandard else None,
+}
+
+
+def available_encodings(options):
+    return tuple(name for name in options["ENCODINGS"] if COMPRESSORS.get(name) is not None)
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding, encodings):
+    # Accept-Encoding의 q 값이 가장 큰 인코딩 (같으면 encodings 순서). q=0이면 거부, *는 나열되지 않은 인코딩의 q
+    qualities = {}
+    for match in _accept_encoding_re.finditer(accept_encoding):
+        name, quality = match.group(1).lower(), match.group(2)
+        try:
+            qualities[name] = float(quality) if quality is not None else 1.0
+        except ValueError:
+            qualities[name] = 0.0
+    best, best_quality = None, 0.0
+    for name in encodings:
+        quality = qualities.get(name, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def endpoint_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is not None and match.view_name:
+        return match.view_name
+    return request.path
+
+
+_stats = defaultdict(lambda: {"responses": 0, "compressed": 0, "bytes": 0, "compressed_bytes": 0, "max_bytes": 0})
+_stats_lock = threading.Lock()
+
+
+def record(endpoint, size, compressed_size, encoding, options):
+    # 엔드포인트(URL 이름)별 압축 전/후 크기. 어떤 serializer 응답이 큰지 확인하는 용도
+    with _stats_lock:
+        stats = _stats[endpoint]
+        stats["responses"] += 1
+        stats["compressed"] += encoding is not None
+        stats["bytes"] += size
+        stats["compressed_bytes"] += compressed_size
+        stats["max_bytes"] = max(stats["max_bytes"], size)
+    budget = options["PAYLOAD_BUDGET"]
+    if budget is not None and size > budget:
+        logger.warning(
+            "%s response is %d bytes (%d bytes %s), over the payload budget of %d bytes",
+            endpoint, size, compressed_size, encoding or "identity", budget,
+        )
+
+
+def get_compression_stats():
+    with _stats_lock:
+        return {endpoint: dict(stats) for endpoint, stats in _stats.items()}
+
+
+def reset_compression_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def skip_compression(response, options):
+    if response.has_header("Content-Encoding") or response.has_header("Content-Range"):
+        return True
+    if "no-transform" in response.get("Cache-Control", ""):
+        return True
+    content_type = response.get("Content-Type", "").lower()
+    return any(content_type.startswith(prefix) for prefix in options["SKIP_CONTENT_TYPES"])
+
+
+def compress_stream(chunks, compressor, on_close):
+    size = compressed_size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        data = compressor.compress(chunk) if compressor else chunk
+        compressed_size += len(data)
+        if data:
+            yield data
+    if compressor:
+        data = compressor.finish()
+        compressed_size += len(data)
+        yield data
+    on_close(size, compressed_size)
+
+
+async def acompress_stream(chunks, compressor, on_close):
+    size = compressed_size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        data = compressor.compress(chunk) if compressor else chunk
+        compressed_size += len(data)
+        if data:
+            yield data
+    if compressor:
+        data = compressor.finish()
+        compressed_size += len(data)
+        yield data
+    on_close(size, compressed_size)
+
+
+def compress_response(request, response):
+    options = get_options()
+    if skip_compression(response, options):
+        return response
+    endpoint = endpoint_name(request)
+    encoding = negotiate(request.headers.get("Accept-Encoding", ""), available_encodings(options))
+
+    if response.streaming:
+        # 스트리밍 응답은 크기를 미리 알 수 없으므로 항상 압축하고, 크기는 끝까지 보낸 뒤 기록
+        compressor = COMPRESSORS[encoding](options) if encoding else None
+
+        def on_close(size, compressed_size):
+            record(endpoint, size, compressed_size, encoding, options)
+
+        if response.is_async:
+            response.streaming_content = acompress_stream(response.streaming_content, compressor, on_close)
+        else:
+            response.streaming_content = compress_stream(response.streaming_content, compressor, on_close)
+        if compressor is None:
+            return response
+        del response.headers["Content-Length"]
+    else:
+        size = len(response.content)
+        if encoding is None or size < options["MIN_SIZE"]:
+            record(endpoint, size, size, None, options)
+            return response
+        compressor = COMPRESSORS[encoding](options)
+        content = compressor.compress(response.content) + compressor.finish()
+        if len(content) >= size:
+            record(endpoint, size, size, None, options)
+            return response
+        record(endpoint, size, len(content), encoding, options)
+        response.content = content
+        response.headers["Content-Length"] = str(len(content))
+
+    # 압축된 본문은 원본과 바이트가 다르므로 강한 ETag를 약한 ETag로 (If-None-Match는 약한 비교라 그대로 304)
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response.headers["ETag"] = "W/" + etag
+    response.headers["Content-Encoding"] = encoding
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+@sync_and_async_middleware
+def compression_middleware(get_response):
+    # Accept-Encoding에 따라 br/zstd/gzip으로 응답 압축 (django GZipMiddleware 대체)
+    # 압축은 CPU 작업이라 async에서도 스레드로 넘기지 않고 그대로 실행
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            return compress_response(request, await get_response(request))
+    else:
+        def middleware(request):
+            return compress_response(request, get_response(request))
+    return middleware
@@ -0,0 +1,174 @@
+import re
+import threading
+
+from django.db.backends.sqlite3 import base
+
+from .creation import DatabaseCreation
+from .features import DatabaseFeatures
+from .operations import FOR_UPDATE_SQL, DatabaseOperations
+
+# 연결마다 적용하는 PRAGMA (DATABASES의 OPTIONS['pragmas']로 덮어쓰기)
+DEFAULT_PRAGMAS = {
+    "journal_mode": "wal",  # 읽기와 쓰기가 서로 막지 않음
+    "synchronous": "normal",  # WAL에서는 커밋마다 fsync하지 않아도 DB가 깨지지 않음 (전원 장애 시 마지막 커밋만 유실 가능)
+    "cache_size": -20000,  # 페이지 캐시 약 20MB (음수는 KiB 단위)
+    "mmap_size": 128 * 1024 * 1024,
+    "temp_store": "memory",
+}
+# 쓰기 문장 (DDL 포함). WITH로 시작하면 CTE 뒤 본문이 쓰기인지 확인
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER")
+_quoted_re = re.compile(r"\"[^\"]*\"|'[^']*'")
+_cte_write_re = re.compile(r"\b(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+# DB 파일별 쓰기 잠금 (같은 프로세스의 쓰기를 한 줄로 세움)
+_writer_locks = {}
+_writer_locks_guard = threading.Lock()
+
+
+def get_writer_lock(name):
+    with _writer_locks_guard:
+        return _writer_locks.setdefault(str(name), threading.Lock())
+
+
+def is_write(sql):
+    head = sql.lstrip()[:7].upper()
+    if head.startswith(WRITE_STATEMENTS) or sql.endswith(FOR_UPDATE_SQL):
+        return True
+    # 따옴표 안의 이름/문자열("update" 컬럼 등)은 제외하고 찾음
+    return head.startswith("WITH") and _cte_write_re.search(_quoted_re.sub("", sql)) is not None
+
+
+class SQLiteCursorWrapper(base.SQLiteCursorWrapper):
+    # 문장마다 미뤄 둔 BEGIN과 쓰기 잠금을 처리한 뒤 실행
+    def execute(self, query, params=None):
+        with self.db.writing(query):
+            return super().execute(query, params)
+
+    def executemany(self, query, param_list):
+        with self.db.writing(query):
+            return super().executemany(query, param_list)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # django.db.backends.sqlite3 + 운영용 설정
+    # - 연결 시 PRAGMA 적용 (WAL, synchronous, cache_size, mmap_size, busy_timeout은 OPTIONS['timeout'])
+    # - BEGIN은 트랜잭션의 첫 문장 직전에 실행. 첫 문장이 쓰기면 BEGIN IMMEDIATE, 아니면 BEGIN
+    # - 쓰기(트랜잭션, autocommit 쓰기 문장)는 프로세스 내 잠금으로 직렬화해 SQLite busy 대기(폴링) 대신 순서대로 실행
+    #   트랜잭션은 첫 쓰기 문장에서 잠금을 잡아 커밋/롤백까지 유지 (읽기만 하는 트랜잭션은 잠금 없음)
+    # - 읽은 뒤 쓰는 트랜잭션은 그 사이 다른 연결이 커밋했으면 쓰기에서 "database is locked"(잠금 승격 실패)
+    #   값을 읽어 다시 쓰는 코드는 select_for_update()로 읽거나 쓰기 문장을 먼저 실행해 잠금부터 잡을 것
+    # - CONN_HEALTH_CHECKS를 켜면 재사용 전에 SELECT 1로 연결 확인
+    creation_class = DatabaseCreation
+    features_class = DatabaseFeatures
+    ops_class = DatabaseOperations
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pragmas = {}
+        self.serialize_writes = True
+        self._holds_writer_lock = False
+        self._begin_pending = False
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = {**DEFAULT_PRAGMAS, **params.pop("pragmas", {})}
+        self.serialize_writes = params.pop("serialize_writes", True)
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        if not self.is_in_memory_db():
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=SQLiteCursorWrapper)
+        cursor.db = self
+        return cursor
+
+    def is_usable(self):
+        try:
+            self.connection.execute("SELECT 1")
+        except base.Database.Error:
+            return False
+        return True
+
+    @property
+    def writer_timeout(self):
+        # sqlite3.connect의 timeout(busy_timeout)과 같은 시간만큼 기다림
+        return self.settings_dict["OPTIONS"].get("timeout", 5)
+
+    def acquire_writer_lock(self):
+        if not self.serialize_writes or self._holds_writer_lock:
+            return False
+        if not get_writer_lock(self.settings_dict["NAME"]).acquire(timeout=self.writer_timeout):
+            raise base.Database.OperationalError("database is locked")
+        self._holds_writer_lock = True
+        return True
+
+    def release_writer_lock(self):
+        if self._holds_writer_lock:
+            self._holds_writer_lock = False
+            get_writer_lock(self.settings_dict["NAME"]).release()
+
+    def writing(self, sql):
+        return _WriteContext(self, sql)
+
+    def _start_transaction_under_autocommit(self):
+        # atomic() 진입 시에는 아무것도 실행하지 않고 첫 문장까지 BEGIN을 미룸
+        self._begin_pending = True
+
+    def begin_transaction(self, sql):
+        if is_write(sql):
+            self.acquire_writer_lock()
+            begin = "BEGIN IMMEDIATE"
+        else:
+            begin = "BEGIN"
+        try:
+            self.connection.execute(begin)
+        except Exception:
+            self.release_writer_lock()
+            raise
+        self._begin_pending = False
+
+    def end_transaction(self):
+        self._begin_pending = False
+        self.release_writer_lock()
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self.end_transaction()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self.end_transaction()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self.end_transaction()
+
+
+class _WriteContext:
+    # 미뤄 둔 BEGIN이 있으면 먼저 실행. 쓰기 문장이면 쓰기 잠금을 잡음
+    # 트랜잭션 안에서는 커밋/롤백까지 유지, autocommit이면 그 문장 하나 동안만
+    def __init__(self, db, sql):
+        self.db = db
+        self.sql = sql
+        self.acquired = False
+
+    def __enter__(self):
+        if self.db._begin_pending:
+            self.db.begin_transaction(self.sql)
+        elif is_write(self.sql):
+            self.acquired = self.db.acquire_writer_lock() and self.db.get_autocommit()
+
+    def __exit__(self, *exc_info):
+        if self.acquired:
+            self.db.release_writer_lock()
@@ -0,0 +1,25 @@
+import os
+
+from django.db.backends.sqlite3 import creation
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    # 테스트 DB를 지우고 다시 만들 때 WAL 파일(-wal, -shm)도 함께 지움
+    # 남아 있으면 같은 이름으로 새로 만든 DB에 이전 DB의 로그가 섞일 수 있음
+    def _create_test_db(self, verbosity, autoclobber, keepdb=False):
+        test_database_name = self._get_test_db_name()
+        if not keepdb and not self.is_in_memory_db(test_database_name):
+            remove_wal_files(test_database_name)
+        return super()._create_test_db(verbosity, autoclobber, keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        super()._destroy_test_db(test_database_name, verbosity)
+        if not self.is_in_memory_db(test_database_name):
+            remove_wal_files(test_database_name)
+
+
+def remove_wal_files(database_name):
+    for suffix in ("-wal", "-shm"):
+        path = f"{database_name}{suffix}"
+        if os.path.exists(path):
+            os.remove(path)
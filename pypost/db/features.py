@@ -0,0 +1,6 @@
+from django.db.backends.sqlite3 import features
+
+
+class DatabaseFeatures(features.DatabaseFeatures):
+    # SQLite에는 행 잠금이 없으므로 select_for_update()는 쓰기 잠금을 미리 잡는 용도로 지원 (operations.py)
+    has_select_for_update = True
@@ -0,0 +1,9 @@
+from django.db.backends.sqlite3 import operations
+
+# SELECT 끝에 붙는 표시. SQLite에는 주석일 뿐이고, 이 표시가 있는 문장은 쓰기처럼 잠금을 잡고 실행 (base.is_write)
+FOR_UPDATE_SQL = "/* FOR UPDATE */"
+
+
+class DatabaseOperations(operations.DatabaseOperations):
+    def for_update_sql(self, nowait=False, skip_locked=False, of=(), no_key=False):
+        return FOR_UPDATE_SQL
@@ -0,0 +1,126 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework.permissions import SAFE_METHODS
+
+DEFAULT_OPTIONS = {
+    "REPLICAS": [],  # 읽기 복제본으로 쓸 DATABASES 별칭. 비어 있으면 모든 쿼리가 default로
+    "PIN_SECONDS": 5,  # 쓰기가 있었던 유저의 읽기를 primary로 보내는 시간 (복제 지연보다 길게)
+}
+
+# 현재 요청(스레드/태스크)에서 복제본 읽기를 허용했는지, 쓰기가 있었는지
+_replica_reads = ContextVar("replica_reads", default=False)
+_wrote = ContextVar("wrote", default=False)
+
+
+def get_options():
+    return {**DEFAULT_OPTIONS, **getattr(settings, "READ_REPLICAS", {})}
+
+
+def pin_key(user_id):
+    return f"pypost:replica-pin:{user_id}"
+
+
+def pin_user(user):
+    # 방금 쓴 유저는 복제가 따라올 때까지 primary에서 읽음 (자신의 쓰기가 바로 보이도록)
+    if user.is_authenticated:
+        cache.set(pin_key(user.pk), True, get_options()["PIN_SECONDS"])
+
+
+def is_pinned(user):
+    return user.is_authenticated and cache.get(pin_key(user.pk)) is not None
+
+
+async def ais_pinned(user):
+    return user.is_authenticated and await cache.aget(pin_key(user.pk)) is not None
+
+
+def reading_replica():
+    return bool(get_options()["REPLICAS"]) and _replica_reads.get() and not _wrote.get()
+
+
+def cache_timeout(timeout):
+    # 복제본에서 읽은 결과는 복제 지연 동안의 옛 데이터일 수 있으므로 PIN_SECONDS보다 오래 캐시하지 않음
+    # (캐시 키의 버전 번호는 primary 커밋 시점에 이미 올라가 있어 복제 후에도 무효화되지 않음)
+    if not reading_replica():
+        return timeout
+    pin_seconds = get_options()["PIN_SECONDS"]
+    return pin_seconds if timeout is None else min(timeout, pin_seconds)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    # 복제본 읽기를 허용한 요청(ReplicaReadMixin)의 읽기만 복제본으로, 나머지는 모두 default(primary)
+    # 같은 요청 안에서 쓰기가 한 번이라도 있으면 이후 읽기도 primary
+    def db_for_read(self, model, **hints):
+        if reading_replica():
+            return random.choice(get_options()["REPLICAS"])
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 primary와 같은 데이터이므로 어느 쪽에서 읽은 객체끼리도 연결 가능
+        databases = {DEFAULT_DB_ALIAS, *get_options()["REPLICAS"]}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+@sync_and_async_middleware
+def replica_pinning_middleware(get_response):
+    # 요청마다 쓰기 여부를 새로 기록하고, 쓰기가 있었던 요청의 유저를 PIN_SECONDS 동안 primary에 고정
+    # request.user는 DRF 인증 후의 유저 (DRF Request가 HttpRequest.user도 함께 바꿈)
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            token = _wrote.set(False)
+            try:
+                response = await get_response(request)
+                if _wrote.get():
+                    await sync_to_async(pin_user)(request.user)
+                return response
+            finally:
+                _wrote.reset(token)
+    else:
+        def middleware(request):
+            token = _wrote.set(False)
+            try:
+                response = get_response(request)
+                if _wrote.get():
+                    pin_user(request.user)
+                return response
+            finally:
+                _wrote.reset(token)
+    return middleware
+
+
+class ReplicaReadMixin:
+    # GET 등 읽기 요청의 쿼리를 복제본으로 보냄
+    # 인증(토큰 조회)과 권한 확인은 primary에서 끝낸 뒤 전환 (방금 발급한 토큰이 복제 전이어도 인증되도록)
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned(request.user):
+            self._replica_reads_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_reads_token", None)
+        if token is not None:
+            _replica_reads.reset(token)
+            self._replica_reads_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
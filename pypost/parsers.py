@@ -0,0 +1,30 @@
+import io
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    # JSONParser를 orjson으로 (orjson이 없거나 UTF-8이 아닌 요청은 표준 json)
+    # NaN/Infinity는 JSONParser의 strict 모드와 같이 거부됨
+    # 64비트를 넘는 정수는 float으로 읽힘 (이 API에는 그런 값을 받는 필드가 없음. 미리 검사하면 파싱보다 느려짐)
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            data = stream.read()
+        except OSError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # 잘못된 입력은 표준 json으로 다시 읽어 JSONParser와 같은 오류 메시지를 냄
+            return super().parse(io.BytesIO(data), media_type, parser_context)
@@ -0,0 +1,36 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# datetime은 DRF JSONEncoder와 같게 UTC면 Z로 끝남. dict 키가 문자열이 아니어도 변환
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class ORJSONRenderer(JSONRenderer):
+    # JSONRenderer와 같은 출력을 orjson으로 만듦 (orjson이 없으면 표준 json)
+    # datetime, date, UUID는 orjson이 직접 변환하고 Decimal, lazy 문자열, QuerySet 등은 DRF JSONEncoder에 맡김
+    # 들여쓰기(브라우저블 API 등), ensure_ascii, 공백 구분자를 요청하면 표준 json으로 렌더링
+    encoder_default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            orjson is None
+            or not api_settings.UNICODE_JSON
+            or not api_settings.COMPACT_JSON
+            or self.get_indent(accepted_media_type or "", renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_default, option=ORJSON_OPTIONS)
+        except (orjson.JSONEncodeError, TypeError):
+            # 64비트를 넘는 정수 등 orjson이 변환하지 못하는 값 (오류도 표준 json과 같게)
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer와 같이 U+2028, U+2029는 이스케이프 (<script> 안에 넣어도 안전하도록)
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
@@ -0,0 +1,221 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.storage import default_storage
+from django.db.models import Prefetch
+from django.db.models.fields.related_descriptors import _filter_prefetch_queryset
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.generics import get_object_or_404
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from images.processing import renditions_field
+from images.serializers import RenditionsField, rendition_urls
+
+
+class Unsupported(Exception):
+    # 행 튜플로 만들 수 없는 필드 (SerializerMethodField, 모델 속성 등). 뷰는 기존 serializer 경로로 처리
+    pass
+
+
+class RowSerializer:
+    # 필드 선택까지 끝난 ModelSerializer와 뷰의 쿼리셋을 values_list 컬럼 + 필드별 변환 함수로 컴파일
+    # 모델 인스턴스를 만들지 않고 행 튜플에서 바로 dict를 만듦. 결과는 serializer.data와 같음
+    # - 일반 필드: 모델 인스턴스의 속성과 같은 값(DB 변환기 적용)을 DRF 필드의 to_representation에 그대로 넘김
+    # - 정방향 FK의 중첩 serializer(profile): join 컬럼 (profile__nickname 등)
+    # - 쿼리셋에서 prefetch한 관계(likes, preview_comments): 같은 Prefetch 조건으로 관계마다 한 번씩 조회
+    def __init__(self, serializer, queryset, extra_columns=()):
+        self.request = serializer.context.get("request")
+        self.columns = {}  # 컬럼 이름 → 행 튜플의 위치
+        self.loaders = []  # 부모 pk 목록을 받아 관계 필드 값을 채우는 함수
+        self.urls = {}
+        self.prefetches = {
+            lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup: lookup
+            for lookup in queryset._prefetch_related_lookups
+        }
+        self.fields = self.compile(serializer, queryset.model, "", queryset)
+        for name in extra_columns:
+            self.column(name)
+
+    def values(self, queryset):
+        # 커서 페이지네이션이 행에서 정렬 기준 값을 getattr로 읽으므로 named tuple
+        return queryset.prefetch_related(None).values_list(*self.columns, named=True)
+
+    def serialize(self, rows):
+        rows = list(rows)
+        if self.loaders and rows:
+            ids = [row[self.columns["pk"]] for row in rows]
+            for load in self.loaders:
+                load(ids)
+        return [self.to_representation(self.fields, row) for row in rows]
+
+    def to_representation(self, fields, row):
+        return {name: getter(row) for name, getter in fields}
+
+    def column(self, name):
+        return self.columns.setdefault(name, len(self.columns))
+
+    def file_url(self, storage, name):
+        # 같은 이미지(default.png 등)가 반복되므로 URL 변환 결과를 재사용
+        key = (storage, name)
+        url = self.urls.get(key)
+        if url is None:
+            url = storage.url(name)
+            if self.request is not None:
+                url = self.request.build_absolute_uri(url)
+            self.urls[key] = url
+        return url
+
+    def compile(self, serializer, model, prefix, queryset=None):
+        return [
+            (field.field_name, self.compile_field(field, model, prefix, queryset))
+            for field in serializer._readable_fields
+        ]
+
+    def compile_field(self, field, model, prefix, queryset):
+        if isinstance(field, RenditionsField):
+            image = self.column(prefix + field.image_field)
+            renditions = self.column(prefix + renditions_field(field.image_field))
+            url = lambda name: self.file_url(default_storage, name)  # noqa: E731
+            return lambda row: rendition_urls(row[image], row[renditions], url)
+        if isinstance(field, (serializers.ListSerializer, ManyRelatedField)):
+            if queryset is None:
+                raise Unsupported(field.field_name)
+            return self.compile_relation(field, model)
+
+        source = field.source
+        if source == "*" or "." in source:
+            raise Unsupported(field.field_name)
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            model_field = None
+
+        if model_field is None or not model_field.concrete:
+            # annotate 값 (is_liked). 없으면 DRF와 같이 default 사용
+            if queryset is not None and source in queryset.query.annotations:
+                return self.compile_value(field, source)
+            if field.default is empty:
+                raise Unsupported(field.field_name)
+            return lambda row: field.to_representation(field.get_default())
+        if isinstance(field, serializers.BaseSerializer):
+            if not model_field.is_relation:
+                raise Unsupported(field.field_name)
+            fk = self.column(prefix + source)
+            fields = self.compile(field, model_field.related_model, f"{prefix}{source}__")
+            return lambda row: None if row[fk] is None else self.to_representation(fields, row)
+        if isinstance(field, PrimaryKeyRelatedField):
+            # FK 컬럼 값(post_id 등)이 곧 pk
+            return self.compile_pk(field, prefix + source)
+        if model_field.is_relation:
+            raise Unsupported(field.field_name)
+        if isinstance(field, serializers.FileField):
+            return self.compile_file(field, model_field, prefix + source)
+        return self.compile_value(field, prefix + source)
+
+    def compile_value(self, field, name):
+        index = self.column(name)
+        to_representation = field.to_representation
+        return lambda row: None if row[index] is None else to_representation(row[index])
+
+    def compile_pk(self, field, name):
+        index = self.column(name)
+        if field.pk_field is None:
+            return lambda row: row[index]
+        to_representation = field.pk_field.to_representation
+        return lambda row: None if row[index] is None else to_representation(row[index])
+
+    def compile_file(self, field, model_field, name):
+        # FileField.to_representation과 같음: 빈 값은 None, use_url이면 (절대) URL, 아니면 파일 이름
+        index = self.column(name)
+        if not getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+            return lambda row: row[index] or None
+        storage = model_field.storage
+        return lambda row: self.file_url(storage, row[index]) if row[index] else None
+
+    def compile_relation(self, field, model):
+        # Django의 prefetch와 같은 쿼리(잘린 쿼리셋은 ROW_NUMBER 창 함수)로 부모 pk별 값 목록을 채움
+        prefetch = self.prefetches.get(field.source)
+        if prefetch is None:
+            raise Unsupported(field.field_name)
+        relation = model._meta.get_field(prefetch.prefetch_through)
+        if relation.many_to_many and relation.concrete:
+            key = relation.related_query_name()
+        elif relation.one_to_many:
+            key = relation.field.name
+        else:
+            raise Unsupported(field.field_name)
+        related_queryset = prefetch.queryset
+        if related_queryset is None:
+            related_queryset = relation.related_model._default_manager.all()
+
+        if isinstance(field, ManyRelatedField):
+            # pk 목록 (PrimaryKeyRelatedField(many=True))
+            child = None
+            columns = {key: 0, "pk": 1}
+            pk_field = field.child_relation.pk_field
+            to_value = (lambda row: row[1]) if pk_field is None else (lambda row: pk_field.to_representation(row[1]))
+        else:
+            child = RowSerializer(field.child, related_queryset, extra_columns=[key])
+            columns = child.columns
+
+        related = {}
+        pk = self.column("pk")
+
+        def load(ids):
+            related.clear()
+            # _filter_prefetch_queryset은 잘린 쿼리셋의 limit을 직접 지우므로 복제본에 적용
+            queryset = _filter_prefetch_queryset(related_queryset.all()._next_is_sticky(), key, ids)
+            rows = list(queryset.values_list(*columns))
+            values = child.serialize(rows) if child is not None else [to_value(row) for row in rows]
+            index = columns[key]
+            for row, value in zip(rows, values):
+                related.setdefault(row[index], []).append(value)
+
+        self.loaders.append(load)
+        return lambda row: related.get(row[pk], [])
+
+
+class RowSerializationMixin:
+    # list/retrieve(GET) 응답을 RowSerializer로 만듦. 지원하지 않는 필드가 있으면 기존 serializer 경로
+    # (이때는 필터를 한 번 더 적용하게 되지만 지원 여부는 쿼리셋의 prefetch/annotate를 봐야 알 수 있음)
+    # 캐시/조건부 응답 믹스인보다 뒤(뷰셋 클래스 바로 앞)에 둠
+    row_serialization = True
+    count_queryset = None
+
+    def get_row_serializer(self, queryset):
+        ordering = getattr(self.paginator, "ordering", None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        try:
+            return RowSerializer(
+                self.get_serializer(), queryset, extra_columns=[name.lstrip("-") for name in ordering]
+            )
+        except Unsupported:
+            return None
+
+    def list(self, request, *args, **kwargs):
+        if not self.row_serialization:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.get_row_serializer(queryset)
+        if rows is None:
+            return super().list(request, *args, **kwargs)
+        self.count_queryset = queryset
+        queryset = rows.values(queryset)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.serialize(page))
+        return Response(rows.serialize(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.row_serialization:
+            return super().retrieve(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.get_row_serializer(queryset)
+        if rows is None:
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(rows.values(queryset), **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(request, row)
+        return Response(rows.serialize([row])[0])
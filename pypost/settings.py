@@ -45,16 +45,19 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     'users',
-    'posts'
+    'posts',
+    'images',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', # 순서 중요
+    'pypost.compression.compression_middleware', # 응답 본문을 바꾸는 미들웨어보다 앞에 둠
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'pypost.db.replicas.replica_pinning_middleware', # 쓰기가 있었던 유저의 읽기를 잠시 primary로
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -88,8 +91,57 @@ WSGI_APPLICATION = 'pypost.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        # django.db.backends.sqlite3 + WAL 등 PRAGMA, 첫 쓰기에서 BEGIN IMMEDIATE와 프로세스 내 쓰기 직렬화 (pypost/db/base.py)
+        'ENGINE': 'pypost.db',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 요청마다 다시 연결하지 않고 재사용, 재사용 전 연결 상태 확인
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,  # 잠금 대기 시간 (busy_timeout, 쓰기 직렬화 대기), 초
+            # 'pragmas': {'synchronous': 'full'},  # 기본 PRAGMA(pypost.db.base.DEFAULT_PRAGMAS) 덮어쓰기
+        },
+        # 여러 스레드가 같은 DB를 보도록 테스트 DB도 파일로 생성 (동시성 테스트)
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    },
+    # 읽기 복제본 자리 (READ_REPLICAS['REPLICAS']에 넣어야 사용됨)
+    # 로컬/테스트에서는 별도 SQLite 파일이 복제본 역할. 운영에서는 복제 중인 DB의 접속 정보로 바꿈
+    'replica': {
+        'ENGINE': 'pypost.db',
+        'NAME': BASE_DIR / 'db_replica.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+        },
+        'TEST': {
+            'NAME': BASE_DIR / 'test_replica.sqlite3',
+        },
+    },
+}
+
+# 읽기 복제본 라우팅 (pypost.db.replicas)
+# PostViewSet, CommentViewSet, ProfileView, /async/ 뷰의 GET 요청 쿼리만 REPLICAS 중 하나로 보냄
+# 쓰기와 같은 요청에서 쓰기 이후의 읽기, 쓰기 후 PIN_SECONDS 동안의 그 유저 요청은 default(primary)
+DATABASE_ROUTERS = ['pypost.db.replicas.ReplicaRouter']
+READ_REPLICAS = {
+    'REPLICAS': [],  # 예: ['replica']
+    'PIN_SECONDS': 5,
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000, # 초과 시 CULL_FREQUENCY 비율만큼 제거
+        },
     }
 }
 
@@ -140,11 +192,69 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # rest-framework 설정
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'users.authentication.CachedTokenAuthentication',
+    ],
+    # JSON 렌더링/파싱은 orjson으로 (pypost.renderers, pypost.parsers. orjson이 없으면 표준 json)
+    # DRF 기본값으로 되돌리려면 rest_framework.renderers.JSONRenderer, rest_framework.parsers.JSONParser
+    'DEFAULT_RENDERER_CLASSES': [
+        'pypost.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'pypost.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_FILTER_BACKENDS':[
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
     'DEFAULT_PAGINATION_CLASS':'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE':3,
-}
\ No newline at end of file
+}
+
+# 토큰 인증 캐시 설정 (users.authentication.CachedTokenAuthentication)
+# SHARED_CACHE에 CACHES alias를 지정하면 프로세스 간에도 조회 결과를 공유
+TOKEN_AUTH_CACHE = {
+    'MAX_SIZE': 1024,
+    'TIMEOUT': 60,
+    'SHARED_CACHE': None,
+    'SHARED_TIMEOUT': 300,
+}
+
+# 업로드 이미지 리사이즈 설정 (images.processing)
+# BACKEND가 'thread'면 커밋 직후 스레드 풀에서 처리, 'db'면 process_images 워커만 처리
+IMAGE_PIPELINE = {
+    'BACKEND': 'thread',
+    'WORKERS': 2,
+    'FORMAT': 'WEBP',
+    'QUALITY': 80,
+}
+
+# 게시글 검색 백엔드 (posts.search). None이면 DB 종류에 맞춰 선택
+# sqlite: FTS5 + bm25, postgresql: tsvector + GIN, 그 외: 인덱스 없는 icontains
+SEARCH_BACKEND = None
+
+# 홈 타임라인 설정 (posts.timeline)
+# 팔로워가 CELEBRITY_FOLLOWERS 이상인 작성자의 글은 배포하지 않고 /timeline/ 조회 시 합침
+TIMELINE = {
+    'BACKEND': 'thread',
+    'MAX_LENGTH': 500,
+    'CELEBRITY_FOLLOWERS': 10000,
+}
+
+# 댓글 실시간 스트림 설정 (posts.events, /posts/<id>/comments/stream/)
+# 'memory' 버스는 같은 프로세스의 구독자에게만 전달하므로 ASGI 워커 1개로 실행하거나 공유 백엔드를 지정
+COMMENT_STREAM = {
+    'BACKEND': 'memory',
+    'BUFFER_SIZE': 100,
+    'HISTORY_SIZE': 1000,
+    'HEARTBEAT': 15,
+}
+
+# 응답 압축 (pypost.compression). br/zstd는 brotli/zstandard 패키지가 설치되어 있을 때만 사용
+# 엔드포인트별 압축 전/후 크기는 pypost.compression.get_compression_stats()로 확인
+COMPRESSION = {
+    'ENCODINGS': ['br', 'zstd', 'gzip'],
+    'MIN_SIZE': 1024,
+    'PAYLOAD_BUDGET': None, # 예: 256 * 1024 (넘으면 경고 로그)
+}
@@ -0,0 +1,495 @@
+import asyncio
+import datetime
+import decimal
+import gzip
+import io
+import uuid
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from posts.models import Post, Comment
+from posts.serializers import PostSerializer
+from users.models import Profile
+from users.serializers import ProfileSerializer
+from pypost import compression, parsers, renderers
+from pypost.rows import RowSerializationMixin, RowSerializer, Unsupported
+from pypost.db import replicas
+from pypost.db.base import get_writer_lock, is_write
+
+
+class DatabaseBackendTest(TestCase):
+    def query(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchone()[0]
+
+    def test_pragmas(self):
+        self.assertEqual(self.query("PRAGMA journal_mode"), "wal")
+        self.assertEqual(self.query("PRAGMA synchronous"), 1)  # NORMAL
+        self.assertEqual(self.query("PRAGMA busy_timeout"), connection.settings_dict["OPTIONS"]["timeout"] * 1000)
+        self.assertEqual(self.query("PRAGMA cache_size"), -20000)
+        self.assertGreater(self.query("PRAGMA mmap_size"), 0)
+
+    def test_health_check(self):
+        self.assertTrue(connection.is_usable())
+
+    def test_is_write(self):
+        for sql in [
+            "INSERT INTO t VALUES (1)",
+            " update t SET x = 1",
+            "WITH a AS (SELECT 1) UPDATE t SET x = 1",
+            "CREATE INDEX i ON t (x)",
+            "DROP TABLE t",
+            "ALTER TABLE t ADD COLUMN y",
+        ]:
+            self.assertTrue(is_write(sql), sql)
+        for sql in ["SELECT 1", 'WITH a AS (SELECT "update" FROM t) SELECT * FROM a', "SAVEPOINT s"]:
+            self.assertFalse(is_write(sql), sql)
+
+
+class SerializedWriteTest(TransactionTestCase):
+    def setUp(self):
+        user = User.objects.create_user(username = "writer", password = "testpw!!")
+        self.post = Post.objects.create(author = user, profile = user.profile, title = "t", body = "b")
+        self.lock = get_writer_lock(connection.settings_dict["NAME"])
+
+    def increase(self, times, errors):
+        try:
+            for _ in range(times):
+                # 읽은 뒤 쓰는 트랜잭션: select_for_update로 읽어 잠금부터 잡음
+                # (그냥 읽으면 그 사이 다른 커밋이 있을 때 잠금 승격 실패(database is locked))
+                with transaction.atomic():
+                    like_count = Post.objects.select_for_update().values_list("like_count", flat = True).get(pk = self.post.pk)
+                    Post.objects.filter(pk = self.post.pk).update(like_count = like_count + 1)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    def test_concurrent_read_modify_write(self):
+        errors = []
+        threads = [threading.Thread(target = self.increase, args = (20, errors)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 160)
+        self.assertFalse(self.lock.locked())
+
+    def test_lock_taken_on_first_write(self):
+        with transaction.atomic():
+            self.assertFalse(self.lock.locked())
+            Post.objects.get(pk = self.post.pk)
+            self.assertFalse(self.lock.locked())
+            Post.objects.filter(pk = self.post.pk).update(title = "changed")
+            self.assertTrue(self.lock.locked())
+        self.assertFalse(self.lock.locked())
+        with transaction.atomic():
+            Post.objects.select_for_update().get(pk = self.post.pk)
+            self.assertTrue(self.lock.locked())
+        self.assertFalse(self.lock.locked())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, "changed")
+
+    def test_lock_released_after_rollback(self):
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                Post.objects.filter(pk = self.post.pk).update(title = "changed")
+                self.assertTrue(self.lock.locked())
+                raise ValueError
+        self.assertFalse(self.lock.locked())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, "t")
+
+
+@override_settings(READ_REPLICAS = {"REPLICAS": ["replica"], "PIN_SECONDS": 60})
+class ReplicaRoutingTest(TransactionTestCase):
+    # 복제본은 별도 SQLite 파일(test_replica.sqlite3). replicate()를 호출할 때만 primary 내용이 복사됨
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username = "writer", password = "testpw!!")
+        self.token = Token.objects.create(user = self.user)
+        self.post = Post.objects.create(author = self.user, profile = self.user.profile, title = "t", body = "b")
+        self.replicate()
+
+    def replicate(self):
+        # 복제 흉내: primary 파일 전체를 복제본 파일로 복사
+        for alias in ("default", "replica"):
+            connections[alias].ensure_connection()
+        connections["default"].connection.backup(connections["replica"].connection)
+
+    def post_titles(self, client):
+        return [post["title"] for post in client.get("/posts/").data["results"]]
+
+    @override_settings(READ_REPLICAS = {"REPLICAS": ["replica"], "PIN_SECONDS": 0.5})
+    def test_reads_go_to_replica(self):
+        Post.objects.create(author = self.user, profile = self.user.profile, title = "new", body = "b")
+        self.assertEqual(self.post_titles(APIClient()), ["t"])
+        self.assertEqual(APIClient().get(f"/posts/{self.post.id + 1}/").status_code, 404)
+        self.replicate()
+        # 복제본에서 읽어 캐시한 응답은 PIN_SECONDS 후 만료
+        self.assertEqual(self.post_titles(APIClient()), ["t"])
+        time.sleep(0.6)
+        self.assertEqual(self.post_titles(APIClient()), ["new", "t"])
+
+    def test_profile_reads_go_to_replica(self):
+        other = User.objects.create_user(username = "other", password = "testpw!!")
+        self.assertEqual(APIClient().get(f"/user/profile/{other.profile.pk}/").status_code, 404)
+        self.replicate()
+        self.assertEqual(APIClient().get(f"/user/profile/{other.profile.pk}/").status_code, 200)
+
+    def test_writer_reads_own_writes(self):
+        self.client.credentials(HTTP_AUTHORIZATION = f"Token {self.token.key}")
+        response = self.client.post("/comments/", {"post": self.post.id, "text": "mine"}, format = "json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Comment.objects.using("replica").count(), 0)
+
+        response = self.client.get(f"/comments/?post={self.post.id}")
+        self.assertEqual([comment["text"] for comment in response.data["results"]], ["mine"])
+        self.assertEqual(APIClient().get(f"/comments/?post={self.post.id}").data["results"], [])
+
+        # 고정 시간이 지나면 다시 복제본에서 읽음
+        cache.delete(replicas.pin_key(self.user.pk))
+        self.assertEqual(self.client.get(f"/comments/?post={self.post.id}").data["results"], [])
+
+    def test_authentication_uses_primary(self):
+        # 복제 전에 발급된 토큰으로도 인증됨
+        other = User.objects.create_user(username = "other", password = "testpw!!")
+        token = Token.objects.create(user = other)
+        self.client.credentials(HTTP_AUTHORIZATION = f"Token {token.key}")
+        response = self.client.get("/posts/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.post_titles(self.client), ["t"])
+
+    def test_reads_after_write_in_same_request(self):
+        router = replicas.ReplicaRouter()
+        with replicas.replica_reads():
+            token = replicas._wrote.set(False)
+            try:
+                self.assertEqual(router.db_for_read(Post), "replica")
+                self.assertEqual(router.db_for_write(Post), "default")
+                self.assertEqual(router.db_for_read(Post), "default")
+            finally:
+                replicas._wrote.reset(token)
+        self.assertEqual(router.db_for_read(Post), "default")
+
+    def test_unsafe_requests_use_primary(self):
+        # 수정 요청의 조회(get_object, 검증)는 복제 전 데이터라도 primary에서
+        post = Post.objects.create(author = self.user, profile = self.user.profile, title = "new", body = "b")
+        self.client.credentials(HTTP_AUTHORIZATION = f"Token {self.token.key}")
+        response = self.client.patch(f"/posts/{post.id}/", {"title": "changed"}, format = "json")
+        self.assertEqual(response.status_code, 200)
+        post.refresh_from_db()
+        self.assertEqual(post.title, "changed")
+
+    def test_async_views(self):
+        Post.objects.create(author = self.user, profile = self.user.profile, title = "new", body = "b")
+
+        async def titles():
+            response = await AsyncClient().get("/async/posts/")
+            return [post["title"] for post in response.json()["results"]]
+
+        self.assertEqual(asyncio.run(titles()), ["t"])
+        self.replicate()
+        self.assertEqual(asyncio.run(titles()), ["new", "t"])
+
+    def test_async_writer_reads_own_writes(self):
+        # ASGI에서도 sync 뷰의 쓰기가 미들웨어까지 전달되어 고정됨
+        async def write_then_read():
+            client = AsyncClient()
+            headers = {"Authorization": f"Token {self.token.key}"}
+            response = await client.post(
+                "/comments/", {"post": self.post.id, "text": "mine"}, content_type = "application/json", headers = headers,
+            )
+            self.assertEqual(response.status_code, 201)
+            response = await client.get(f"/async/comments/?post={self.post.id}", headers = headers)
+            return [comment["text"] for comment in response.json()["results"]]
+
+        self.assertEqual(asyncio.run(write_then_read()), ["mine"])
+
+    def test_without_replicas(self):
+        Post.objects.create(author = self.user, profile = self.user.profile, title = "new", body = "b")
+        with override_settings(READ_REPLICAS = {"REPLICAS": []}):
+            self.assertEqual(self.post_titles(APIClient()), ["new", "t"])
+
+
+class JSONRenderingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username = "writer", password = "testpw!!")
+        for i in range(3):
+            post = Post.objects.create(author = self.user, profile = self.user.profile, title = f"제목{i}", body = "본문\u2028")
+            post.likes.add(self.user)
+            Comment.objects.create(author = self.user, profile = self.user.profile, post = post, text = "댓글")
+
+    def assertSameRendering(self, data, **kwargs):
+        self.assertEqual(renderers.ORJSONRenderer().render(data, **kwargs), JSONRenderer().render(data, **kwargs))
+
+    def test_same_output_as_json_renderer(self):
+        posts = PostSerializer.setup_eager_loading(Post.objects.order_by("-id"))
+        self.assertSameRendering(PostSerializer(posts, many = True).data)
+        self.assertSameRendering({
+            "aware": timezone.now(),
+            "utc": datetime.datetime(2024, 1, 1, tzinfo = datetime.timezone.utc),
+            "naive": datetime.datetime(2024, 1, 1, 12, 30, 15, 123456),
+            "date": datetime.date(2024, 1, 1),
+            "uuid": uuid.uuid4(),
+            "decimal": decimal.Decimal("1.50"),
+            "lazy": gettext_lazy("Not found."),
+            "queryset": Post.objects.values_list("id", flat = True),
+            "keys": {1: "int key"},
+            "big": 2 ** 70,
+        })
+        self.assertEqual(renderers.ORJSONRenderer().render(None), b"")
+
+    def test_fallback_to_json(self):
+        data = {"title": "제목", "count": 1}
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertSameRendering(data)
+        # 들여쓰기 요청은 표준 json으로
+        self.assertSameRendering(data, accepted_media_type = "application/json; indent=4")
+        with override_settings(REST_FRAMEWORK = {"UNICODE_JSON": False}):
+            self.assertSameRendering(data)
+
+    def parse(self, parser, body):
+        try:
+            return parser.parse(io.BytesIO(body), "application/json", {})
+        except ParseError as exc:
+            return str(exc)
+
+    def test_same_result_as_json_parser(self):
+        for body in [
+            '{"title": "제목", "ids": [1, 2.5, null, true]}'.encode(),
+            b'{"like_count": NaN}',
+            b'{"title": ',
+            b"",
+        ]:
+            self.assertEqual(self.parse(parsers.ORJSONParser(), body), self.parse(JSONParser(), body))
+        with mock.patch.object(parsers, "orjson", None):
+            self.assertEqual(self.parse(parsers.ORJSONParser(), b'{"a": 1}'), {"a": 1})
+
+    def test_api(self):
+        client = APIClient()
+        client.force_authenticate(user = self.user)
+        post = Post.objects.first()
+        response = client.post("/comments/", '{"post": %d, "text": "새 댓글"}' % post.id, content_type = "application/json")
+        self.assertEqual(response.status_code, 201)
+        response = client.post("/comments/", '{"post": ', content_type = "application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data["detail"].startswith("JSON parse error"))
+
+        response = APIClient().get("/posts/")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+
+class RowSerializationTest(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username = f"user{i}", password = "testpw!!") for i in range(3)]
+        Profile.objects.filter(pk = self.users[0].pk).update(
+            nickname = "닉네임", position = "backend", image = "profile/me.png",
+            image_renditions = {"source": "profile/me.png", "thumbnail": "profile/me_thumbnail.webp"},
+        )
+        self.token = Token.objects.create(user = self.users[0])
+        self.posts = []
+        for i in range(5):
+            author = self.users[i % 2]
+            post = Post.objects.create(
+                author = author, profile = author.profile, title = f"제목{i}",
+                category = "backend" if i % 2 else "frontend", body = "본문",
+            )
+            for user in self.users[:i % 3 + 1]:
+                post.likes.add(user)
+            for j in range(i):
+                user = self.users[j % 3]
+                Comment.objects.create(author = user, profile = user.profile, post = post, text = f"댓글{j}")
+            self.posts.append(post)
+        # 이미지 처리가 끝난 게시글과 처리 전(다른 이미지의 결과가 남은) 게시글
+        Post.objects.filter(pk = self.posts[0].pk).update(
+            image = "post/a.jpg", image_renditions = {"source": "post/a.jpg", "feed": "post/a_feed.webp"},
+        )
+        Post.objects.filter(pk = self.posts[1].pk).update(
+            image = "post/b.jpg", image_renditions = {"source": "post/old.jpg", "feed": "post/old_feed.webp"},
+        )
+
+    def get(self, url, client):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        return response, len(context.captured_queries)
+
+    def assertSameResponse(self, url, client = None):
+        client = client or APIClient()
+        self.get(url, client)  # 토큰 캐시 등 첫 요청에만 있는 쿼리 제외
+        response, queries = self.get(url, client)
+        with mock.patch.object(RowSerializationMixin, "row_serialization", False):
+            expected, expected_queries = self.get(url, client)
+        self.assertEqual(response.status_code, expected.status_code, url)
+        self.assertEqual(response.content, expected.content, url)
+        self.assertEqual(queries, expected_queries, url)
+        return response
+
+    def test_posts(self):
+        authenticated = APIClient()
+        authenticated.credentials(HTTP_AUTHORIZATION = f"Token {self.token.key}")
+        for client in (APIClient(), authenticated):
+            response = self.assertSameResponse("/posts/?page_size=2", client)
+            self.assertSameResponse(response.data["next"], client)
+            for url in [
+                "/posts/",
+                "/posts/?category=backend",
+                "/posts/?fields=id,title,likes",
+                "/posts/?omit=comments,profile",
+                "/posts/?fields=is_liked",
+                f"/posts/{self.posts[0].id}/",
+                f"/posts/{self.posts[4].id}/?omit=body",
+                "/posts/0/",
+            ]:
+                self.assertSameResponse(url, client)
+
+    def test_comments(self):
+        response = self.assertSameResponse("/comments/?page_size=3")
+        self.assertSameResponse(response.data["next"])
+        for url in [
+            f"/comments/?post={self.posts[4].id}",
+            "/comments/?fields=id,post",
+            "/comments/?omit=profile",
+            f"/comments/{Comment.objects.first().id}/",
+            "/comments/0/",
+        ]:
+            self.assertSameResponse(url)
+
+    def test_profile(self):
+        for user in self.users[:2]:
+            self.assertSameResponse(f"/user/profile/{user.pk}/")
+        self.assertSameResponse("/user/profile/0/")
+
+    def test_unsupported_field(self):
+        class MethodFieldSerializer(ProfileSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta(ProfileSerializer.Meta):
+                fields = ProfileSerializer.Meta.fields + ["label"]
+
+            def get_label(self, obj):
+                return obj.nickname
+
+        with self.assertRaises(Unsupported):
+            RowSerializer(MethodFieldSerializer(), Profile.objects.all())
+
+
+class CompressionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username = "writer", password = "testpw!!")
+        for i in range(10):
+            post = Post.objects.create(author = self.user, profile = self.user.profile, title = f"제목{i}", body = "본문입니다. " * 50)
+            Comment.objects.create(author = self.user, profile = self.user.profile, post = post, text = "댓글")
+        self.post = post
+        compression.reset_compression_stats()
+
+    def compress(self, response, accept_encoding = "gzip"):
+        request = RequestFactory().get("/", headers = {"Accept-Encoding": accept_encoding})
+        return compression.compression_middleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        plain = self.client.get("/posts/")
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        response = self.client.get("/posts/", headers = {"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+        stats = compression.get_compression_stats()["post-list"]
+        self.assertEqual(stats["responses"], 2)
+        self.assertEqual(stats["compressed"], 1)
+        self.assertEqual(stats["bytes"], 2 * len(plain.content))
+        self.assertEqual(stats["compressed_bytes"], len(plain.content) + len(response.content))
+        self.assertEqual(stats["max_bytes"], len(plain.content))
+
+    def test_weak_etag(self):
+        url = f"/posts/{self.post.id}/"
+        response = self.client.get(url, headers = {"Accept-Encoding": "gzip"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        response = self.client.get(url, headers = {"Accept-Encoding": "gzip", "If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_negotiate(self):
+        encodings = ("br", "zstd", "gzip")
+        self.assertEqual(compression.negotiate("gzip, deflate, br, zstd", encodings), "br")
+        self.assertEqual(compression.negotiate("gzip;q=1.0, br;q=0.5", encodings), "gzip")
+        self.assertEqual(compression.negotiate("br;q=0, *", encodings), "zstd")
+        self.assertEqual(compression.negotiate("GZIP", ("gzip",)), "gzip")
+        self.assertIsNone(compression.negotiate("identity", encodings))
+        self.assertIsNone(compression.negotiate("gzip;q=0", encodings))
+        self.assertIsNone(compression.negotiate("", encodings))
+        # 라이브러리가 없는 인코딩은 제외
+        with mock.patch.dict(compression.COMPRESSORS, {"br": None, "zstd": None}):
+            options = compression.get_options()
+            self.assertEqual(compression.available_encodings(options), ("gzip",))
+
+    def test_skip(self):
+        body = b"a" * 2000
+        self.assertEqual(self.compress(HttpResponse(body))["Content-Encoding"], "gzip")
+        self.assertFalse(self.compress(HttpResponse(b"a" * 100)).has_header("Content-Encoding"))
+        self.assertFalse(self.compress(HttpResponse(body), "identity").has_header("Content-Encoding"))
+        for content_type in ["image/png", "application/zip", "text/event-stream"]:
+            response = self.compress(HttpResponse(body, content_type = content_type))
+            self.assertFalse(response.has_header("Content-Encoding"))
+        response = HttpResponse(body, headers = {"Content-Encoding": "br"})
+        self.assertEqual(self.compress(response).content, body)
+        with override_settings(COMPRESSION = {"MIN_SIZE": 10}):
+            self.assertEqual(self.compress(HttpResponse(b"a" * 100))["Content-Encoding"], "gzip")
+
+    def test_streaming(self):
+        chunks = [f"line {i}\n".encode() for i in range(500)]
+        response = self.compress(StreamingHttpResponse(chunks, headers = {"Content-Length": "10"}))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), b"".join(chunks))
+        stats = compression.get_compression_stats()["/"]
+        self.assertEqual(stats["bytes"], len(b"".join(chunks)))
+
+        async def achunks():
+            for chunk in chunks:
+                yield chunk
+
+        async def read(response):
+            return b"".join([chunk async for chunk in response.streaming_content])
+
+        response = self.compress(StreamingHttpResponse(achunks()))
+        self.assertEqual(gzip.decompress(asyncio.run(read(response))), b"".join(chunks))
+
+    def test_event_stream_is_not_compressed(self):
+        response = self.client.get(f"/posts/{self.post.id}/comments/stream/", headers = {"Accept-Encoding": "gzip"})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"retry:"))
+
+    def test_payload_budget(self):
+        with override_settings(COMPRESSION = {"PAYLOAD_BUDGET": 1000}):
+            with self.assertLogs("pypost.compression", "WARNING") as logs:
+                self.client.get("/posts/", headers = {"Accept-Encoding": "gzip"})
+        self.assertIn("post-list", logs.output[0])
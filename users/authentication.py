@@ -0,0 +1,190 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+
+
+class TokenCache:
+    # 토큰 -> (토큰, 유저) 조회 결과를 프로세스 내 LRU(+선택적으로 공유 캐시)에 보관
+    def __init__(self, max_size=1024, timeout=60, shared_cache=None, shared_timeout=300):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.shared_cache = shared_cache
+        self.shared_timeout = shared_timeout
+        self._entries = OrderedDict()
+        self._user_keys = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        options = getattr(settings, "TOKEN_AUTH_CACHE", {})
+        return cls(
+            max_size=options.get("MAX_SIZE", 1024),
+            timeout=options.get("TIMEOUT", 60),
+            shared_cache=options.get("SHARED_CACHE"),
+            shared_timeout=options.get("SHARED_TIMEOUT", 300),
+        )
+
+    def _shared_key(self, key):
+        # 토큰 원문을 캐시 키로 남기지 않음
+        return "pypost:token:" + hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        token = self._get_local(key)
+        if token is None and self.shared_cache:
+            token = caches[self.shared_cache].get(self._shared_key(key))
+            if token is not None:
+                self._store(key, token)
+        return token
+
+    async def aget(self, key):
+        # async 뷰용. 공유 캐시는 async 캐시 API로 조회
+        token = self._get_local(key)
+        if token is None and self.shared_cache:
+            token = await caches[self.shared_cache].aget(self._shared_key(key))
+            if token is not None:
+                self._store(key, token)
+        return token
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                token, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return token
+                self._remove(key)
+        return None
+
+    def set(self, key, token):
+        self._store(key, token)
+        if self.shared_cache:
+            caches[self.shared_cache].set(self._shared_key(key), token, self.shared_timeout)
+
+    async def aset(self, key, token):
+        self._store(key, token)
+        if self.shared_cache:
+            await caches[self.shared_cache].aset(self._shared_key(key), token, self.shared_timeout)
+
+    def _store(self, key, token):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (token, time.monotonic() + self.timeout)
+            self._user_keys.setdefault(token.user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._user_keys.get(entry[0].user_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._user_keys[entry[0].user_id]
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+        if self.shared_cache:
+            caches[self.shared_cache].delete(self._shared_key(key))
+
+    def delete_user(self, user_id):
+        with self._lock:
+            keys = set(self._user_keys.get(user_id, ()))
+            for key in keys:
+                self._remove(key)
+        if self.shared_cache:
+            keys |= set(Token.objects.filter(user_id=user_id).values_list("key", flat=True))
+            caches[self.shared_cache].delete_many([self._shared_key(key) for key in keys])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._user_keys.clear()
+
+
+token_cache = TokenCache.from_settings()
+
+
+def _detached(token):
+    # 요청 간에 같은 인스턴스(관계 캐시 포함)를 공유하지 않도록 복사본 사용
+    token = copy.copy(token)
+    token.user = copy.copy(token.user)
+    return token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    # TokenAuthentication과 동일하게 동작하되, 캐시가 채워진 뒤에는 인증에 DB 조회가 없음
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, _detached(token))
+            return (user, token)
+
+        token = _detached(token)
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
+
+    async def aauthenticate(self, request):
+        # authenticate()의 async 버전 (posts.async_views). 헤더 검사는 TokenAuthentication과 동일
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. Token string should not contain invalid characters.')
+            )
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        token = await token_cache.aget(key)
+        if token is None:
+            model = self.get_model()
+            try:
+                token = await model.objects.select_related('user').aget(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            if not token.user.is_active:
+                raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+            await token_cache.aset(key, _detached(token))
+            return (token.user, token)
+
+        token = _detached(token)
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance, **kwargs):
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_tokens(sender, instance, created=False, **kwargs):
+    # 비활성화, 비밀번호 변경 등 유저 정보가 바뀌면 해당 유저의 토큰 캐시 제거
+    if not created:
+        token_cache.delete_user(instance.pk)
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.17 on 2026-10-18 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
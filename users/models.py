@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 class Profile(models.Model):
@@ -13,8 +14,41 @@ class Profile(models.Model):
     position = models.CharField(max_length=128)
     subjects = models.CharField(max_length=128)
     image = models.ImageField(upload_to="profile/", default="default.png")
+    # 리사이즈된 이미지 경로 (images.processing에서 채움)
+    image_renditions = models.JSONField(default=dict, blank=True)
+    # 비정규화 팔로워 수 (타임라인 fan-out 대상 판단용)
+    follower_count = models.PositiveIntegerField(default=0)
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(User, on_delete=models.CASCADE, related_name="following")
+    followee = models.ForeignKey(User, on_delete=models.CASCADE, related_name="followers")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["follower", "followee"], name="follow_unique"),
+        ]
+        indexes = [
+            # 새 글을 팔로워에게 배포할 때 followee 기준으로 조회
+            models.Index(fields=["followee", "follower"], name="follow_followee_idx"),
+        ]
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
-        Profile.objects.create(user=instance)
\ No newline at end of file
+        Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=Follow)
+def increase_follower_count(sender, instance, created, **kwargs):
+    # update()로 갱신해 프로필 post_save(게시글/댓글 updated_at 갱신, 캐시 무효화)를 거치지 않음
+    if created:
+        Profile.objects.filter(pk=instance.followee_id).update(follower_count=F("follower_count") + 1)
+
+
+@receiver(post_delete, sender=Follow)
+def decrease_follower_count(sender, instance, **kwargs):
+    Profile.objects.filter(pk=instance.followee_id, follower_count__gt=0).update(
+        follower_count=F("follower_count") - 1
+    )
@@ -5,6 +5,7 @@ from rest_framework import serializers
 from rest_framework.authtoken.models import Token     # 토큰 모델
 from rest_framework.validators import UniqueValidator # 중복 방지 도구
 
+from images.serializers import RenditionsField
 from users.models import Profile
 
 
@@ -59,6 +60,8 @@ class LoginSerializer(serializers.Serializer):
         )
 
 class ProfileSerializer(serializers.ModelSerializer):
+    image_renditions = RenditionsField()
+
     class Meta:
         model = Profile
-        fields = ["nickname", "position", "subjects", "image"]
\ No newline at end of file
+        fields = ["nickname", "position", "subjects", "image", "image_renditions"]
\ No newline at end of file
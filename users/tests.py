@@ -1,9 +1,16 @@
-from django.test import TestCase
+import threading
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
 
+from users.authentication import TokenCache, token_cache
+from users.models import Follow, Profile
+
 
 class RegisterTest(TestCase):
     def setUp(self):
@@ -133,3 +140,138 @@ class ProfileTest(UserBaseTest):
         response = self.client.put(f"/user/profile/{self.user.id}/", update_data, format="json")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
+
+
+class CachedTokenAuthenticationTest(UserBaseTest):
+    def setUp(self):
+        super().setUp()
+        token_cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def auth_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [q["sql"] for q in context.captured_queries if "authtoken_token" in q["sql"]]
+
+    def test_warm_cache_has_no_auth_queries(self):
+        url = f"/user/profile/{self.user.id}/"
+        self.assertEqual(len(self.auth_queries(url)), 1)
+        self.assertEqual(self.auth_queries(url), [])
+
+    def test_deleted_token(self):
+        url = f"/user/profile/{self.user.id}/"
+        self.auth_queries(url)
+        self.token.delete()
+        response = self.client.put(url, {"nickname": "testname"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rotated_token(self):
+        self.auth_queries(f"/user/profile/{self.user.id}/")
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+        update_data = {
+            "nickname":"testname",
+            "position":"backend",
+            "subjects":"Django, RestfulAPI"
+        }
+        response = self.client.put(f"/user/profile/{self.user.id}/", update_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + new_token.key)
+        response = self.client.put(f"/user/profile/{self.user.id}/", update_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deactivated_user(self):
+        url = f"/user/profile/{self.user.id}/"
+        self.auth_queries(url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_lru_eviction(self):
+        cache = TokenCache(max_size=2)
+        tokens = [
+            Token.objects.create(user=User.objects.create_user(username=f"lru_user{i}"))
+            for i in range(3)
+        ]
+        for token in tokens:
+            cache.set(token.key, token)
+        self.assertIsNone(cache.get(tokens[0].key))
+        self.assertIsNotNone(cache.get(tokens[2].key))
+
+    def test_shared_cache(self):
+        cache = TokenCache(shared_cache="default")
+        cache.set(self.token.key, self.token)
+        other_process = TokenCache(shared_cache="default")
+        self.assertEqual(other_process.get(self.token.key).user_id, self.user.id)
+        cache.delete_user(self.user.id)
+        self.assertIsNone(TokenCache(shared_cache="default").get(self.token.key))
+
+
+class FollowTest(UserBaseTest):
+    def setUp(self):
+        super().setUp()
+        self.other = User.objects.create_user(username="other_user", password="testpw!!")
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_follow_toggle(self):
+        response = self.client.post(f"/user/follow/{self.other.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["following"])
+        self.assertEqual(Profile.objects.get(pk=self.other.id).follower_count, 1)
+
+        response = self.client.post(f"/user/follow/{self.other.id}/")
+        self.assertFalse(response.data["following"])
+        self.assertEqual(Profile.objects.get(pk=self.other.id).follower_count, 0)
+
+    def test_follow_self(self):
+        response = self.client.post(f"/user/follow/{self.user.id}/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_follow_invalid_user(self):
+        response = self.client.post("/user/follow/99999/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_follow_without_authorization(self):
+        self.client.credentials()
+        response = self.client.post(f"/user/follow/{self.other.id}/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class FollowConcurrencyTest(TransactionTestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f"test_user{i}", password="testpw!!")
+            for i in range(8)
+        ]
+        self.followee = User.objects.create_user(username="followee", password="testpw!!")
+
+    def toggle(self, user, times, errors):
+        client = APIClient()
+        client.force_authenticate(user)
+        try:
+            for _ in range(times):
+                response = client.post(f"/user/follow/{self.followee.id}/")
+                if response.status_code != status.HTTP_200_OK:
+                    errors.append(response.status_code)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    def test_concurrent_toggles(self):
+        errors = []
+        threads = []
+        # 유저마다 두 스레드가 동시에 클릭
+        for i, user in enumerate(self.users):
+            for _ in range(2):
+                threads.append(threading.Thread(target=self.toggle, args=(user, i + 1, errors)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        follower_count = Profile.objects.get(pk=self.followee.id).follower_count
+        self.assertEqual(follower_count, Follow.objects.filter(followee=self.followee).count())
@@ -1,8 +1,9 @@
 from django.urls import path
-from .views import RegisterView, LoginView, ProfileView
+from .views import RegisterView, LoginView, ProfileView, follow_user
 
 urlpatterns = [
     path('register/', RegisterView.as_view()),
     path('login/', LoginView.as_view()),
     path('profile/<int:pk>/', ProfileView.as_view()),
+    path('follow/<int:id>/', follow_user, name='follow_user'),
 ]
@@ -1,8 +1,14 @@
 from django.contrib.auth.models import User
+from django.db import transaction
 from rest_framework import generics, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Profile
+from pypost.db.replicas import ReplicaReadMixin
+from pypost.rows import RowSerializationMixin
+from .models import Follow, Profile
 from .serializers import RegisterSerializer, LoginSerializer, ProfileSerializer
 from .permissions import CustomReadOnly
 
@@ -19,7 +25,26 @@ class LoginView(generics.GenericAPIView):
         token = serializer.validated_data
         return Response({"token":token.key}, status=status.HTTP_200_OK)
 
-class ProfileView(generics.RetrieveUpdateDestroyAPIView):
+class ProfileView(ReplicaReadMixin, RowSerializationMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
-    permission_classes = [CustomReadOnly]
\ No newline at end of file
+    permission_classes = [CustomReadOnly]
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def follow_user(request, id):
+    # 팔로우 토글 (좋아요와 같은 방식)
+    if id == request.user.id:
+        raise ValidationError({"error": "자기 자신은 팔로우할 수 없습니다."})
+    if not User.objects.filter(pk=id).exists():
+        raise NotFound
+    with transaction.atomic():
+        # select_for_update로 읽어 쓰기 잠금부터 잡음 (그냥 읽은 뒤 쓰면 SQLite 잠금 승격 실패)
+        follows = Follow.objects.select_for_update().filter(follower=request.user, followee_id=id)
+        following = not follows.exists()
+        if following:
+            # 행 잠금이 없는 빈 결과 조회 뒤 다른 요청이 먼저 만들었으면 그 행을 그대로 사용 (유니크 제약 위반 없이)
+            Follow.objects.get_or_create(follower=request.user, followee_id=id)
+        else:
+            follows.delete()
+    return Response({"following": following}, status=status.HTTP_200_OK)